@@ -1,16 +1,27 @@
 # Examples package entrypoint for tests
-from . import fetch_all_site_data, fetch_site_configs, fetch_all_site_alerts
-
-# Optional modules that may not exist in older checkouts
-try:
-    from . import update_site_config, apply_alert_updates
-except Exception:
-    pass
+from importlib import import_module
+from importlib.util import find_spec
 
 __all__ = [
     'fetch_all_site_data',
     'fetch_site_configs',
     'fetch_all_site_alerts',
-    'update_site_config',
-    'apply_alert_updates',
 ]
+
+# Optional modules that may not exist in older checkouts. find_spec is a cheap
+# lookup, so a missing module costs no exception.
+for _name in ('update_site_config', 'apply_alert_updates'):
+    if find_spec(f'{__name__}.{_name}') is not None:
+        __all__.append(_name)
+
+del _name
+
+
+def __getattr__(name):
+    # Submodules are imported on first access (PEP 562), so a script that only
+    # needs examples._util doesn't import every other example along with it.
+    if name in __all__:
+        module = import_module(f'{__name__}.{name}')
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
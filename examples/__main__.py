@@ -0,0 +1,81 @@
+"""
+Run several example scripts in one interpreter:
+
+    python -m examples get_site_overview --site-id S60308 --mock + get_chart_data --site-id S60308 --mock
+
+Each command is an example module name followed by that script's own arguments;
+commands are separated by a lone "+". They run in order in this process, so the
+SDK is imported once and every command shares the cached client from
+_util.get_client(). Every command's arguments are parsed before the first one
+runs; execution stops at the first command that fails.
+"""
+from __future__ import annotations
+
+import argparse
+import pkgutil
+import sys
+from importlib import import_module
+from typing import List, Optional
+
+COMMAND_PREFIXES = ("get_", "fetch_", "update_", "apply_")
+SEPARATOR = "+"
+
+
+def available_commands() -> List[str]:
+    """Names of the example modules that can be dispatched to."""
+    return sorted(
+        info.name for info in pkgutil.iter_modules(sys.modules[__package__].__path__)
+        if info.name.startswith(COMMAND_PREFIXES)
+    )
+
+
+def _split_commands(argv: List[str]) -> List[List[str]]:
+    commands, current = [], []
+    for arg in argv:
+        if arg == SEPARATOR:
+            commands.append(current)
+            current = []
+        else:
+            current.append(arg)
+    commands.append(current)
+    return [c for c in commands if c]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    commands = available_commands()
+    parser = argparse.ArgumentParser(
+        prog="python -m examples",
+        description="Run one or more example scripts in a single process",
+        epilog=f"Separate commands with a lone '{SEPARATOR}'. Available: " + ", ".join(commands),
+    )
+    parser.add_argument("command", choices=commands, metavar="command", help="Example script to run")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed to the script")
+
+    batch = _split_commands(argv)
+    if not batch:
+        parser.print_help()
+        return 2
+    parsed = [parser.parse_args(cmd) for cmd in batch]
+    # Parse every command's own arguments before running any of them, so a typo in
+    # the last command doesn't leave the earlier ones half done.
+    modules = []
+    for cmd in parsed:
+        module = import_module(f"{__package__}.{cmd.command}")
+        script_parser = module._build_parser()
+        script_parser.prog = f"{cmd.command}.py"  # not "__main__.py" in usage errors
+        try:
+            script_parser.parse_args(cmd.args)
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 2
+        modules.append(module)
+    for module, cmd in zip(modules, parsed):
+        try:
+            module.main(cmd.args)
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                return e.code if isinstance(e.code, int) else 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
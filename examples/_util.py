@@ -5,21 +5,449 @@ or a simple MockClient for local testing. Also includes JSON save/load helpers.
 """
 from __future__ import annotations
 
+import asyncio
+import atexit
+import contextlib
+import dataclasses
+import functools
+import gzip
+import hashlib
+import io
 import json
 import logging
+import mmap
+import os
+import pickle
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from itertools import compress, islice
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable, Iterable, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Callable, Iterable, Iterator, Tuple, Union
 
-from powertrack_sdk import PowerTrackClient
-from powertrack_sdk.models import Site, SiteList, SiteConfig, SiteData, HardwareDetails, ModelingData, AlertTrigger
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from time import sleep
+from powertrack_sdk.models import (
+    AlertSummary,
+    AlertSummaryResponse,
+    AlertTrigger,
+    ChartData,
+    ChartSeries,
+    Hardware,
+    HardwareDetails,
+    HardwareDiagnostics,
+    ModelingData,
+    PortfolioMetrics,
+    Site,
+    SiteConfig,
+    SiteData,
+    SiteDetailedInfo,
+    SiteList,
+    SiteOverview,
+)
+from powertrack_sdk.exceptions import NotModified
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
 import math
 import traceback
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to ujson, then the stdlib
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+# JSON codec shim: pick the fastest available backend once at import time.
+# _dumps (indented) and _dumps_line (compact, newline-terminated, for JSON Lines)
+# always return UTF-8 bytes and _loads accepts bytes, so callers stay on the
+# bytes path regardless of which backend is active. _dumps takes an optional
+# `default` hook to use in place of _json_default, and compact=True drops the
+# indentation and the spaces after separators.
+if orjson is not None:
+    def _dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None, compact: bool = False) -> bytes:
+        return orjson.dumps(obj, default=default or _json_default,
+                            option=(0 if compact else orjson.OPT_INDENT_2) | orjson.OPT_NON_STR_KEYS
+                            | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z)
+
+    def _dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_json_default,
+                            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+                            | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z)
+
+    _loads = orjson.loads
+elif ujson is not None:
+    def _dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None, compact: bool = False) -> bytes:
+        return ujson.dumps(obj, indent=0 if compact else 2, ensure_ascii=False,
+                           default=default or _json_default).encode("utf-8")
+
+    def _dumps_line(obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False, default=_json_default).encode("utf-8") + b"\n"
+
+    _loads = ujson.loads
+else:
+    def _dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None, compact: bool = False) -> bytes:
+        return json.dumps(obj, indent=None if compact else 2, separators=(",", ":") if compact else None,
+                          ensure_ascii=False, default=default or _json_default).encode("utf-8")
+
+    def _dumps_line(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, default=_json_default).encode("utf-8") + b"\n"
+
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 
+# Canonical mock records, built once at import time. MockClient getters return
+# shallow copies via dataclasses.replace() that only override the per-call
+# fields, so list-valued fields are stored as tuples and nested dicts must be
+# treated as read-only by callers.
+_SITE_OVERVIEW_TEMPLATE = SiteOverview(
+    key="S10001",
+    name="Mock Site 1",
+    availability=95.0,
+    availabilityLoss=5.0,
+    calculatedInverterAvailability=98.0,
+    capacityDc=120.0,
+    chargeDischarge=None,
+    customColumnData=("data1", "data2"),
+    downtimeLoss=2.0,
+    energyAvailability=90.0,
+    energyAvailabilityLoss=10.0,
+    energyCapacity=None,
+    energyLoss=5.0,
+    energyRatio=0.95,
+    gridOffline=0,
+    ground=0,
+    id=10001,
+    insolation=5.0,
+    inverterCount=2,
+    inverterFaults=0,
+    irradiance=800.0,
+    kioskStatus=1,
+    kiosks=1,
+    kwPercent=50.0,
+    kwhPercent=45.0,
+    lastDataUTC="2023-01-01T12:00:00Z",
+    lastMonth=1000,
+    lastUpload="2023-01-01T12:00:00Z",
+    lastYear=12000,
+    lifetime=50000,
+    message="OK",
+    monitoredSiteType=1,
+    parentKey="C8458",
+    paymentStatus=1,
+    performanceIndex=85.0,
+    performanceTestDelta=0.5,
+    performanceTestStatus=1,
+    performanceTestValue=100.0,
+    power=50.0,
+    power24=1200,
+    power24Est=1150.0,
+    powerAvg15=48.0,
+    powerAvg15Exp=52.0,
+    pvCapacityAc=100.0,
+    pvCapacityDc=120.0,
+    ratedPower=None,
+    availableEnergy=None,
+    reminderColor="green",
+    revenueLoss=100.0,
+    rolling24Kw=(1150, 1140, 1160),
+    rolling24KwIdx=95,
+    ruleToolSummary={},
+    sizeDC=120.0,
+    sizeKW=100.0,
+    soilingLoss=2.0,
+    stateOfCharge=None,
+    status=1,
+    alertSeverity=0,
+    alertName="",
+    systemSize=100.0,
+    thisMonth=800,
+    thisYear=9600,
+    timeZone="UTC",
+    today=48.0,
+    todayEstimated=48.0,
+    todayPercent=48.0,
+    type=1,
+    todayAnd7DayAverageKw={},
+    estimatedCommissioningDate=None,
+    expirationDate=None
+)
+
+_SITE_DETAILED_TEMPLATE = SiteDetailedInfo(
+    key="S10001",
+    name="Mock S10001",
+    isMonitored=True,
+    cellModemContractEndDate="2025-12-31",
+    address={"street": "123 Mock St", "city": "Mock City", "state": "MC", "zip": "00000"},
+    cellModemContractStartDate="2020-01-01",
+    energyCapacityUnit=1,
+    longitude=-74.0060,
+    parentKey="C8458",
+    weatherMode=1,
+    monitoringContractIsManual=False,
+    cellModemContractCustomBanner=False,
+    monitoringContractWarnDate=None,
+    workingStatus="active",
+    capacityDcUnit=1,
+    elevation=10,
+    dailyProductionEstimate=48.0,
+    lastChanged="2023-01-01T00:00:00Z",
+    monthlyProductionEstimate=1440.0,
+    ratedPowerUnit=1,
+    monitoringContractCustomBanner=False,
+    monitoringContractStatus=1,
+    monitoringContractEndDate="2025-12-31",
+    estimatedCommissioningDate="2020-01-01",
+    cellModemContractAccessNote="",
+    cellModemContractTerminateDate=None,
+    cellModemContractIsManual=False,
+    customerLogo="",
+    capacityAc=100,
+    customQueryKey="",
+    preferredWsForEstimatedInsolation=1,
+    requiresPubIp=False,
+    defaultQuery=1,
+    monitoringContractWillNotRenew=False,
+    capacityAcUnit=1,
+    status=1,
+    latitude=40.7128,
+    ratedPower=100,
+    advancedSiteConfiguration=False,
+    monitoringContractTerminateDate=None,
+    actualCommissioningDate="2020-01-01",
+    estimatedLosses={},
+    cellModemContractWarnDate=None,
+    monitoringContractAccessNote="",
+    validDataDate="2023-01-01",
+    paymentStatus=1,
+    capacityDc=120.0,
+    monitoringContractStartDate="2020-01-01",
+    energyCapacity=100,
+    overviewChart1="chart1",
+    overviewChart2="chart2",
+    cellModemContractWillNotRenew=False,
+    siteType=1,
+    sitePhotos=None
+)
+
+_CHART_DATA_TEMPLATE = ChartData(
+    allowSmallBinSize=True,
+    binSize=1440,
+    currentNowBinIndex=0,
+    dataNotAvailable=False,
+    durations=({"key": "day", "name": "Day", "value": 1},),
+    end="2024-01-31T23:59:59Z",
+    errorString="",
+    hardwareKeys=("H12345",),
+    hasAlertMessages=False,
+    hasOverriddenQuery=False,
+    isCategoryChart=False,
+    isSummaryChart=False,
+    isUsingDaylightSavings=False,
+    key="chart",
+    lastChanged="2023-01-01T00:00:00Z",
+    lastDataDatetime="2024-01-31T23:59:59Z",
+    namedResults={"energy": 98.0},
+    renderType=0,
+    series=(
+        ChartSeries(
+            name="Production",
+            key="prod",
+            dataXy=((1640995200, 50.0), (1641081600, 48.0)),  # Sample data
+            color="#FF0000",
+            customUnit="kWh",
+            dataMax=50.0,
+            dataMin=48.0,
+            diameter=2,
+            fitExponent=1,
+            header="Production",
+            lineColor="#FF0000",
+            lineType=0,
+            lineWidth=2,
+            rightAxis=False,
+            units=0,
+            useBinnedData=False,
+            visible=True,
+            xSeriesHeader="Time",
+            xSeriesKey="time",
+            xSeriesName="Time",
+            xUnits="timestamp",
+            yAxisIndex=0,
+            yMax=50.0,
+            yMin=48.0,
+            alertMessageMap=None
+        ),
+    ),
+    summaryTable=({"key": "total", "value": 100.0},),
+    start="2024-01-01T00:00:00Z"
+)
+
+
+# The couple of fake sites every MockClient serves. Built once per process and
+# shared by all instances, so it must not be mutated.
+_MOCK_SITES = SiteList([
+    {"key": "S10001", "name": "Mock Site 1"},
+    {"key": "S10002", "name": "Mock Site 2"},
+])
+
+
+# Alert summary served for every customer/site (read-only).
+_ALERT_SUMMARY_RESPONSE = AlertSummaryResponse(
+    hardwareSummaries={"H100": AlertSummary(hardwareKey="H100", maxSeverity=2, count=1)}
+)
+
+
+# Site-independent mock responses, returned as-is on every call. Tuples make
+# accidental mutation fail loudly; the contained objects/dicts are shared and
+# must be treated as read-only.
+_HARDWARE_LIST = (
+    Hardware(
+        key="H12345",
+        name="Inverter 1",
+        functionCode=1,  # Inverter
+        hid=12345,
+        capacityKw=50.0,
+        enableBool=True
+    ),
+    Hardware(
+        key="H67890",
+        name="Meter 1",
+        functionCode=2,  # Production Meter
+        hid=67890,
+        capacityKw=None,
+        enableBool=True
+    ),
+)
+
+_HARDWARE_PRODUCTION = (
+    {
+        "key": "H12345",
+        "name": "Inverter 1",
+        "today": 48.0,
+        "thisMonth": 1440.0,
+        "lastMonth": 1400.0,
+        "lifetime": 50000.0
+    },
+    {
+        "key": "H67890",
+        "name": "Meter 1",
+        "today": 50.0,
+        "thisMonth": 1500.0,
+        "lastMonth": 1450.0,
+        "lifetime": 55000.0
+    },
+)
+
+_CHART_DEFINITIONS = (
+    {
+        "id": 1,
+        "name": "Production Overview",
+        "description": "Daily production chart",
+        "type": "line"
+    },
+    {
+        "id": 2,
+        "name": "Inverter Performance",
+        "description": "Inverter efficiency chart",
+        "type": "bar"
+    },
+)
+
+
+# Per-id cache size for the mock helpers below; large enough that parallel test
+# runs over a realistic site/hardware list stay fully cached.
+_MOCK_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=_MOCK_CACHE_SIZE)
+def _normalize_site_id(site_id: str) -> str:
+    """Return site_id with its "S" prefix, e.g. "10001" -> "S10001"."""
+    return site_id if site_id[:1] == "S" else "S" + site_id
+
+
+# Deterministic mock getters are pure functions of their id argument, so the
+# built objects are memoized per id. Repeated calls return the same instance;
+# callers must treat it as read-only (the SDK models are regular mutable
+# dataclasses, so this is by convention rather than enforced).
+@functools.lru_cache(maxsize=_MOCK_CACHE_SIZE)
+def _mock_site_config(site_id: str) -> SiteConfig:
+    return SiteConfig(
+        siteId=site_id,
+        name=f"Mock Config for {site_id}",
+        timezone="UTC",
+        latitude=12.34,
+        longitude=56.78,
+        elevation=10,
+        address="123 Mock St",
+        city="Mockville",
+        state="MK",
+        zipCode="00000",
+        country="Mockland",
+        installDate="2020-01-01",
+        acCapacityKw=100.0,
+        dcCapacityKw=120.0,
+        moduleCount=400,
+        rawData={"mock": True},
+    )
+
+
+@functools.lru_cache(maxsize=_MOCK_CACHE_SIZE)
+def _mock_hardware_details(hardware_key: str) -> HardwareDetails:
+    summary = Hardware(
+        key=hardware_key,
+        name=f"Mock {hardware_key}",
+        functionCode=1,
+        hid=int(hardware_key[1:]) if hardware_key[:1] == 'H' else 12345
+    )
+    return HardwareDetails(key=hardware_key, summary=summary, details={"mock": True, "config": "sample"})
+
+
+@functools.lru_cache(maxsize=_MOCK_CACHE_SIZE)
+def _mock_site_overview(site_id: str) -> SiteOverview:
+    return dataclasses.replace(_SITE_OVERVIEW_TEMPLATE, key=site_id, name=f"Mock {site_id}", id=int(site_id[1:]))
+
+
+@functools.lru_cache(maxsize=_MOCK_CACHE_SIZE)
+def _mock_site_detailed_info(site_id: str) -> SiteDetailedInfo:
+    return dataclasses.replace(_SITE_DETAILED_TEMPLATE, key=site_id, name=f"Mock {site_id}")
+
+
+@functools.lru_cache(maxsize=_MOCK_CACHE_SIZE)
+def _mock_modeling_data(site_id: str) -> ModelingData:
+    # dataclasses.asdict can't deepcopy MappingProxyType, so the empty dicts
+    # stay plain dicts and are read-only by convention like the rest.
+    return ModelingData(siteId=site_id, pvConfig={}, inverters=({"inverterKw": 50},), ts="ts", rawData={})
+
+
+def _site_activity_mask(keys: List[str], want_active: bool) -> List[bool]:
+    """Classify mock sites as active (even key hash) and return which match want_active.
+
+    The hashing happens first in one map() pass; the classification is then a
+    single bit test per hash.
+    """
+    want_bit = 0 if want_active else 1
+    return [(h & 1) == want_bit for h in map(hash, keys)]
+
+
+@functools.lru_cache(maxsize=32)
+def _make_site_overviews(n: int, parent_key: str) -> Tuple[SiteOverview, ...]:
+    """Clone the overview template n times with sequential site keys/ids.
+
+    Cached per (n, parent_key), so repeated portfolio calls share one read-only tuple.
+    """
+    return tuple(
+        dataclasses.replace(_SITE_OVERVIEW_TEMPLATE, key=f"S{10001 + i}", id=10001 + i, parentKey=parent_key)
+        for i in range(n)
+    )
+
+
 class MockClient:
     """A small mock client that mimics PowerTrackClient methods used by examples.
 
@@ -28,11 +456,8 @@ class MockClient:
     """
 
     def __init__(self):
-        # Create a couple of fake sites
-        self._sites = SiteList([
-            {"key": "S10001", "name": "Mock Site 1"},
-            {"key": "S10002", "name": "Mock Site 2"},
-        ])
+        # Shared module-level sample sites (read-only; get_sites returns new SiteLists)
+        self._sites = _MOCK_SITES
 
     # Site listing
     def get_sites(self, site_list_file: Optional[str] = None, customer_id: Optional[str] = None,
@@ -43,96 +468,40 @@ class MockClient:
             site_list = self._sites
         elif site_list_file:
             try:
-                site_list = SiteList.from_json_file(site_list_file)
+                site_list = load_site_list(site_list_file)
             except Exception:
                 # Fall back to built-in sample
                 site_list = self._sites
         else:
             site_list = self._sites
 
-        # Apply filters
-        filtered_sites = []
-        for site in site_list.sites:
-            # Mock site status - alternate between active/inactive for demo
-            is_active = hash(site.key) % 2 == 0
-
-            if filter_active and not is_active:
-                continue
-            if filter_inactive and is_active:
-                continue
-
-            filtered_sites.append(site)
-
-        # Apply limit
-        if limit:
-            filtered_sites = filtered_sites[:limit]
+        # Apply filters and limit in a single pass. Mock site status alternates between
+        # active/inactive for demo: the mask is computed for every site at once and the
+        # sites are gathered with compress(); with no filter the list is just sliced.
+        if filter_active and filter_inactive:
+            sites: List[Site] = []
+        elif filter_active or filter_inactive:
+            mask = _site_activity_mask([site.key for site in site_list.sites], filter_active)
+            sites = list(islice(compress(site_list.sites, mask), limit or None))
+        else:
+            sites = site_list.sites[:limit] if limit else site_list.sites
 
-        return SiteList(sites=filtered_sites)
-        return self._sites
+        return SiteList(sites=sites)
 
     # Site config
     def get_site_config(self, site_id: str) -> SiteConfig:
-        site_id = site_id if site_id.startswith("S") else f"S{site_id}"
-        return SiteConfig(
-            siteId=site_id,
-            name=f"Mock Config for {site_id}",
-            timezone="UTC",
-            latitude=12.34,
-            longitude=56.78,
-            elevation=10,
-            address="123 Mock St",
-            city="Mockville",
-            state="MK",
-            zipCode="00000",
-            country="Mockland",
-            installDate="2020-01-01",
-            acCapacityKw=100.0,
-            dcCapacityKw=120.0,
-            moduleCount=400,
-            rawData={"mock": True},
-        )
+        return _mock_site_config(_normalize_site_id(site_id))
 
     # Hardware list / details
     def get_hardware_list(self, site_id: str):
         # Return mock Hardware list
-        from powertrack_sdk.models import Hardware
-        return [
-            Hardware(
-                key="H12345",
-                name="Inverter 1",
-                functionCode=1,  # Inverter
-                hid=12345,
-                capacityKw=50.0,
-                enableBool=True
-            ),
-            Hardware(
-                key="H67890",
-                name="Meter 1",
-                functionCode=2,  # Production Meter
-                hid=67890,
-                capacityKw=None,
-                enableBool=True
-            )
-        ]
+        return _HARDWARE_LIST
 
     def get_hardware_details(self, hardware_key: str) -> Optional[HardwareDetails]:
-        from powertrack_sdk.models import HardwareDetails, Hardware
-        summary = Hardware(
-
-            key=hardware_key,
-
-            name=f"Mock {hardware_key}",
-
-            functionCode=1,
-
-            hid=int(hardware_key[1:]) if hardware_key.startswith('H') else 12345
-
-        )
-        return HardwareDetails(key=hardware_key, summary=summary, details={"mock": True, "config": "sample"})
+        return _mock_hardware_details(hardware_key)
 
     def get_hardware_diagnostics(self, hardware_id: str):
         # Return mock HardwareDiagnostics
-        from powertrack_sdk.models import HardwareDiagnostics
         return HardwareDiagnostics(
             key=hardware_id,
             hardwareName="Mock Hardware",
@@ -156,110 +525,25 @@ class MockClient:
 
     def get_site_hardware_production(self, site_id: str):
         # Return mock production data
-        return [
-            {
-                "key": "H12345",
-                "name": "Inverter 1",
-                "today": 48.0,
-                "thisMonth": 1440.0,
-                "lastMonth": 1400.0,
-                "lifetime": 50000.0
-            },
-            {
-                "key": "H67890",
-                "name": "Meter 1",
-                "today": 50.0,
-                "thisMonth": 1500.0,
-                "lastMonth": 1450.0,
-                "lifetime": 55000.0
-            }
-        ]
+        return _HARDWARE_PRODUCTION
 
     # Alerts
     def get_alert_triggers(self, hardware_key: str, last_changed: Optional[str] = None) -> Optional[AlertTrigger]:
         # Return a sample alert trigger for one hardware key
         return AlertTrigger(key=hardware_key, triggers=[{"name": "MockTrigger", "isActive": True}])
 
+    def get_alert_triggers_batch(self, hardware_keys: List[str], max_workers: int = 8) -> Dict[str, Any]:
+        return {key: self.get_alert_triggers(key) for key in hardware_keys}
+
     def get_alert_summary(self, customer_id: Optional[str] = None, siteId: Optional[str] = None):
-        # Return a mock AlertSummaryResponse
-        from powertrack_sdk.models import AlertSummary, AlertSummaryResponse
-        return AlertSummaryResponse(hardwareSummaries={"H100": AlertSummary(hardwareKey="H100", maxSeverity=2, count=1)})
-
-    def get_portfolio_overview(self, customer_id: str):
-        # Return a mock PortfolioMetrics
-        from powertrack_sdk.models import PortfolioMetrics, SiteOverview
-        sites = [
-            SiteOverview(
-                key="S10001",
-                name="Mock Site 1",
-                availability=95.0,
-                availabilityLoss=5.0,
-                calculatedInverterAvailability=98.0,
-                capacityDc=120.0,
-                chargeDischarge=None,
-                customColumnData=["data1", "data2"],
-                downtimeLoss=2.0,
-                energyAvailability=90.0,
-                energyAvailabilityLoss=10.0,
-                energyCapacity=None,
-                energyLoss=5.0,
-                energyRatio=0.95,
-                gridOffline=0,
-                ground=0,
-                id=10001,
-                insolation=5.0,
-                inverterCount=2,
-                inverterFaults=0,
-                irradiance=800.0,
-                kioskStatus=1,
-                kiosks=1,
-                kwPercent=50.0,
-                kwhPercent=45.0,
-                lastDataUTC="2023-01-01T12:00:00Z",
-                lastMonth=1000,
-                lastUpload="2023-01-01T12:00:00Z",
-                lastYear=12000,
-                lifetime=50000,
-                message="OK",
-                monitoredSiteType=1,
-                parentKey=customer_id,
-                paymentStatus=1,
-                performanceIndex=85.0,
-                performanceTestDelta=0.5,
-                performanceTestStatus=1,
-                performanceTestValue=100.0,
-                power=50.0,
-                power24=1200,
-                power24Est=1150.0,
-                powerAvg15=48.0,
-                powerAvg15Exp=52.0,
-                today=48.0,
-                pvCapacityAc=100.0,
-                pvCapacityDc=120.0,
-                ratedPower=None,
-                availableEnergy=None,
-                reminderColor="green",
-                revenueLoss=100.0,
-                rolling24Kw=[1150, 1140, 1160],  # List[int]
-                rolling24KwIdx=95,  # int
-                ruleToolSummary={},  # Dict[str, Any]
-                sizeDC=120.0,
-                sizeKW=100.0,
-                soilingLoss=2.0,
-                stateOfCharge=None,
-                status=1,
-                alertSeverity=0,
-                alertName="",
-                systemSize=100.0,
-                thisMonth=800,
-                thisYear=9600,
-                timeZone="UTC",
-                todayEstimated=48.0,
-                todayPercent=48.0,
-                type=1,  # int
-                todayAnd7DayAverageKw={}  # Dict[str, Any]
-            )
-        ]
+        # Return the shared mock AlertSummaryResponse
+        return _ALERT_SUMMARY_RESPONSE
+
+    def get_portfolio_overview(self, customer_id: str, n_sites: Optional[int] = None):
+        # Return a mock PortfolioMetrics; MOCK_PORTFOLIO_SITES sizes it for benchmarks
+        if n_sites is None:
+            n_sites = int(os.environ.get("MOCK_PORTFOLIO_SITES", "1"))
+        sites = _make_site_overviews(n_sites, customer_id)
         return PortfolioMetrics(
             customerId=customer_id,
             sites=sites,
@@ -271,217 +555,29 @@ class MockClient:
 
     def get_site_overview(self, site_id: str):
         # Return a mock SiteOverview for the site
-        from powertrack_sdk.models import SiteOverview
-        return SiteOverview(
-            key=site_id,
-            name=f"Mock {site_id}",
-            availability=95.0,
-            availabilityLoss=5.0,
-            calculatedInverterAvailability=98.0,
-            capacityDc=120.0,
-            chargeDischarge=None,
-            customColumnData=["data1", "data2"],
-            downtimeLoss=2.0,
-            energyAvailability=90.0,
-            energyAvailabilityLoss=10.0,
-            energyCapacity=None,
-            energyLoss=5.0,
-            energyRatio=0.95,
-            gridOffline=0,
-            ground=0,
-            id=int(site_id[1:]),
-            insolation=5.0,
-            inverterCount=2,
-            inverterFaults=0,
-            irradiance=800.0,
-            kioskStatus=1,
-            kiosks=1,
-            kwPercent=50.0,
-            kwhPercent=45.0,
-            lastDataUTC="2023-01-01T12:00:00Z",
-            lastMonth=1000,
-            lastUpload="2023-01-01T12:00:00Z",
-            lastYear=12000,
-            lifetime=50000,
-            message="OK",
-            monitoredSiteType=1,
-            parentKey="C8458",
-            paymentStatus=1,
-            performanceIndex=85.0,
-            performanceTestDelta=0.5,
-            performanceTestStatus=1,
-            performanceTestValue=100.0,
-            power=50.0,
-            power24=1200,
-            power24Est=1150.0,
-            powerAvg15=48.0,
-            powerAvg15Exp=52.0,
-            pvCapacityAc=100.0,
-            pvCapacityDc=120.0,
-            ratedPower=None,
-            availableEnergy=None,
-            reminderColor="green",
-            revenueLoss=100.0,
-            rolling24Kw=[1150, 1140, 1160],
-            rolling24KwIdx=95,
-            ruleToolSummary={},
-            sizeDC=120.0,
-            sizeKW=100.0,
-            soilingLoss=2.0,
-            stateOfCharge=None,
-            status=1,
-            alertSeverity=0,
-            alertName="",
-            systemSize=100.0,
-            thisMonth=800,
-            thisYear=9600,
-            timeZone="UTC",
-            today=48.0,
-            todayEstimated=48.0,
-            todayPercent=48.0,
-            type=1,
-            todayAnd7DayAverageKw={},
-            estimatedCommissioningDate=None,
-            expirationDate=None
-        )
+        return _mock_site_overview(_normalize_site_id(site_id))
 
     def get_site_detailed_info(self, site_id: str):
         # Return a mock SiteDetailedInfo
-        from powertrack_sdk.models import SiteDetailedInfo
-        return SiteDetailedInfo(
-            key=site_id,
-            name=f"Mock {site_id}",
-            isMonitored=True,
-            cellModemContractEndDate="2025-12-31",
-            address={"street": "123 Mock St", "city": "Mock City", "state": "MC", "zip": "00000"},
-            cellModemContractStartDate="2020-01-01",
-            energyCapacityUnit=1,
-            longitude=-74.0060,
-            parentKey="C8458",
-            weatherMode=1,
-            monitoringContractIsManual=False,
-            cellModemContractCustomBanner=False,
-            monitoringContractWarnDate=None,
-            workingStatus="active",
-            capacityDcUnit=1,
-            elevation=10,
-            dailyProductionEstimate=48.0,
-            lastChanged="2023-01-01T00:00:00Z",
-            monthlyProductionEstimate=1440.0,
-            ratedPowerUnit=1,
-            monitoringContractCustomBanner=False,
-            monitoringContractStatus=1,
-            monitoringContractEndDate="2025-12-31",
-            estimatedCommissioningDate="2020-01-01",
-            cellModemContractAccessNote="",
-            cellModemContractTerminateDate=None,
-            cellModemContractIsManual=False,
-            customerLogo="",
-            capacityAc=100,
-            customQueryKey="",
-            preferredWsForEstimatedInsolation=1,
-            requiresPubIp=False,
-            defaultQuery=1,
-            monitoringContractWillNotRenew=False,
-            capacityAcUnit=1,
-            status=1,
-            latitude=40.7128,
-            ratedPower=100,
-            advancedSiteConfiguration=False,
-            monitoringContractTerminateDate=None,
-            actualCommissioningDate="2020-01-01",
-            estimatedLosses={},
-            cellModemContractWarnDate=None,
-            monitoringContractAccessNote="",
-            validDataDate="2023-01-01",
-            paymentStatus=1,
-            capacityDc=120.0,
-            monitoringContractStartDate="2020-01-01",
-            energyCapacity=100,
-            overviewChart1="chart1",
-            overviewChart2="chart2",
-            cellModemContractWillNotRenew=False,
-            siteType=1,
-            sitePhotos=None
-        )
+        return _mock_site_detailed_info(site_id)
 
     def get_chart_definitions(self):
         # Return mock chart definitions
-        return [
-            {
-                "id": 1,
-                "name": "Production Overview",
-                "description": "Daily production chart",
-                "type": "line"
-            },
-            {
-                "id": 2,
-                "name": "Inverter Performance",
-                "description": "Inverter efficiency chart",
-                "type": "bar"
-            }
-        ]
+        return _CHART_DEFINITIONS
 
     def get_chart_data(self, chart_type, site_id, start_date=None, end_date=None, bin_size=None):
         # Return mock ChartData
-        from powertrack_sdk.models import ChartData, ChartSeries
-        series = [
-            ChartSeries(
-                name="Production",
-                key="prod",
-                dataXy=[(1640995200, 50.0), (1641081600, 48.0)],  # Sample data
-                color="#FF0000",
-                customUnit="kWh",
-                dataMax=50.0,
-                dataMin=48.0,
-                diameter=2,
-                fitExponent=1,
-                header="Production",
-                lineColor="#FF0000",
-                lineType=0,
-                lineWidth=2,
-                rightAxis=False,
-                units=0,
-                useBinnedData=False,
-                visible=True,
-                xSeriesHeader="Time",
-                xSeriesKey="time",
-                xSeriesName="Time",
-                xUnits="timestamp",
-                yAxisIndex=0,
-                yMax=50.0,
-                yMin=48.0,
-                alertMessageMap=None
-            )
-        ]
-        return ChartData(
-            allowSmallBinSize=True,
+        return dataclasses.replace(
+            _CHART_DATA_TEMPLATE,
             binSize=bin_size or 1440,
-            currentNowBinIndex=0,
-            dataNotAvailable=False,
-            durations=[{"key": "day", "name": "Day", "value": 1}],
             end=end_date or "2024-01-31T23:59:59Z",
-            errorString="",
-            hardwareKeys=["H12345"],
-            hasAlertMessages=False,
-            hasOverriddenQuery=False,
-            isCategoryChart=False,
-            isSummaryChart=False,
-            isUsingDaylightSavings=False,
             key=f"chart_{chart_type}_{site_id}",
-            lastChanged="2023-01-01T00:00:00Z",
-            lastDataDatetime="2024-01-31T23:59:59Z",
-            namedResults={"energy": 98.0},
-            renderType=0,
-            series=series,
-            summaryTable=[{"key": "total", "value": 100.0}],
             start=start_date or "2024-01-01T00:00:00Z"
         )
 
     # Modeling
     def get_modeling_data(self, site_id: str) -> Optional[ModelingData]:
-        from powertrack_sdk.models import ModelingData
-        return ModelingData(siteId=site_id, pvConfig={}, inverters=[{"inverterKw": 50}], ts="ts", rawData={})
+        return _mock_modeling_data(site_id)
 
     def get_register_offsets(self, hardware_id: str) -> Dict[str, Any]:
         # Return mock register offsets
@@ -588,70 +684,936 @@ class MockClient:
         return SiteData(site=site, config=config, hardware=hardware, alerts=alerts, modeling=modeling)
 
 
-def get_client(use_mock: bool = False):
+_CLIENT_LOCK = threading.Lock()
+
+# Keep-alive connections held by the shared real client. One client serves every
+# worker thread (including --asyncio's larger pools), so size the pool for that
+# rather than urllib3's default of 10; extra connections beyond it aren't reused.
+_CLIENT_POOL_MAXSIZE = 64
+
+
+@functools.lru_cache(maxsize=4)
+def _build_client(use_mock: bool, http_retries: Optional[int] = None, timeout: Optional[float] = None):
+    if use_mock:
+        return MockClient()
+    # Imported here so --mock runs never load the HTTP client stack
+    from powertrack_sdk import PowerTrackClient
+    kwargs: Dict[str, Any] = {"pool_maxsize": _CLIENT_POOL_MAXSIZE}
+    if http_retries is not None:
+        kwargs["max_retries"] = http_retries
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    client = PowerTrackClient(**kwargs)
+    # Close the pooled keep-alive connections cleanly at interpreter exit
+    atexit.register(client.close)
+    return client
+
+
+def get_client(use_mock: bool = False, http_retries: Optional[int] = None, timeout: Optional[float] = None):
     """Return a client instance.
 
     If `use_mock` is True, returns a MockClient. Otherwise returns a real
     `PowerTrackClient()` instance which uses the SDK authentication behavior.
+
+    Clients are built once per process and shared, so auth setup and the HTTP
+    session/connection pool (with the SDK's urllib3 retry policy) are reused across
+    calls and worker threads; the session is closed at exit. Scripts that wrap every
+    call in retry_call pass http_retries=0 so failures surface to that loop at once
+    instead of being retried (and backed off) a second time inside the session.
+    `timeout` (seconds) replaces the SDK's default per-request timeout, so a script's
+    --timeout cuts off the HTTP request itself rather than only abandoning the call.
+    Call `get_client.cache_clear()` to force a fresh client (e.g. in tests).
     """
-    if use_mock:
-        return MockClient()
-    return PowerTrackClient()
+    with _CLIENT_LOCK:
+        return _build_client(bool(use_mock), http_retries, timeout)
+
+
+get_client.cache_clear = _build_client.cache_clear
+
+
+# Set to cut short any retry backoff waits in progress (see cancel_retries).
+_shutdown_event = threading.Event()
+# How often an asyncio backoff wait checks whether cancel_retries() was called.
+_CANCEL_POLL_INTERVAL = 0.1
+
+
+def cancel_retries() -> None:
+    """Wake every retry_call waiting on backoff and make it give up immediately.
+
+    Useful from a KeyboardInterrupt/shutdown handler so worker threads don't keep
+    sleeping out their backoff before the process can exit.
+    """
+    _shutdown_event.set()
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available; never waits."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def reserve(self) -> float:
+        """Take a token, going into debt if needed; returns seconds until it is actually available."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+RETRY_MODES = ("legacy", "standard", "adaptive")
+# Upper bound on a single decorrelated-jitter sleep, in seconds.
+_RETRY_CAP = 20.0
+# Shared across every retry_call/retry_call_async in the process so a burst of
+# failures can't turn into a retry storm against the backend.
+_RETRY_BUCKET = _TokenBucket(rate=10.0, capacity=20)
+_retry_mode = "legacy"
+
+
+def set_retry_mode(mode: str) -> None:
+    """Set the process-wide default retry mode used when retry_call isn't given one.
+
+    - legacy: exponential backoff (backoff * 2**(n-1)) with a [0.5, 1.5) jitter factor.
+    - standard: decorrelated jitter, min(cap, uniform(backoff, prev_sleep * 3)); a retry
+      is only made if the shared token bucket has a token, otherwise the call gives up
+      (logged as a warning) with retries to spare.
+    - adaptive: decorrelated jitter, but waits for a bucket token instead of giving up.
+    """
+    global _retry_mode
+    if mode not in RETRY_MODES:
+        raise ValueError(f"Unknown retry mode: {mode!r} (expected one of {', '.join(RETRY_MODES)})")
+    _retry_mode = mode
+
+
+def _retry_delay(mode: str, attempt: int, backoff: float, prev: float) -> Optional[float]:
+    """Seconds to sleep before retry `attempt`, or None if the retry budget is exhausted."""
+    if mode == "legacy":
+        return backoff * (1 << (attempt - 1)) * (0.5 + random.random())
+    delay = min(_RETRY_CAP, random.uniform(backoff, max(backoff, prev * 3)))
+    if mode == "adaptive":
+        return max(delay, _RETRY_BUCKET.reserve())
+    if not _RETRY_BUCKET.try_acquire():
+        return None
+    return delay
+
 
+def _log_budget_exhausted(fn: Callable, attempt: int, retries: int) -> None:
+    name = getattr(fn, "__name__", repr(fn))
+    logger.warning(f"Retry budget exhausted; giving up on {name} after {attempt} of {retries + 1} attempts")
 
-def retry_call(fn: Callable, *args, retries: int = 2, backoff: float = 0.5, timeout: Optional[float] = None, **kwargs) -> Tuple[bool, Any]:
-    """Call fn(*args, **kwargs) with retries and exponential backoff.
+
+def _start_attempt(fn: Callable, args: tuple, kwargs: Dict[str, Any]) -> "Future[Any]":
+    """Start fn(*args, **kwargs) on its own daemon thread and return a Future for it.
+
+    The call starts right away rather than queueing on a shared pool, so a timeout
+    measured on the Future covers only the call itself, never time spent waiting
+    behind other callers' (possibly abandoned) attempts.
+    """
+    future: "Future[Any]" = Future()
+
+    def run() -> None:
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="retry_call-attempt", daemon=True).start()
+    return future
+
+
+def _call_with_timeout(fn: Callable, args: tuple, kwargs: Dict[str, Any], timeout: float) -> Any:
+    """Run fn(*args, **kwargs) on its own thread, waiting at most `timeout` seconds.
+
+    On timeout the call is left to finish on its thread and its result is dropped.
+    """
+    return _start_attempt(fn, args, kwargs).result(timeout=timeout)
+
+
+async def _sleep_unless_cancelled(delay: float) -> bool:
+    """asyncio sleep for `delay` seconds; returns True early once cancel_retries() is called."""
+    deadline = time.monotonic() + delay
+    while not _shutdown_event.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(remaining, _CANCEL_POLL_INTERVAL))
+    return True
+
+
+def retry_call(fn: Callable, *args, retries: int = 2, backoff: float = 0.5, timeout: Optional[float] = None,
+               retry_mode: Optional[str] = None, **kwargs) -> Tuple[bool, Any]:
+    """Call fn(*args, **kwargs) with retries and jittered backoff.
+
+    The sleep schedule depends on `retry_mode` (default: the mode set with
+    set_retry_mode, initially "legacy"); see set_retry_mode for the options.
+    If `timeout` is set, each attempt runs on its own thread and is abandoned after
+    that many seconds of running and counted as a failure (the abandoned call keeps
+    running in the background; its result is ignored). For HTTP calls prefer also
+    giving the client a request timeout (get_client(timeout=...)) so the request
+    itself is cut off. Backoff waits end early, returning the last failure,
+    once cancel_retries() is called.
 
     Returns (success, result_or_exception).
     """
+    mode = retry_mode or _retry_mode
+    if mode not in RETRY_MODES:
+        raise ValueError(f"Unknown retry mode: {mode!r}")
     attempt = 0
+    prev = backoff
     while True:
         try:
-            res = fn(*args, **kwargs)
+            if timeout is None:
+                res = fn(*args, **kwargs)
+            else:
+                res = _call_with_timeout(fn, args, kwargs, timeout)
             return True, res
         except Exception as e:
             attempt += 1
-            if attempt > retries:
+            if attempt > retries or _shutdown_event.is_set():
+                return False, e
+            delay = _retry_delay(mode, attempt, backoff, prev)
+            if delay is None:
+                _log_budget_exhausted(fn, attempt, retries)
                 return False, e
-            sleep_seconds = backoff * (2 ** (attempt - 1))
-            sleep(sleep_seconds)
+            if _shutdown_event.wait(delay):
+                return False, e
+            prev = delay
+
 
+async def retry_call_async(fn: Callable, *args, retries: int = 2, backoff: float = 0.5, timeout: Optional[float] = None,
+                           retry_mode: Optional[str] = None, **kwargs) -> Tuple[bool, Any]:
+    """asyncio counterpart of retry_call with the same backoff schedule and return value.
 
-def parallel_map(func: Callable[[Any], Any], items: Iterable[Any], workers: int = 5, retries: int = 2, backoff: float = 0.5, timeout: Optional[float] = None) -> List[Tuple[Any, bool, Any]]:
-    """Apply func to items in parallel with retries. Returns list of (item, success, result_or_exception).
+    Coroutine functions are awaited directly; plain callables (e.g. the blocking
+    client methods) run in the loop's default executor, or on their own thread when
+    `timeout` is set, so many retries can be waiting on one event loop without each
+    holding a thread while it sleeps. Backoff waits end early once cancel_retries()
+    is called.
     """
-    results: List[Tuple[Any, bool, Any]] = []
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        future_to_item = {}
-        for item in items:
-            future = ex.submit(retry_call, func, item, retries=retries, backoff=backoff, timeout=timeout)
-            future_to_item[future] = item
-
-        for fut in as_completed(future_to_item):
-            item = future_to_item[fut]
+    mode = retry_mode or _retry_mode
+    if mode not in RETRY_MODES:
+        raise ValueError(f"Unknown retry mode: {mode!r}")
+    loop = asyncio.get_running_loop()
+    attempt = 0
+    prev = backoff
+    while True:
+        try:
+            if asyncio.iscoroutinefunction(fn):
+                call = fn(*args, **kwargs)
+            elif timeout is None:
+                call = loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+            else:
+                # A timed attempt gets its own thread, like retry_call's: the clock starts
+                # when the call does, and an abandoned attempt doesn't hold an executor
+                # thread that later attempts would queue behind.
+                call = asyncio.wrap_future(_start_attempt(fn, args, kwargs))
+            res = await asyncio.wait_for(call, timeout)
+            return True, res
+        except Exception as e:
+            attempt += 1
+            if attempt > retries or _shutdown_event.is_set():
+                return False, e
+            delay = _retry_delay(mode, attempt, backoff, prev)
+            if delay is None:
+                _log_budget_exhausted(fn, attempt, retries)
+                return False, e
+            if await _sleep_unless_cancelled(delay):
+                return False, e
+            prev = delay
+
+
+# Executors shared across parallel_map calls, keyed by worker count, so repeated
+# calls don't pay thread start-up and teardown each time.
+_POOLS: Dict[int, ThreadPoolExecutor] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _get_pool(workers: int) -> ThreadPoolExecutor:
+    """Return the shared executor for `workers` threads, creating it on first use."""
+    pool = _POOLS.get(workers)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(workers)
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=workers)
+                _POOLS[workers] = pool
+    return pool
+
+
+def _shutdown_pools() -> None:
+    _shutdown_event.set()
+    for pool in _POOLS.values():
+        pool.shutdown(wait=False)
+
+
+atexit.register(_shutdown_pools)
+
+
+def _parallel_indexed(func: Callable[[Any], Any], items: Iterable[Any], workers: int, retries: int, backoff: float, timeout: Optional[float],
+                      executor: Optional[Executor] = None) -> Iterator[Tuple[int, Any, bool, Any]]:
+    """Yield (index, item, success, result_or_exception) in completion order.
+
+    Items are consumed lazily: at most 2 * workers calls are in flight at a time, and a new item
+    is submitted whenever one finishes, so memory stays O(workers) for very large iterables.
+    Runs on `executor` if given, otherwise on the shared pool for `workers`.
+    """
+    ex = executor if executor is not None else _get_pool(workers)
+    it = enumerate(items)
+    inflight: Dict[Any, Tuple[int, Any]] = {}
+
+    def submit_next() -> bool:
+        try:
+            idx, item = next(it)
+        except StopIteration:
+            return False
+        future = ex.submit(retry_call, func, item, retries=retries, backoff=backoff, timeout=timeout)
+        inflight[future] = (idx, item)
+        return True
+
+    for _ in range(2 * workers):
+        if not submit_next():
+            break
+
+    while inflight:
+        done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+        for fut in done:
+            idx, item = inflight.pop(fut)
             try:
                 ok, res = fut.result()
             except Exception as e:
                 ok = False
                 res = e
-            results.append((item, ok, res))
+            submit_next()
+            yield idx, item, ok, res
+
+
+def parallel_imap(func: Callable[[Any], Any], items: Iterable[Any], workers: int = 5, retries: int = 2, backoff: float = 0.5, timeout: Optional[float] = None,
+                  executor: Optional[Executor] = None) -> Iterator[Tuple[Any, bool, Any]]:
+    """Apply func to items in parallel with retries, yielding (item, success, result_or_exception)
+    as each call completes.
+
+    Results are yielded in completion order and dropped as soon as they are handed out; see
+    _parallel_indexed for how input is consumed.
+    """
+    for _, item, ok, res in _parallel_indexed(func, items, workers, retries, backoff, timeout, executor):
+        yield item, ok, res
+
+
+def parallel_map(func: Callable[[Any], Any], items: Iterable[Any], workers: int = 5, retries: int = 2, backoff: float = 0.5, timeout: Optional[float] = None,
+                 executor: Optional[Executor] = None) -> List[Tuple[Any, bool, Any]]:
+    """Apply func to items in parallel with retries. Returns list of (item, success, result_or_exception)
+    in the same order as `items`.
+    """
+    items_list = list(items)
+    results: List[Any] = [None] * len(items_list)
+    for idx, item, ok, res in _parallel_indexed(func, items_list, workers, retries, backoff, timeout, executor):
+        results[idx] = (item, ok, res)
     return results
 
 
-def save_json(obj: Any, path: str):
-    p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
+def parallel_map_ordered(func: Callable[[Any], Any], items: Iterable[Any], workers: int = 5, retries: int = 2, backoff: float = 0.5, timeout: Optional[float] = None,
+                         executor: Optional[Executor] = None) -> List[Tuple[bool, Any]]:
+    """Like parallel_map but returns only (success, result_or_exception) per item, in input order.
+
+    Dispatches through Executor.map, with a chunksize of about len(items) / (4 * workers)
+    to amortize dispatch when `executor` is a ProcessPoolExecutor (thread pools ignore it).
+    """
+    items_list = list(items)
+    ex = executor if executor is not None else _get_pool(workers)
+    call = functools.partial(retry_call, func, retries=retries, backoff=backoff, timeout=timeout)
+    chunksize = max(1, len(items_list) // (workers * 4))
+    return list(ex.map(call, items_list, chunksize=chunksize))
+
+
+def async_map(func: Callable[[Any], Any], items: Iterable[Any], concurrency: int = 50, retries: int = 2, backoff: float = 0.5,
+              timeout: Optional[float] = None) -> List[Tuple[Any, bool, Any]]:
+    """Apply func to items on an asyncio event loop with retries; same return shape and order as parallel_map.
+
+    Up to `concurrency` calls are in flight at once (an asyncio.Semaphore gate); retry
+    backoff waits are asyncio sleeps, so they don't occupy a thread. Blocking callables run
+    on a thread pool sized to `concurrency` that lives only for this call (with `timeout`,
+    each attempt gets its own thread instead; see retry_call_async).
+    """
+    items_list = list(items)
+
+    async def run_all():
+        loop = asyncio.get_running_loop()
+        ex = ThreadPoolExecutor(max_workers=max(1, concurrency))
+        loop.set_default_executor(ex)
+        sem = asyncio.Semaphore(concurrency)
+
+        async def bounded(item):
+            async with sem:
+                ok, res = await retry_call_async(func, item, retries=retries, backoff=backoff, timeout=timeout)
+            return item, ok, res
+
+        try:
+            return await asyncio.gather(*(bounded(item) for item in items_list))
+        finally:
+            ex.shutdown(wait=False)
+
+    return asyncio.run(run_all())
+
+
+def _field_names(cls: type) -> Optional[Tuple[str, ...]]:
+    """Attribute names to encode for dataclass, attrs or __slots__ classes, else None."""
+    if dataclasses.is_dataclass(cls):
+        return tuple(f.name for f in dataclasses.fields(cls))
+    attrs_fields = getattr(cls, "__attrs_attrs__", None)  # attrs classes, without importing attrs
+    if attrs_fields is not None:
+        return tuple(a.name for a in attrs_fields)
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    names = [n for n in names if n not in ("__dict__", "__weakref__")]
+    return tuple(names) if names else None
+
+
+def _isoformat_utc_z(o: Any) -> str:
+    """isoformat() with a UTC offset written as "Z", as orjson does with OPT_UTC_Z."""
+    text = o.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _build_encoder(cls: type) -> Callable[[Any], Any]:
+    names = _field_names(cls)
+    if names is not None:
+        if not names:
+            return lambda o: {}
+        getter = attrgetter(*names)
+        if len(names) == 1:
+            return lambda o: {names[0]: getter(o)}
+        # Shallow: nested dataclasses/arrays come back through _json_default themselves,
+        # which avoids the deepcopy that dataclasses.asdict does.
+        return lambda o: dict(zip(names, getter(o)))
+    if hasattr(cls, "tolist"):  # numpy arrays (when orjson isn't handling them) and array.array
+        return lambda o: o.tolist()
+    if hasattr(cls, "isoformat"):  # datetime/date/time, matching orjson's native output
+        return _isoformat_utc_z
+    if issubclass(cls, (set, frozenset)):
+        return list
+    if issubclass(cls, MappingProxyType):
+        return dict
+    # Anything else (e.g. SDK objects embedded in API responses) is kept as its repr
+    # so a single odd value doesn't abort writing a backup/summary file.
+    return repr
+
+
+# Per-type encoders for _json_default, built on first sight of each type.
+_ENCODERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _json_default(o: Any) -> Any:
+    """Fallback encoder for objects the JSON backend can't serialize natively."""
+    cls = type(o)
+    encoder = _ENCODERS.get(cls)
+    if encoder is None:
+        encoder = _ENCODERS.setdefault(cls, _build_encoder(cls))
+    return encoder(o)
+
+
+def _build_output_encoder(cls: type) -> Callable[[Any], Any]:
+    encoder = _build_encoder(cls)
+    if encoder is not repr:
+        return encoder
+    # Arbitrary objects are shown via their attributes (else str()) rather than a repr
+    return lambda o: vars(o) if hasattr(o, "__dict__") else str(o)
+
+
+# Per-type encoders for _output_default, built on first sight of each type.
+_OUTPUT_ENCODERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _output_default(o: Any) -> Any:
+    """Fallback encoder for write_output; the JSON backend calls it only for objects it
+    can't encode natively, so everything else stays in the encoder."""
+    cls = type(o)
+    encoder = _OUTPUT_ENCODERS.get(cls)
+    if encoder is None:
+        encoder = _OUTPUT_ENCODERS.setdefault(cls, _build_output_encoder(cls))
+    return encoder(o)
+
+
+# Exact types to_safe returns as-is; a set lookup on type(o) beats isinstance() with
+# a tuple for the leaves that make up most of a result tree.
+_PRIMITIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def to_safe(o: Any, _scalars=(str, int, float, bool), _isinstance=isinstance, _str=str) -> Any:
+    """Return o as a detached tree of plain dicts, lists and scalars.
+
+    For callers that need to inspect or mutate a result as plain data; when it's only
+    going to be written out, pass the object to save_json/write_output instead. Non-
+    container objects are converted with the same per-type rules as write_output.
+    """
+    if type(o) in _PRIMITIVE_TYPES:
+        return o
+    if _isinstance(o, dict):
+        return {_str(k): to_safe(v) for k, v in o.items()}
+    if _isinstance(o, (list, tuple)):
+        return [to_safe(v) for v in o]
+    if _isinstance(o, _scalars):  # str/int/float subclasses, e.g. enums
+        return o
+    return to_safe(_output_default(o))
+
+
+# fdatasync skips the metadata flush fsync does, but isn't available everywhere (macOS, Windows).
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _iter_json_chunks(obj: Any, default: Optional[Callable[[Any], Any]] = None, depth: int = 1,
+                      compact: bool = False) -> Iterator[bytes]:
+    """Yield the JSON encoding of obj (byte-identical to _dumps) a piece at a time.
+
+    A dict or dataclass/slots object is encoded one value at a time and spliced into
+    the outer {...} (re-indented by one level; encoded JSON can't hold a raw newline
+    inside a string, so that is a plain byte replace). With depth > 1 the values are
+    split the same way, and lists/tuples item by item, down to `depth` levels. Only the
+    largest piece, not the whole document, is ever resident as bytes.
+    """
+    if compact:
+        indent, open_sep, item_sep, colon = b"", b"", b",", b":"
+    else:
+        indent, open_sep, item_sep, colon = b"\n  ", b"\n  ", b",\n  ", b": "
+    if isinstance(obj, dict):
+        top = obj
+    elif depth > 1 and isinstance(obj, (list, tuple)) and obj:
+        sep = b"[" + open_sep
+        for item in obj:
+            yield sep
+            for chunk in _iter_json_chunks(item, default, depth - 1, compact):
+                yield chunk.replace(b"\n", indent) if indent else chunk
+            sep = item_sep
+        yield (b"\n]" if indent else b"]")
+        return
+    elif _field_names(type(obj)) is not None:
+        top = (default or _json_default)(obj)
+    else:
+        top = None
+    if depth < 1 or not top or not all(type(k) is str for k in top):
+        yield _dumps(obj, default, compact)
+        return
+    sep = b"{" + open_sep
+    for key, value in top.items():
+        yield sep + _dumps(key) + colon
+        for chunk in _iter_json_chunks(value, default, depth - 1, compact):
+            yield chunk.replace(b"\n", indent) if indent else chunk
+        sep = item_sep
+    yield (b"\n}" if indent else b"}")
+
+
+# save_json gathers encoded sections into writes of at least this size, so a
+# config with hundreds of small top-level keys costs a handful of write calls.
+_WRITE_BUFFER_BYTES = 1 << 18
+
+
+def _write_all(fd: int, data: Union[bytes, bytearray]) -> None:
+    """os.write data to fd in full, resuming after short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def save_json(obj: Any, path: str, makedirs: bool = True):
+    """Write obj to path as indented UTF-8 JSON.
+
+    Encodes via _dumps (orjson, then ujson, then the stdlib, whichever is installed),
+    one top-level section at a time (see _iter_json_chunks) so large SiteData trees
+    aren't held as a single encoded buffer; small sections are coalesced into
+    writes of about _WRITE_BUFFER_BYTES. The bytes go straight to a sibling temp
+    file descriptor (unique per process and thread, so concurrent save_json_async
+    writes to one path can't interleave), are flushed to disk (fdatasync where
+    available), and then moved into place with os.replace, so readers never see a
+    partially written file, even after a crash. Pass makedirs=False when writing
+    many files into a directory the caller already created, to skip the per-file mkdir.
+    """
+    path = os.fspath(path)
+    parent = os.path.dirname(path)
+    if parent and makedirs:
+        os.makedirs(parent, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            buf = bytearray()
+            for chunk in _iter_json_chunks(obj):
+                if not buf and len(chunk) >= _WRITE_BUFFER_BYTES:
+                    _write_all(fd, chunk)
+                    continue
+                buf += chunk
+                if len(buf) >= _WRITE_BUFFER_BYTES:
+                    _write_all(fd, buf)
+                    buf.clear()
+            if buf:
+                _write_all(fd, buf)
+            _fdatasync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# Background writer for save_json_async. Unlike the parallel_map pools it is shut
+# down with wait=True at exit, so a write submitted just before the script
+# returns still lands on disk.
+_SAVE_POOL_WORKERS = 2
+_save_pool: Optional[ThreadPoolExecutor] = None
+_save_pool_lock = threading.Lock()
+
+
+def save_json_async(obj: Any, path: str, makedirs: bool = True) -> "Future[None]":
+    """Run save_json(obj, path) on a background thread and return its Future.
+
+    Lets a script overlap backup/response writes with each other and with its
+    remaining work. Call .result() to wait for (or re-raise from) a write;
+    writes still pending at interpreter exit are finished before it exits.
+    """
+    global _save_pool
+    if _save_pool is None:
+        with _save_pool_lock:
+            if _save_pool is None:
+                _save_pool = ThreadPoolExecutor(max_workers=_SAVE_POOL_WORKERS, thread_name_prefix="save_json")
+                atexit.register(_save_pool.shutdown, wait=True)
+    return _save_pool.submit(save_json, obj, path, makedirs)
+
+
+def to_json(obj: Any) -> str:
+    """Return obj as an indented JSON string (same encoder as save_json)."""
+    return _dumps(obj).decode("utf-8")
+
+
+# How many levels of write_output's document are split into separately encoded
+# pieces: the output envelope, the result, the result's fields/items, and one level
+# below that (e.g. each series of a ChartData), so a month-long chart export is
+# never resident as one encoded buffer; the largest piece is a single series.
+_OUTPUT_STREAM_DEPTH = 4
+
+
+def add_output_format_arguments(parser) -> None:
+    """Add the --compact/--pretty pair consumed by write_output(..., compact=args.compact)."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--compact", dest="compact", action="store_true", default=None,
+                       help="Write JSON without indentation (default when stdout is piped)")
+    group.add_argument("--pretty", dest="compact", action="store_false",
+                       help="Indent the JSON even when stdout is piped")
+
+
+def write_output(obj: Any, path: Optional[str] = None, compact: Optional[bool] = None) -> None:
+    """Write obj as JSON to `path`, or to stdout (newline-terminated) if no path.
+
+    The JSON is indented unless `compact` is set; left as None, it is compact only
+    when writing to a stdout that isn't a terminal (piped into jq, another program
+    or a file), where the whitespace is just extra bytes to encode and parse.
+    SDK objects are encoded as they're met (see _output_default), so callers can
+    pass API results straight in without converting them to plain dicts first.
+    The UTF-8 bytes are streamed piece by piece (see _iter_json_chunks) straight to
+    the file or to sys.stdout.buffer, with no decode/encode round-trip through str.
+    """
+    if compact is None:
+        compact = not path and not sys.stdout.isatty()
+    chunks = _iter_json_chunks(obj, _output_default, _OUTPUT_STREAM_DEPTH, compact)
+    if path:
+        with open(path, "wb") as f:
+            f.writelines(chunks)
+        return
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        print(b"".join(chunks).decode("utf-8"))
+        return
+    sys.stdout.flush()
+    buffer.writelines(chunks)
+    buffer.write(b"\n")
+    buffer.flush()
+
+
+# CLI options that shape how an example runs or writes its output rather than the
+# API call itself; build_envelope leaves them out of the recorded "args".
+_NON_CALL_ARGS = frozenset({"mock", "output", "verbose", "compact", "profile", "render", "render_file", "downsample"})
+
+
+def build_envelope(method: str, args: Any, result: Any, rename: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """The {"method", "args", "result", "timestamp"} document the get_* examples write.
+
+    "args" holds the parsed CLI arguments (an argparse Namespace) that were passed to
+    the API call, in parser order, with keys renamed via `rename` where the script
+    records the SDK's parameter name instead of the flag's.
+    """
+    rename = rename or {}
+    call_args = {rename.get(k, k): v for k, v in vars(args).items() if k not in _NON_CALL_ARGS}
+    return {"method": method, "args": call_args, "result": result, "timestamp": datetime.now(timezone.utc)}
+
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+def add_profile_argument(parser) -> None:
+    """Add the --profile flag consumed by profiled(args.profile)."""
+    parser.add_argument("--profile", choices=PROFILERS, default=None,
+                        help="Profile the API call and print the report to stderr (pyinstrument must be installed separately)")
+
+
+@contextlib.contextmanager
+def profiled(profiler: Optional[str], stream=None) -> Iterator[None]:
+    """Run the enclosed block under cProfile or pyinstrument and print its report.
+
+    A no-op when profiler is None. The report goes to `stream` (default stderr) so
+    it never mixes with JSON written to stdout.
+    """
+    if profiler is None:
+        yield
+        return
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler {profiler!r}; expected one of {PROFILERS}")
+    stream = stream or sys.stderr
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise RuntimeError("--profile pyinstrument requires pyinstrument (pip install pyinstrument)") from None
+        prof = Profiler()
+        prof.start()
+        try:
+            yield
+        finally:
+            prof.stop()
+            stream.write(prof.output_text(unicode=True, color=stream.isatty()))
+        return
+    import cProfile
+    import pstats
+
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        pstats.Stats(prof, stream=stream).sort_stats("cumulative").print_stats(30)
+
+
+def write_jsonl_record(f, obj: Any) -> None:
+    """Append obj to a binary file object as one JSON Lines record."""
+    f.write(_dumps_line(obj))
+
+
+def _open_archive_file(path: str, mode: str):
+    """Open a JSONL archive in binary `mode`, compressed according to its suffix.
+
+    .zst uses zstandard (optional; install it to use this suffix), .gz uses gzip,
+    anything else is written uncompressed.
+    """
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError(f"Writing or reading {path} requires the 'zstandard' package; use a .jsonl.gz or .jsonl archive instead") from None
+        if "w" in mode:
+            return zstandard.open(path, mode, cctx=zstandard.ZstdCompressor(level=3, threads=-1))
+        return io.BufferedReader(zstandard.open(path, mode))
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, compresslevel=6)
+    return open(path, mode)
+
+
+class JsonlArchive:
+    """Single-file alternative to writing one small JSON file per site.
+
+    Each write() appends one {"site": key, "data": data} JSON Lines record; see
+    _open_archive_file for the supported compression suffixes. Writes are serialized
+    with a lock, so one archive can be shared by the fetching threads. Read it back
+    with read_archive().
+    """
+
+    def __init__(self, path: str):
+        self.path = os.fspath(path)
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._f = _open_archive_file(self.path, "wb")
+        self._lock = threading.Lock()
+
+    def write(self, site: str, data: Any) -> None:
+        line = _dumps_line({"site": site, "data": data})
+        with self._lock:
+            self._f.write(line)
+
+    def close(self) -> None:
+        with self._lock:
+            self._f.close()
+
+    def __enter__(self) -> "JsonlArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_archive(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the {"site": ..., "data": ...} records of a JsonlArchive, one per line."""
+    with _open_archive_file(os.fspath(path), "rb") as f:
+        for line in f:
+            if line.strip():
+                yield _loads(line)
+
+
+# Files at least this large are memory-mapped and parsed in place by orjson rather
+# than read into an intermediate bytes object first.
+_MMAP_MIN_BYTES = 1 << 20
+
+
+def load_json(path: str) -> Any:
+    """Parse a JSON file from raw bytes with the fastest available backend."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+            return orjson.loads(f.read())
+    return _loads(Path(path).read_bytes())
 
 
 def load_site_list(path: str) -> SiteList:
     """Load a SiteList from a JSON file.
 
+    Same file format as SiteList.from_json_file, parsed via load_json.
     Raises FileNotFoundError if the file doesn't exist.
     """
-    return SiteList.from_json_file(path)
+    raw = load_json(path)
+    return SiteList(raw.get('sites', []), raw.get('metadata', {}))
+
+
+def _site_list_stamp(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def load_site_list_cached(path: str) -> SiteList:
+    """load_site_list, reusing a pickled SiteList from a `<path>.pkl` sidecar when it's fresh.
+
+    The sidecar records the JSON file's mtime and size and is ignored (and rewritten)
+    as soon as either changes. Within one process the result is also memoized.
+    Failing to write the sidecar (e.g. a read-only directory) is not an error.
+    """
+    path = os.fspath(path)
+    return _load_site_list_cached(path, _site_list_stamp(path))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_site_list_cached(path: str, stamp: Tuple[int, int]) -> SiteList:
+    sidecar = path + ".pkl"
+    try:
+        with open(sidecar, "rb") as f:
+            cached_stamp, site_list = pickle.load(f)
+        if cached_stamp == stamp:
+            return site_list
+    except Exception:
+        pass
+    site_list = load_site_list(path)
+    tmp = sidecar + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump((stamp, site_list), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, sidecar)
+    except OSError:
+        logger.debug(f"Could not write site list cache {sidecar}", exc_info=True)
+    return site_list
+
+
+# On-disk cache for cached_get; POWERTRACK_CACHE_DIR overrides the location.
+RESPONSE_CACHE_DIR = Path(os.environ.get("POWERTRACK_CACHE_DIR") or Path.home() / ".cache" / "powertrack")
+# How long a response the server sent without an ETag is reused without re-fetching.
+RESPONSE_CACHE_TTL = 15 * 60
+
+
+def _response_cache_path(method: Callable[..., Any], key: str, cache_dir: Optional[str] = None) -> Path:
+    """Cache file for method(key). Bound client methods are keyed by the client's
+    base_url too, so entries from one environment or account aren't served to another."""
+    base_url = getattr(getattr(method, "__self__", None), "base_url", None) or ""
+    scope = hashlib.sha1(base_url.encode("utf-8")).hexdigest()[:12]
+    return Path(cache_dir or RESPONSE_CACHE_DIR) / f"{method.__name__}-{scope}-{key}.pkl"
+
+
+def cached_get(method: Callable[..., Any], key: str, cache_dir: Optional[str] = None,
+               ttl: float = RESPONSE_CACHE_TTL) -> Any:
+    """Return method(key) (e.g. client.get_site_config), cached on disk between runs.
+
+    A cached response carrying an ETag (its .etag) is revalidated every time with
+    method(key, if_none_match=etag): a 304 reuses the cached object, so an unchanged
+    config costs one empty round trip. A response without an ETag is reused for up
+    to `ttl` seconds; pass ttl=0 when the result must be current (e.g. before
+    applying an update), and call invalidate_cached after the update is sent.
+    Entries are pickled per client base_url, method and key under cache_dir
+    (default RESPONSE_CACHE_DIR); an unreadable or unwritable cache, or a value
+    that can't be pickled, just means a plain fetch.
+    """
+    path = _response_cache_path(method, key, cache_dir)
+    try:
+        with open(path, "rb") as f:
+            fetched_at, value = pickle.load(f)
+    except Exception:
+        fetched_at, value = None, None
+
+    etag = getattr(value, "etag", None)
+    if value is not None and etag:
+        try:
+            fresh = method(key, if_none_match=etag)
+        except NotModified:
+            return value
+    elif value is not None and time.time() - fetched_at < ttl:
+        return value
+    else:
+        fresh = method(key)
+
+    if fresh is not None:
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                pickle.dump((time.time(), fresh), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception:
+            logger.debug(f"Could not write response cache {path}", exc_info=True)
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+    return fresh
+
+
+def invalidate_cached(method: Callable[..., Any], key: str, cache_dir: Optional[str] = None) -> None:
+    """Drop the cached_get entry for method(key), e.g. after updating that resource."""
+    with contextlib.suppress(OSError):
+        os.unlink(_response_cache_path(method, key, cache_dir))
 
 
 def ensure_dir(path: str):
-    Path(path).mkdir(parents=True, exist_ok=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def file_timestamp() -> str:
+    """Current UTC time as "YYYYmmddTHHMMSSZ", for backup and response file names.
+
+    Formats time.gmtime() directly rather than building an aware datetime.
+    """
+    return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
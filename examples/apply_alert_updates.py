@@ -10,40 +10,102 @@ Expected update file format: list of {"hardware_key": "H123", "action": "update"
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import asyncio
 import logging
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:
-    from examples._util import get_client, ensure_dir, save_json, retry_call, parallel_map
+    from examples._util import file_timestamp, get_client, ensure_dir, save_json, load_json, to_json, write_jsonl_record, retry_call, retry_call_async, parallel_imap
 except Exception:
-    from _util import get_client, ensure_dir, save_json, retry_call, parallel_map
+    from _util import file_timestamp, get_client, ensure_dir, save_json, load_json, to_json, write_jsonl_record, retry_call, retry_call_async, parallel_imap
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
+def _do_update(client, hw: str, payload: Dict[str, Any]) -> Tuple[bool, Any]:
+    result = client.update_alert_triggers(hw, payload, return_full_response=True)
+    try:
+        return result.success, result
+    except AttributeError:
+        return bool(result), result
+
+
+def _do_add(client, hw: str, payload: Dict[str, Any]) -> Tuple[bool, Any]:
+    return bool(client.add_alert_trigger(hw, payload)), None
+
+
+def _do_delete(client, hw: str, payload: Dict[str, Any]) -> Tuple[bool, Any]:
+    return bool(client.delete_alert_trigger(hw)), None
+
+
+# Handlers per update action; each returns (success, response_or_None).
+_ACTIONS: Dict[str, Callable[[Any, str, Dict[str, Any]], Tuple[bool, Any]]] = {
+    'update': _do_update,
+    'add': _do_add,
+    'delete': _do_delete,
+}
+
+# Actions that can be repeated without changing the outcome: update PUTs the full
+# trigger payload and delete removes it. add POSTs a new trigger each time.
+_IDEMPOTENT_ACTIONS = frozenset({'update', 'delete'})
+
+
+def _never_sent(exc: Optional[BaseException]) -> bool:
+    """True if exc is a transport error raised before the request reached the server."""
+    if exc is None or 'requests' not in sys.modules:  # no HTTP stack loaded (e.g. --mock)
+        return False
+    import requests
+    from urllib3.exceptions import NewConnectionError
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError) and exc.args:
+        return isinstance(getattr(exc.args[0], 'reason', None), NewConnectionError)
+    return False
+
+
+def _retry_safe(action: str, exc: BaseException) -> bool:
+    """Whether an update that failed with exc can be retried without risking a duplicate write.
+
+    A request that never reached the server can always be resent. Otherwise only
+    idempotent actions are retried, and only for transport errors and 5xx responses.
+    """
+    if _never_sent(exc) or _never_sent(exc.__cause__ or exc.__context__):
+        return True
+    if action not in _IDEMPOTENT_ACTIONS:
+        return False
+    status = getattr(exc, 'status_code', None)
+    return status is None or status >= 500
+
+
 def load_updates(path: str) -> List[Dict[str, Any]]:
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_json(path)
 
 
-def main(argv: Optional[List[str]] = None):
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Apply alert updates (dry-run by default)")
     parser.add_argument("--updates-file", required=True, help="JSON file with updates")
     parser.add_argument("--apply", action="store_true", help="Perform updates")
     parser.add_argument("--backup-dir", default="portfolio/alert_backups/", help="Directory to save applied payloads/responses")
     parser.add_argument("--mock", action="store_true", help="Use mock client for testing")
     parser.add_argument("--parallel", action="store_true", help="Apply updates in parallel")
-    parser.add_argument("--workers", type=int, default=5, help="Worker count when using --parallel")
+    parser.add_argument("--asyncio", action="store_true", help="Apply updates concurrently on an asyncio event loop (retries wait without holding threads)")
+    parser.add_argument("--workers", type=int, default=5, help="Worker count when using --parallel or --asyncio")
     parser.add_argument("--limit", type=int, default=0, help="Limit number of updates to process (0 = no limit)")
-    parser.add_argument("--retries", type=int, default=2, help="Retries per update on failure")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="Retries per update on failure (add is only retried if the request was never sent)")
     parser.add_argument("--backoff", type=float, default=0.5, help="Initial backoff seconds for retries")
-    parser.add_argument("--timeout", type=float, default=None, help="Per-request timeout (unused) - reserved")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-request HTTP timeout in seconds (default: the SDK's)")
+    parser.add_argument("--emit-json-array", action="store_true", help="Also write the summary as a single JSON array (.json) after all updates finish")
+    return parser
+
 
-    args = parser.parse_args(argv)
+def main(argv: Optional[List[str]] = None):
+    args = _build_parser().parse_args(argv)
 
     try:
         updates = load_updates(args.updates_file)
@@ -51,70 +113,100 @@ def main(argv: Optional[List[str]] = None):
         logger.error(f"Failed to load updates file: {e}")
         sys.exit(2)
 
-    client = get_client(use_mock=args.mock)
+    # No retries inside the HTTP session: it would resend a POST that may already
+    # have been applied. retry_call below decides what is safe to retry.
+    client = get_client(use_mock=args.mock, http_retries=0, timeout=args.timeout)
 
     # Apply limit if requested
     if args.limit and args.limit > 0:
         updates = updates[:args.limit]
 
-    summary = []
-
     if not args.apply:
-        logger.info("Dry-run: will not apply changes. Listing planned actions:")
-        for u in updates:
-            logger.info(json.dumps(u, indent=2))
+        # Encode and log the whole plan once rather than one record per update
+        logger.info("Dry-run: will not apply changes. Planned actions (%d items):\n%s", len(updates), to_json(updates))
         return {"planned": updates}
 
     ensure_dir(args.backup_dir)
-    ts = __import__('datetime').datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+    ts = file_timestamp()
 
     def apply_update(u):
+        # Errors that are safe to retry propagate to the retry_call layer around this
+        # function (emit() records them once retries run out). Anything else, e.g. an
+        # add that may have reached the server, is recorded as a failure right away.
         hw = u.get('hardware_key')
         action = u.get('action', 'update')
-        payload = u.get('payload', {})
         record = {"hardware_key": hw, "action": action, "success": False}
+        handler = _ACTIONS.get(action)
+        if handler is None:
+            record['error'] = f"Unknown action: {action}"
+            return record
         try:
-            if action == 'update':
-                result = client.update_alert_triggers(hw, payload, return_full_response=True)
-                record['success'] = getattr(result, 'success', bool(result))
-                record['response'] = result.__dict__ if hasattr(result, '__dict__') else result
-            elif action == 'add':
-                ok = client.add_alert_trigger(hw, payload)
-                record['success'] = bool(ok)
-            elif action == 'delete':
-                ok = client.delete_alert_trigger(hw)
-                record['success'] = bool(ok)
-            else:
-                record['error'] = f"Unknown action: {action}"
+            success, response = handler(client, hw, u.get('payload', {}))
         except Exception as e:
-            logger.exception(f"Failed to process update for {hw}: {e}")
+            if _retry_safe(action, e):
+                raise
+            logger.error(f"Failed to {action} alert triggers for {hw} (not retried): {e}")
             record['error'] = str(e)
+            return record
+        record['success'] = success
+        if response is not None:
+            # Keep the UpdateResult as-is: the JSON writers encode dataclasses natively
+            # (orjson) or via cached per-type encoders, so there's no __dict__ walk here.
+            record['response'] = response
         return record
 
-    if args.parallel:
-        logger.info(f"Applying updates in parallel for {len(updates)} updates (workers={args.workers})")
-        results = parallel_map(apply_update, updates, workers=args.workers, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
-        for item, ok, res in results:
-            if ok:
-                summary.append(res)
-            else:
-                logger.error(f"Failed to process update {item}: {res}")
-                summary.append({"hardware_key": item.get('hardware_key'), "action": item.get('action'), "success": False, "error": str(res)})
-    else:
-        logger.info(f"Applying updates sequentially for {len(updates)} updates")
-        for u in updates:
-            ok, res = retry_call(apply_update, u, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
-            if ok:
-                summary.append(res)
-            else:
-                logger.error(f"Failed to process update {u.get('hardware_key')}: {res}")
-                summary.append({"hardware_key": u.get('hardware_key'), "action": u.get('action'), "success": False, "error": str(res)})
-
-    # Save summary and responses
-    out_path = Path(args.backup_dir) / f"applied_alerts_{ts}.json"
-    save_json(summary, str(out_path))
-    logger.info(f"Applied alerts saved to {out_path}")
-    return {'applied': summary}
+    # Records are appended to a JSON Lines file as each update completes, so memory
+    # stays flat and a crash keeps everything written so far.
+    out_path = Path(args.backup_dir) / f"applied_alerts_{ts}.jsonl"
+    summary: Optional[List[Dict[str, Any]]] = [] if args.emit_json_array else None
+    counts = {"total": 0, "failed": 0}
+
+    def emit(u, ok, res):
+        if ok:
+            record = res
+        else:
+            logger.error(f"Failed to process update {u.get('hardware_key')}: {res}")
+            record = {"hardware_key": u.get('hardware_key'), "action": u.get('action'), "success": False, "error": str(res)}
+        write_jsonl_record(out, record)
+        counts["total"] += 1
+        if not record.get('success'):
+            counts["failed"] += 1
+        if summary is not None:
+            summary.append(record)
+
+    with open(out_path, 'ab') as out:
+        if args.asyncio:
+            logger.info(f"Applying updates with asyncio for {len(updates)} updates (concurrency={args.workers})")
+
+            async def apply_all():
+                sem = asyncio.Semaphore(args.workers)
+
+                async def run(u):
+                    async with sem:
+                        ok, res = await retry_call_async(apply_update, u, retries=args.retries, backoff=args.backoff)
+                    emit(u, ok, res)
+
+                await asyncio.gather(*(run(u) for u in updates))
+
+            asyncio.run(apply_all())
+        elif args.parallel:
+            logger.info(f"Applying updates in parallel for {len(updates)} updates (workers={args.workers})")
+            for item, ok, res in parallel_imap(apply_update, updates, workers=args.workers, retries=args.retries, backoff=args.backoff):
+                emit(item, ok, res)
+        else:
+            logger.info(f"Applying updates sequentially for {len(updates)} updates")
+            for u in updates:
+                ok, res = retry_call(apply_update, u, retries=args.retries, backoff=args.backoff)
+                emit(u, ok, res)
+
+    logger.info(f"Applied alerts saved to {out_path} ({counts['total']} records, {counts['failed']} failed)")
+    result = {'output': str(out_path), **counts}
+    if summary is not None:
+        array_path = out_path.with_suffix('.json')
+        save_json(summary, str(array_path))
+        logger.info(f"Applied alerts array saved to {array_path}")
+        result['applied'] = summary
+    return result
 
 
 if __name__ == '__main__':
@@ -2,9 +2,9 @@
 """
 Example: Run the PowerTrackClient in 'mock mode' to validate SDK behavior without network.
 
-This script patches `PowerTrackClient.get_json`, `post_json`, and `put_json` to return
-sample data so you can exercise methods like `get_site_config`, `get_hardware_list`,
-`update_site_config`, and `get_chart_data` locally.
+This script uses a small PowerTrackClient subclass whose `get_json`, `post_json`, and
+`put_json` return sample data, so you can exercise methods like `get_site_config`,
+`get_hardware_list`, `update_site_config`, and `get_chart_data` locally.
 
 Usage:
     python examples/example_mock_client.py
@@ -12,7 +12,8 @@ Usage:
 No credentials or network required.
 """
 
-from unittest.mock import patch
+from typing import Any, Dict, List, Optional, Tuple
+
 from powertrack_sdk import PowerTrackClient, AuthManager
 
 
@@ -44,38 +45,73 @@ SAMPLE_PUT_ACK = {"success": True, "updated": True}
 SAMPLE_CHART = {"series": [{"name": "Power", "key": "s1", "dataXy": [{"x": 1609459200, "y": 10.5}] }], "namedResults": {"energy": 50, "expEnergy": 100}}
 
 
+class _StubClient(PowerTrackClient):
+    """PowerTrackClient whose network methods return canned responses.
+
+    Set get_response/post_response/put_response to a value, or to a callable taking
+    the endpoint, before calling a client method. Plain methods instead of
+    unittest.mock patches keep each call a single Python-level function call;
+    calls are recorded as (method, endpoint) in `calls`.
+    """
+
+    get_response: Any = None
+    post_response: Any = None
+    put_response: Any = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls: List[Tuple[str, str]] = []
+
+    def _respond(self, method: str, response: Any, endpoint: str) -> Optional[Dict[str, Any]]:
+        self.calls.append((method, endpoint))
+        return response(endpoint) if callable(response) else response
+
+    def get_json(self, endpoint: str, **kwargs) -> Optional[Dict[str, Any]]:
+        return self._respond("GET", self.get_response, endpoint)
+
+    def get_json_conditional(self, endpoint: str, if_none_match: Optional[str] = None,
+                             **kwargs) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        return self._respond("GET", self.get_response, endpoint), None
+
+    def post_json(self, endpoint: str, payload: Dict[str, Any], **kwargs) -> Optional[Dict[str, Any]]:
+        return self._respond("POST", self.post_response, endpoint)
+
+    def put_json(self, endpoint: str, payload: Dict[str, Any], **kwargs) -> Optional[Dict[str, Any]]:
+        return self._respond("PUT", self.put_response, endpoint)
+
+
 def main():
     # Create client with explicit (fake) auth so AuthManager doesn't try to read files
     auth = AuthManager(cookie='fake-cookie', ae_s='fake-ae-s', ae_v='0000', base_url='https://example.com')
-    client = PowerTrackClient(auth_manager=auth, base_url='https://example.com')
+    client = _StubClient(auth_manager=auth, base_url='https://example.com')
 
-    # Patch client's network methods to return sample data
-    with patch.object(client, 'get_json', return_value=SAMPLE_SITE_CONFIG) as mock_get_json:
-        site_config = client.get_site_config('S99999')
-        print('SiteConfig:', site_config)
-        mock_get_json.assert_called()
+    # Serve sample data from the client's network methods
+    client.get_response = SAMPLE_SITE_CONFIG
+    site_config = client.get_site_config('S99999')
+    print('SiteConfig:', site_config)
+    assert client.calls, "get_json was not called"
 
-    with patch.object(client, 'get_json', return_value=SAMPLE_HARDWARE_LIST):
-        hw_list = client.get_hardware_list('S99999')
-        print('Hardware list parsed:', [hw.key for hw in hw_list])
+    client.get_response = SAMPLE_HARDWARE_LIST
+    hw_list = client.get_hardware_list('S99999')
+    print('Hardware list parsed:', [hw.key for hw in hw_list])
 
     # Demonstrate update_site_config flow: GET original -> PUT merged
-    def fake_get_for_update(endpoint, **kwargs):
+    def fake_get_for_update(endpoint: str) -> Optional[Dict[str, Any]]:
         # Return a minimal original config expected by update_site_config
         if endpoint.startswith('/api/edit/site/'):
             return {"name": "Original", "someField": 1}
         return None
 
-    with patch.object(client, 'get_json', side_effect=fake_get_for_update):
-        with patch.object(client, 'put_json', return_value=SAMPLE_PUT_ACK) as mock_put:
-            result = client.update_site_config('S99999', {'someField': 2})
-            print('UpdateResult.success:', result.success)
-            mock_put.assert_called()
+    client.get_response = fake_get_for_update
+    client.put_response = SAMPLE_PUT_ACK
+    result = client.update_site_config('S99999', {'someField': 2})
+    print('UpdateResult.success:', result.success)
+    assert any(method == "PUT" for method, _ in client.calls), "put_json was not called"
 
     # Demonstrate chart parsing using post_json
-    with patch.object(client, 'post_json', return_value=SAMPLE_CHART):
-        chart = client.get_chart_data(1, 'S99999')
-        print('Chart series count:', len(chart.series) if chart else 'no chart')
+    client.post_response = SAMPLE_CHART
+    chart = client.get_chart_data(1, 'S99999')
+    print('Chart series count:', len(chart.series) if chart else 'no chart')
 
     print('\n[✓] Mock example completed successfully. No network required.')
 
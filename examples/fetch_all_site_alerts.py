@@ -11,43 +11,74 @@ Saves aggregated JSON with summary and per-hardware details.
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import logging
 import sys
+from collections import Counter
 from pathlib import Path
+from itertools import islice
 from typing import Any, Dict, List, Optional
-import re
 
 try:
-    from examples._util import get_client, save_json, ensure_dir, retry_call, parallel_map
+    from examples._util import get_client, save_json, ensure_dir, retry_call, parallel_map, async_map, set_retry_mode, RETRY_MODES, to_safe
 except Exception:
     # Allow running the script directly (not as package)
-    from _util import get_client, save_json, ensure_dir, retry_call, parallel_map
+    from _util import get_client, save_json, ensure_dir, retry_call, parallel_map, async_map, set_retry_mode, RETRY_MODES, to_safe
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
-def main(argv: Optional[List[str]] = None):
+def _is_hardware_key(k: Any) -> bool:
+    """True for hardware keys like 'H12345' (same as re.match(r"^H\\d+$", k), minus the regex engine)."""
+    return type(k) is str and k.startswith("H") and k[1:].isdecimal()
+
+
+def _trigger_detail(res: Any) -> Any:
+    """Plain, independent copy of a trigger response for the details map.
+
+    Works for slotted dataclasses too (no __dict__), and never hands out a live
+    reference to the SDK object's attribute dict.
+    """
+    return to_safe(res)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Fetch alert summaries and triggers using the PowerTrack SDK")
     parser.add_argument("--customer-id", help="Customer ID (preferred)")
     parser.add_argument("--site-id", help="Site ID (alternative)")
     parser.add_argument("--output", help="Output JSON file", default=None)
     parser.add_argument("--mock", action="store_true", help="Use mock client for testing")
     parser.add_argument("--parallel", action="store_true", help="Fetch triggers in parallel")
-    parser.add_argument("--workers", type=int, default=5, help="Worker count when using --parallel")
+    parser.add_argument("--asyncio", action="store_true", help="Fetch triggers concurrently on an asyncio event loop (up to 10x --workers in flight)")
+    parser.add_argument("--workers", type=int, default=5, help="Worker count when using --parallel (--asyncio runs 10x this many)")
     parser.add_argument("--limit", type=int, default=0, help="Limit number of hardware triggers to fetch (0 = no limit)")
     parser.add_argument("--retries", type=int, default=2, help="Retries per hardware fetch on failure")
     parser.add_argument("--backoff", type=float, default=0.5, help="Initial backoff seconds for retries")
-    parser.add_argument("--timeout", type=float, default=None, help="Per-request timeout (unused) - reserved")
+    parser.add_argument("--retry-mode", choices=RETRY_MODES, default="legacy",
+                        help="legacy (default): exponential backoff; standard: decorrelated jitter with a shared retry budget; adaptive: like standard but waits for budget instead of giving up")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-attempt timeout in seconds (default: none)")
     parser.add_argument("--no-filter", action="store_true", help="Do not filter keys to H#### pattern")
+    batching = parser.add_mutually_exclusive_group()
+    batching.add_argument("--batch", action="store_true",
+                          help="Fetch triggers via get_alert_triggers_batch, --workers keys at a time per batch")
+    batching.add_argument("--no-batch", dest="batch", action="store_false", help=argparse.SUPPRESS)  # the default; kept for old command lines
+    parser.add_argument("--batch-size", type=int, default=200, help="Hardware keys per batched trigger fetch with --batch (default: 200)")
+    return parser
+
 
+def main(argv: Optional[List[str]] = None):
+    parser = _build_parser()
     args = parser.parse_args(argv)
+    set_retry_mode(args.retry_mode)
 
     if not args.customer_id and not args.site_id:
         parser.error("Either --customer-id or --site-id must be provided")
+    if args.batch and (args.parallel or args.asyncio):
+        parser.error("--batch cannot be combined with --parallel or --asyncio")
 
-    client = get_client(use_mock=args.mock)
+    client = get_client(use_mock=args.mock, timeout=args.timeout)
 
     try:
         summary = client.get_alert_summary(customer_id=args.customer_id, siteId=args.site_id)
@@ -57,92 +88,117 @@ def main(argv: Optional[List[str]] = None):
 
     # Build details for each hardware with alerts
     details = {}
-    hw_keys = []
-    # Determine hardware keys in a safe, type-aware way
-    hw_keys = []
-    if hasattr(summary, "hardware_summaries"):
-        # Typed response (AlertSummaryResponse) exposes a dict attribute
-        try:
-            hw_map = getattr(summary, "hardware_summaries")
-            if isinstance(hw_map, dict):
-                hw_keys = list(hw_map.keys())
-        except Exception:
-            hw_keys = []
+    # Determine hardware keys in a safe, type-aware way. A typed response
+    # (AlertSummaryResponse) carries its map as hardwareSummaries; it is looked up
+    # once here and reused when the summary is written out below.
+    hw_map = None
+    if not isinstance(summary, dict):
+        hw_map = getattr(summary, "hardwareSummaries", None)
+        if hw_map is None:
+            hw_map = getattr(summary, "hardware_summaries", None)
+    is_typed = isinstance(hw_map, dict)
+    if is_typed:
+        hw_keys = list(hw_map)
     elif isinstance(summary, dict):
         # Plain dict-like response
         hw_keys = list(summary.keys())
+    else:
+        hw_keys = []
 
     # Filter keys to hardware-like keys (e.g., H12345) to avoid non-hardware items
     if not args.no_filter:
-        hw_keys = [k for k in hw_keys if isinstance(k, str) and re.match(r"^H\d+$", k)]
+        hw_keys = [k for k in hw_keys if _is_hardware_key(k)]
 
     # Apply limit if requested
     if args.limit and args.limit > 0:
         hw_keys = hw_keys[: args.limit]
 
-    if args.parallel:
-        logger.info(f"Fetching triggers in parallel for {len(hw_keys)} hardware (workers={args.workers})")
-        results = parallel_map(lambda hw: client.get_alert_triggers(hw), hw_keys, workers=args.workers, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+    # Bound once up front: the result loops below run once per hardware key
+    set_detail = details.__setitem__
+    to_detail = _trigger_detail
+    warn = logger.warning
+    # Alert names (and how many triggers carry each), counted as details arrive
+    name_counts: Counter = Counter()
+
+    def add_detail(hw: str, res: Any) -> None:
+        detail = to_detail(res)
+        set_detail(hw, detail)
+        if isinstance(detail, dict):
+            for trigger in detail.get("triggers") or ():
+                if isinstance(trigger, dict) and "name" in trigger:
+                    name_counts[trigger["name"]] += 1
+
+    if args.batch and hasattr(client, "get_alert_triggers_batch"):
+        logger.info(f"Fetching triggers in batches of {args.batch_size} for {len(hw_keys)} hardware (workers={args.workers})")
+        key_iter = iter(hw_keys)
+        for batch in iter(lambda: list(islice(key_iter, args.batch_size)), []):
+            ok, res = retry_call(client.get_alert_triggers_batch, batch, max_workers=args.workers,
+                                 retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+            if ok:
+                for hw, trig in res.items():
+                    if isinstance(trig, Exception) and args.retries > 0:
+                        # The batch was this key's first attempt; spend the remaining retries on it alone
+                        _, trig = retry_call(client.get_alert_triggers, hw, retries=args.retries - 1,
+                                             backoff=args.backoff, timeout=args.timeout)
+                    if isinstance(trig, Exception):
+                        warn(f"Failed to fetch trigger for {hw}: {trig}")
+                        set_detail(hw, {"error": str(trig)})
+                    else:
+                        add_detail(hw, trig)
+            else:
+                warn(f"Failed to fetch trigger batch of {len(batch)} keys: {res}")
+                for hw in batch:
+                    set_detail(hw, {"error": str(res)})
+    elif args.asyncio or args.parallel:
+        if args.asyncio:
+            logger.info(f"Fetching triggers with asyncio for {len(hw_keys)} hardware (concurrency={args.workers * 10})")
+            results = async_map(client.get_alert_triggers, hw_keys, concurrency=args.workers * 10, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+        else:
+            logger.info(f"Fetching triggers in parallel for {len(hw_keys)} hardware (workers={args.workers})")
+            results = parallel_map(client.get_alert_triggers, hw_keys, workers=args.workers, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
         for item, ok, res in results:
             if ok:
-                details[item] = res.__dict__ if res is not None and hasattr(res, "__dict__") else res
+                add_detail(item, res)
             else:
-                logger.warning(f"Failed to fetch trigger for {item}: {res}")
-                details[item] = {"error": str(res)}
+                warn(f"Failed to fetch trigger for {item}: {res}")
+                set_detail(item, {"error": str(res)})
     else:
         logger.info(f"Fetching triggers sequentially for {len(hw_keys)} hardware")
         for hw in hw_keys:
             ok, res = retry_call(client.get_alert_triggers, hw, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
             if ok:
-                details[hw] = res.__dict__ if res is not None and hasattr(res, "__dict__") else res
+                add_detail(hw, res)
             else:
-                logger.warning(f"Failed to fetch trigger for {hw}: {res}")
-                details[hw] = {"error": str(res)}
+                warn(f"Failed to fetch trigger for {hw}: {res}")
+                set_detail(hw, {"error": str(res)})
 
     # Prepare a JSON-serializable summary
-    summary_out = None
-    aggregated_summary = {"total_alerts": 0, "by_severity": {}, "alert_names": set()}
-    if hasattr(summary, "hardware_summaries"):
-        hw_map = getattr(summary, "hardware_summaries") or {}
+    aggregated_summary = {"total_alerts": 0, "by_severity": {}, "alert_names": [], "alert_name_counts": {}}
+    if is_typed:
         summary_out = {"hardware_summaries": {}}
-        if isinstance(hw_map, dict):
-            for k, v in hw_map.items():
-                if hasattr(v, "__dict__"):
-                    # dataclass-like object
-                    try:
-                        v_dict = v.__dict__
-                        summary_out["hardware_summaries"][k] = v_dict
-                        # Aggregate
-                        count = v_dict.get("count", 0)
-                        severity = v_dict.get("max_severity", 0)
-                        aggregated_summary["total_alerts"] += count
-                        aggregated_summary["by_severity"][severity] = aggregated_summary["by_severity"].get(severity, 0) + count
-                    except Exception:
-                        summary_out["hardware_summaries"][k] = str(v)
-                else:
-                    summary_out["hardware_summaries"][k] = v
-                    # Aggregate if dict
-                    if isinstance(v, dict):
-                        count = v.get("count", 0)
-                        severity = v.get("maxSeverity", v.get("max_severity", 0))
-                        aggregated_summary["total_alerts"] += count
-                        aggregated_summary["by_severity"][severity] = aggregated_summary["by_severity"].get(severity, 0) + count
-
-    # Collect alert names from details
-    for hw_detail in details.values():
-        if isinstance(hw_detail, dict) and "triggers" in hw_detail:
-            for trigger in hw_detail["triggers"]:
-                if isinstance(trigger, dict) and "name" in trigger:
-                    aggregated_summary["alert_names"].add(trigger["name"])
-
-    # Convert set to list for JSON
-    aggregated_summary["alert_names"] = sorted(list(aggregated_summary["alert_names"]))
-
-    if isinstance(summary, dict):
+        for k, v in hw_map.items():
+            if isinstance(v, dict):
+                v_dict = v
+            elif hasattr(v, "__dict__"):
+                # dataclass-like object
+                v_dict = v.__dict__
+            else:
+                summary_out["hardware_summaries"][k] = v
+                continue
+            summary_out["hardware_summaries"][k] = v_dict
+            # Aggregate
+            count = v_dict.get("count", 0)
+            severity = v_dict.get("maxSeverity", v_dict.get("max_severity", 0))
+            aggregated_summary["total_alerts"] += count
+            aggregated_summary["by_severity"][severity] = aggregated_summary["by_severity"].get(severity, 0) + count
+    elif isinstance(summary, dict):
         summary_out = summary
     else:
         summary_out = str(summary)
 
+    aggregated_summary["alert_names"] = sorted(name_counts)
+    aggregated_summary["alert_name_counts"] = dict(name_counts.most_common())
+
     out = {
         "aggregated_summary": aggregated_summary,
         "summary": summary_out,
@@ -151,32 +207,10 @@ def main(argv: Optional[List[str]] = None):
 
     output_path = args.output or f"portfolio/alert_summary_{args.customer_id or args.site_id}.json"
     ensure_dir(Path(output_path).parent.as_posix())
-    # Ensure everything is JSON-serializable by converting common SDK model wrappers
-    import types
-
-    def to_safe(o):
-        if o is None:
-            return None
-        if isinstance(o, (str, int, float, bool)):
-            return o
-        if isinstance(o, dict):
-            return {str(k): to_safe(v) for k, v in o.items()}
-        if isinstance(o, (list, tuple, set)):
-            return [to_safe(v) for v in o]
-        if isinstance(o, types.MappingProxyType):
-            return to_safe(dict(o))
-        # dataclass-like or objects with __dict__
-        if hasattr(o, '__dict__'):
-            try:
-                return to_safe(o.__dict__)
-            except Exception:
-                return str(o)
-        # fallback
-        return str(o)
-
-    out_safe = to_safe(out)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(out_safe, f, indent=2, ensure_ascii=False)
+    # The trigger details are already plain copies (see _trigger_detail); save_json's
+    # default hook converts any SDK objects, sets and mapping proxies left in the
+    # summary as it meets them, without a second copy of the tree.
+    save_json(out, output_path)
 
     logger.info(f"Alert summary and details saved to {output_path}")
 
@@ -11,66 +11,77 @@ Outputs one JSON file per site under the output directory.
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import logging
+import os
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import asdict, is_dataclass
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 try:
-    from examples._util import get_client, save_json, ensure_dir, retry_call, parallel_map
+    from examples._util import get_client, save_json, ensure_dir, retry_call, parallel_imap, async_map, set_retry_mode, RETRY_MODES, load_site_list_cached, JsonlArchive
 except Exception:
-    from _util import get_client, save_json, ensure_dir, retry_call, parallel_map
+    from _util import get_client, save_json, ensure_dir, retry_call, parallel_imap, async_map, set_retry_mode, RETRY_MODES, load_site_list_cached, JsonlArchive
 from powertrack_sdk.models import SiteList, SiteData
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
-def serialize(obj: Any) -> Any:
-    """Turn dataclasses and known SDK models into JSON-serializable structures."""
-    try:
-        if is_dataclass(obj):
-            return asdict(obj)
-        # datetime, etc. handled by default json dumps if str
-        return obj
-    except Exception:
-        return str(obj)
+def fetch_site(client, site_key: str, include_hardware: bool, include_alerts: bool, include_modeling: bool) -> SiteData:
+    """Fetch the SiteData for one site (I/O-bound; run on threads or the event loop)."""
+    site_data: Optional[SiteData] = client.get_site_data(site_key, include_hardware, include_alerts, include_modeling)
+    if site_data is None:
+        raise RuntimeError("No data returned")
+    return site_data
 
 
-def fetch_and_save(client, site_key: str, output_dir: str, include_hardware: bool, include_alerts: bool, include_modeling: bool) -> Dict[str, Any]:
-    """Fetch data for single site and save to file. Returns summary dict."""
-    summary = {"site": site_key, "success": False, "error": None, "path": None}
-    try:
-        site_data: Optional[SiteData] = client.get_site_data(site_key, include_hardware, include_alerts, include_modeling)
-        if site_data is None:
-            raise RuntimeError("No data returned")
-
-        # Serialize site_data
-        data = serialize(site_data)
-        # Ensure fetched_at is JSON serializable
-        if isinstance(data, dict) and data.get("fetched_at") is not None:
-            try:
-                data["fetched_at"] = data["fetched_at"].isoformat()
-            except Exception:
-                data["fetched_at"] = str(data["fetched_at"])
+def save_site(site_data: SiteData, out_path: str) -> str:
+    """Encode and write one site's data (CPU-bound; safe to run in a worker process)."""
+    # save_json encodes the SiteData dataclass tree directly (natively with orjson),
+    # including fetchedAt as an ISO-8601 string, and streams it to disk one
+    # top-level section (site, config, hardware, alerts, modeling...) at a time.
+    # main() creates the output directory once up front, so no per-file mkdir.
+    save_json(site_data, out_path, makedirs=False)
+    return out_path
 
-        out_path = Path(output_dir) / f"{site_key}.json"
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        with out_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
 
-        summary.update({"success": True, "path": str(out_path)})
+def save_and_summarize(site_key: str, site_data: SiteData, output_dir: str, archive: Optional[JsonlArchive] = None) -> Dict[str, Any]:
+    """Save already-fetched site data to file (or `archive`). Returns summary dict; a failed save is recorded in it."""
+    summary = {"site": site_key, "success": False, "error": None, "path": None}
+    try:
+        if archive is not None:
+            archive.write(site_key, site_data)
+            out_path = archive.path
+        else:
+            out_path = save_site(site_data, str(Path(output_dir) / f"{site_key}.json"))
+        summary.update({"success": True, "path": out_path})
         logger.info(f"Saved site data for {site_key} -> {out_path}")
     except Exception as e:
-        logger.exception(f"Failed to fetch/save data for {site_key}: {e}")
+        logger.exception(f"Failed to save data for {site_key}: {e}")
         summary["error"] = str(e)
     return summary
 
 
-def main(argv: Optional[List[str]] = None):
+def fetch_and_save(client, site_key: str, output_dir: str, include_hardware: bool, include_alerts: bool, include_modeling: bool,
+                   saver: Optional[Executor] = None, archive: Optional[JsonlArchive] = None) -> Dict[str, Any]:
+    """Fetch data for single site and save to file. Returns summary dict.
+
+    Fetch errors propagate so retry_call can retry them; a failed save is recorded
+    in the summary instead (re-fetching wouldn't help). If `saver` is given (e.g. a
+    ProcessPoolExecutor), the save runs there so the encoding work doesn't hold the
+    GIL the fetching threads need. If `archive` is given, the site is appended to it
+    instead of written to its own file.
+    """
+    site_data = fetch_site(client, site_key, include_hardware, include_alerts, include_modeling)
+    if saver is not None and archive is None:
+        return saver.submit(save_and_summarize, site_key, site_data, output_dir).result()
+    return save_and_summarize(site_key, site_data, output_dir, archive)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Fetch comprehensive site data for a SiteList using the PowerTrack SDK")
     parser.add_argument("--site-list", default="portfolio/SiteList.json", help="Path to SiteList.json")
     parser.add_argument("--output-dir", default="portfolio/site_data/", help="Directory to write per-site JSON files")
@@ -81,20 +92,35 @@ def main(argv: Optional[List[str]] = None):
     parser.add_argument("--include-modeling", action="store_true", default=True, help="Include modeling data")
     parser.add_argument("--no-modeling", dest="include_modeling", action="store_false", help="Do not fetch modeling data")
     parser.add_argument("--parallel", action="store_true", help="Fetch sites in parallel using threads")
-    parser.add_argument("--workers", type=int, default=5, help="Worker count when using --parallel")
+    parser.add_argument("--asyncio", action="store_true", help="Fetch sites concurrently on an asyncio event loop (up to 10x --workers in flight)")
+    parser.add_argument("--workers", type=int, default=5, help="Worker count when using --parallel (--asyncio runs 10x this many)")
     parser.add_argument("--limit", type=int, default=0, help="Limit number of sites to process (0 = no limit)")
     parser.add_argument("--retries", type=int, default=2, help="Retries per site fetch on failure")
     parser.add_argument("--backoff", type=float, default=0.5, help="Initial backoff seconds for retries")
-    parser.add_argument("--timeout", type=float, default=None, help="Per-request timeout (unused) - reserved")
+    parser.add_argument("--retry-mode", choices=RETRY_MODES, default="legacy",
+                        help="legacy (default): exponential backoff; standard: decorrelated jitter with a shared retry budget; adaptive: like standard but waits for budget instead of giving up")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-attempt timeout in seconds (default: none)")
     parser.add_argument("--mock", action="store_true", help="Use a local mock client instead of real API")
+    parser.add_argument("--process-save", action="store_true",
+                        help="With --parallel/--asyncio, encode and write site files in a process pool (one per CPU) instead of the fetching threads")
+    parser.add_argument("--archive", default=None,
+                        help="Append every site to one JSON Lines archive (e.g. portfolio/site_data.jsonl.gz; .zst needs zstandard) instead of one file per site")
+    return parser
 
-    args = parser.parse_args(argv)
 
-    client = get_client(use_mock=args.mock)
+def main(argv: Optional[List[str]] = None):
+    args = _build_parser().parse_args(argv)
+    set_retry_mode(args.retry_mode)
+
+    client = get_client(use_mock=args.mock, timeout=args.timeout)
 
     # Load site list
     try:
-        sites = client.get_sites(args.site_list)
+        # A local SiteList file is loaded via its pickle sidecar cache when it's fresh
+        if os.path.isfile(args.site_list):
+            sites = load_site_list_cached(args.site_list)
+        else:
+            sites = client.get_sites(args.site_list)
     except Exception as e:
         logger.error(f"Failed to load site list: {e}")
         sys.exit(2)
@@ -116,31 +142,65 @@ def main(argv: Optional[List[str]] = None):
 
     summaries: List[Dict[str, Any]] = []
 
-    if args.parallel:
-        logger.info(f"Fetching in parallel with {args.workers} workers")
-        # Use parallel_map with retry_call inside fetch_and_save
-        results = parallel_map(lambda key: fetch_and_save(client, key, args.output_dir, args.include_hardware, args.include_alerts, args.include_modeling),
-                               site_keys, workers=args.workers, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
-        for item, ok, res in results:
-            if ok:
-                summaries.append(res)
-            else:
-                logger.error(f"Failed to process {item}: {res}")
-                summaries.append({"site": item, "success": False, "error": str(res), "path": None})
-    else:
-        for key in site_keys:
-            ok, res = retry_call(fetch_and_save, client, key, args.output_dir, args.include_hardware, args.include_alerts, args.include_modeling,
-                                 retries=args.retries, backoff=args.backoff, timeout=args.timeout)
-            if ok:
-                summaries.append(res)
-            else:
-                logger.error(f"Failed to process {key}: {res}")
-                summaries.append({"site": key, "success": False, "error": str(res), "path": None})
+    # With --archive every site goes into one JSON Lines file instead of its own file
+    archive = JsonlArchive(args.archive) if args.archive else None
+    try:
+        if args.asyncio or args.parallel:
+            saver: Optional[ProcessPoolExecutor] = None
+            if args.process_save and args.workers > 1 and archive is None:
+                saver = ProcessPoolExecutor(max_workers=os.cpu_count())
+                # Start the worker processes now, from the main thread, rather than from
+                # inside a fetching thread on the first submit.
+                saver.submit(int).result()
+
+            def fetch(key):
+                return fetch_site(client, key, args.include_hardware, args.include_alerts, args.include_modeling)
+
+            try:
+                # Workers only fetch (with retries); each site is saved here once its fetch
+                # has succeeded, so a failed fetch reaches the retry wrapper instead of being
+                # turned into a summary.
+                if args.asyncio:
+                    logger.info(f"Fetching with asyncio, up to {args.workers * 10} sites in flight")
+                    results = async_map(fetch, site_keys, concurrency=args.workers * 10, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+                else:
+                    # parallel_imap yields as each fetch completes, so writes overlap the
+                    # fetches still in flight and at most ~2x workers SiteData trees are
+                    # resident at once.
+                    logger.info(f"Fetching in parallel with {args.workers} workers")
+                    results = parallel_imap(fetch, site_keys, workers=args.workers, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+                pending = []
+                for item, ok, res in results:
+                    if not ok:
+                        logger.error(f"Failed to process {item}: {res}")
+                        summaries.append({"site": item, "success": False, "error": str(res), "path": None})
+                    elif saver is not None:
+                        pending.append(saver.submit(save_and_summarize, item, res, args.output_dir))
+                    else:
+                        summaries.append(save_and_summarize(item, res, args.output_dir, archive))
+                summaries.extend(f.result() for f in pending)
+                # Keep summary.json in site list order, as with the sequential mode
+                order = {key: i for i, key in enumerate(site_keys)}
+                summaries.sort(key=lambda summary: order[summary["site"]])
+            finally:
+                if saver is not None:
+                    saver.shutdown()
+        else:
+            for key in site_keys:
+                ok, res = retry_call(fetch_and_save, client, key, args.output_dir, args.include_hardware, args.include_alerts, args.include_modeling,
+                                     archive=archive, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+                if ok:
+                    summaries.append(res)
+                else:
+                    logger.error(f"Failed to process {key}: {res}")
+                    summaries.append({"site": key, "success": False, "error": str(res), "path": None})
+    finally:
+        if archive is not None:
+            archive.close()
 
     # Save summary
     summary_path = Path(args.output_dir) / "summary.json"
-    with summary_path.open("w", encoding="utf-8") as f:
-        json.dump(summaries, f, indent=2, ensure_ascii=False)
+    save_json(summaries, str(summary_path))
 
     logger.info(f"Completed fetching site data. Summary -> {summary_path}")
 
@@ -9,45 +9,60 @@ Fetch site configuration(s) and save per-site JSON files.
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import logging
+import os
 import sys
 from pathlib import Path
 from typing import List, Optional
 
 try:
-    from examples._util import get_client, ensure_dir, retry_call, parallel_map
+    from examples._util import get_client, save_json, ensure_dir, retry_call, parallel_map, async_map, set_retry_mode, RETRY_MODES, load_site_list_cached, JsonlArchive
 except Exception:
-    from _util import get_client, ensure_dir, retry_call, parallel_map
+    from _util import get_client, save_json, ensure_dir, retry_call, parallel_map, async_map, set_retry_mode, RETRY_MODES, load_site_list_cached, JsonlArchive
 from powertrack_sdk.models import SiteList
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
-def main(argv: Optional[List[str]] = None):
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Fetch site configuration(s) using the PowerTrack SDK")
     parser.add_argument("--site-id", help="Single site ID to fetch (e.g., S12345)")
     parser.add_argument("--site-list", default="portfolio/SiteList.json", help="Path to SiteList.json to iterate")
     parser.add_argument("--output-dir", default="portfolio/configs/", help="Directory to write config JSON files")
     parser.add_argument("--mock", action="store_true", help="Use mock client for testing")
     parser.add_argument("--parallel", action="store_true", help="Fetch configs in parallel")
-    parser.add_argument("--workers", type=int, default=5, help="Worker count when using --parallel")
+    parser.add_argument("--asyncio", action="store_true", help="Fetch configs concurrently on an asyncio event loop (up to 10x --workers in flight)")
+    parser.add_argument("--workers", type=int, default=5, help="Worker count when using --parallel (--asyncio runs 10x this many)")
     parser.add_argument("--limit", type=int, default=0, help="Limit number of sites to process (0 = no limit)")
     parser.add_argument("--retries", type=int, default=2, help="Retries per site fetch on failure")
     parser.add_argument("--backoff", type=float, default=0.5, help="Initial backoff seconds for retries")
-    parser.add_argument("--timeout", type=float, default=None, help="Per-request timeout (unused) - reserved")
+    parser.add_argument("--retry-mode", choices=RETRY_MODES, default="legacy",
+                        help="legacy (default): exponential backoff; standard: decorrelated jitter with a shared retry budget; adaptive: like standard but waits for budget instead of giving up")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-attempt timeout in seconds (default: none)")
+    parser.add_argument("--archive", default=None,
+                        help="Append every config to one JSON Lines archive (e.g. portfolio/configs.jsonl.gz; .zst needs zstandard) instead of one file per site")
+    return parser
+
 
-    args = parser.parse_args(argv)
+def main(argv: Optional[List[str]] = None):
+    args = _build_parser().parse_args(argv)
+    set_retry_mode(args.retry_mode)
 
-    client = get_client(use_mock=args.mock)
+    client = get_client(use_mock=args.mock, timeout=args.timeout)
 
     site_ids: List[str] = []
     if args.site_id:
         site_ids = [args.site_id]
     else:
         try:
-            sites = client.get_sites(args.site_list)
+            # A local SiteList file is loaded via its pickle sidecar cache when it's fresh
+            if os.path.isfile(args.site_list):
+                sites = load_site_list_cached(args.site_list)
+            else:
+                sites = client.get_sites(args.site_list)
             if isinstance(sites, SiteList):
                 site_ids = [s.key for s in sites]
             else:
@@ -61,38 +76,45 @@ def main(argv: Optional[List[str]] = None):
     if args.limit and args.limit > 0:
         site_ids = site_ids[:args.limit]
 
-    ensure_dir(args.output_dir)
+    # With --archive every config goes into one JSON Lines file instead of its own file
+    archive = JsonlArchive(args.archive) if args.archive else None
+    if archive is None:
+        ensure_dir(args.output_dir)
 
     def fetch_config(sid):
-        try:
-            cfg = client.get_site_config(sid)
+        # Errors propagate so retry_call/parallel_map can retry them per --retries
+        cfg = client.get_site_config(sid)
+        if archive is not None:
+            archive.write(sid, cfg)
+            out_path = archive.path
+        else:
             out_path = Path(args.output_dir) / f"{sid}.json"
-            with out_path.open("w", encoding="utf-8") as f:
-                # cfg may be dataclass-like
-                try:
-                    obj = cfg.__dict__
-                except Exception:
-                    obj = cfg
-                json.dump(obj, f, indent=2, ensure_ascii=False)
-            logger.info(f"Saved config for {sid} -> {out_path}")
-            return True
-        except Exception as e:
-            logger.exception(f"Failed to fetch config for {sid}: {e}")
-            return False
-
-    if args.parallel:
-        logger.info(f"Fetching configs in parallel for {len(site_ids)} sites (workers={args.workers})")
-        results = parallel_map(fetch_config, site_ids, workers=args.workers, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
-        # parallel_map returns (item, success, result), but since fetch_config returns bool, we can just log failures
-        for item, ok, res in results:
-            if not ok:
-                logger.error(f"Overall failure for {item}")
-    else:
-        logger.info(f"Fetching configs sequentially for {len(site_ids)} sites")
-        for sid in site_ids:
-            ok, res = retry_call(fetch_config, sid, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
-            if not ok:
-                logger.error(f"Failed to process {sid}")
+            # save_json encodes the SiteConfig dataclass directly and writes the
+            # UTF-8 bytes in binary mode; the output dir was created up front.
+            save_json(cfg, str(out_path), makedirs=False)
+        logger.info(f"Saved config for {sid} -> {out_path}")
+        return str(out_path)
+
+    try:
+        if args.asyncio or args.parallel:
+            if args.asyncio:
+                logger.info(f"Fetching configs with asyncio for {len(site_ids)} sites (concurrency={args.workers * 10})")
+                results = async_map(fetch_config, site_ids, concurrency=args.workers * 10, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+            else:
+                logger.info(f"Fetching configs in parallel for {len(site_ids)} sites (workers={args.workers})")
+                results = parallel_map(fetch_config, site_ids, workers=args.workers, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+            for item, ok, res in results:
+                if not ok:
+                    logger.error(f"Failed to fetch config for {item}: {res}")
+        else:
+            logger.info(f"Fetching configs sequentially for {len(site_ids)} sites")
+            for sid in site_ids:
+                ok, res = retry_call(fetch_config, sid, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+                if not ok:
+                    logger.error(f"Failed to fetch config for {sid}: {res}")
+    finally:
+        if archive is not None:
+            archive.close()
 
 
 if __name__ == "__main__":
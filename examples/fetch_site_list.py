@@ -19,11 +19,11 @@ Output:
 
 import os
 import argparse
-import json
+import functools
 import sys
 import logging
-from pathlib import Path
 from datetime import datetime, timezone
+from typing import List, Optional
 
 # Try to load environment variables from .env file (optional)
 try:
@@ -34,6 +34,11 @@ except ImportError:
 
 from powertrack_sdk import PowerTrackClient, Site, SiteList
 
+try:
+    from examples._util import save_json
+except Exception:
+    from _util import save_json
+
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -82,25 +87,9 @@ def fetch_site_list_sdk(customer_id: str) -> SiteList:
 def save_site_list(site_list: SiteList, output_file: str):
     """Save SiteList to JSON file."""
     try:
-        # Create output directory
-        output_path = Path(output_file)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Convert to dict format for JSON
-        data = {
-            "metadata": site_list.metadata,
-            "sites": [
-                {
-                    "key": site.key,
-                    "name": site.name,
-                    "metadata": site.metadata
-                }
-                for site in site_list
-            ]
-        }
-
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Site is a dataclass (key, name, metadata), so save_json encodes the sites
+        # as-is; it also creates the output directory.
+        save_json({"metadata": site_list.metadata, "sites": site_list.sites}, output_file)
 
         print(f"[✓] Site list saved to: {output_file}")
         print(f"[i] Contains {len(site_list)} sites")
@@ -110,7 +99,8 @@ def save_site_list(site_list: SiteList, output_file: str):
         raise
 
 
-def main():
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Fetch all sites in a PowerTrack portfolio using the SDK",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -144,8 +134,11 @@ See README.md for authentication instructions.
         default="portfolio/SiteList.json",
         help="Output file path (default: portfolio/SiteList.json)"
     )
+    return parser
+
 
-    args = parser.parse_args()
+def main(argv: Optional[List[str]] = None):
+    args = _build_parser().parse_args(argv)
 
     print(f"[i] Customer ID: {args.customer_id}")
     print(f"[i] Output file: {args.output}")
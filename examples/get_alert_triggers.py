@@ -6,21 +6,21 @@ Usage: python3 examples/get_alert_triggers.py --hardware-id H12345 [--mock]
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import sys
-from datetime import datetime, timezone
 from typing import Any, Optional
 """
 The below allows for importing a mock client for testing purposes from the examples directory.
 In production, you would import your client from the actual SDK package.
 """
 try:
-    from examples._util import get_client
+    from examples._util import add_output_format_arguments, add_profile_argument, build_envelope, get_client, profiled, write_output
 except Exception:
-    from _util import get_client
+    from _util import add_output_format_arguments, add_profile_argument, build_envelope, get_client, profiled, write_output
 
 
-def main(argv: Optional[list[str]] = None) -> None:
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Example: Get alert triggers for hardware",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -33,9 +33,14 @@ Examples:
     parser.add_argument("--hardware-id", required=True, help="Hardware ID (e.g., H12345)")
     parser.add_argument("--mock", action="store_true", help="Use mock client for testing")
     parser.add_argument("--output", help="Output file (default: stdout)")
+    add_output_format_arguments(parser)
+    add_profile_argument(parser)
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
+    return parser
+
 
-    args = parser.parse_args(argv)
+def main(argv: Optional[list[str]] = None) -> None:
+    args = _build_parser().parse_args(argv)
 
     client = get_client(use_mock=args.mock)
 
@@ -43,47 +48,17 @@ Examples:
         print(f"Calling get_alert_triggers(hardware_key='{args.hardware_id}')", file=sys.stderr)
 
     try:
-        result = client.get_alert_triggers(args.hardware_id)
+        with profiled(args.profile):
+            result = client.get_alert_triggers(args.hardware_id)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Convert result to serializable dict
-    def to_safe(o):
-        if o is None:
-            return None
-        if isinstance(o, (str, int, float, bool)):
-            return o
-        if isinstance(o, dict):
-            return {str(k): to_safe(v) for k, v in o.items()}
-        if isinstance(o, (list, tuple, set)):
-            return [to_safe(v) for v in o]
-        import types
-        if isinstance(o, types.MappingProxyType):
-            return to_safe(dict(o))
-        if hasattr(o, '__dict__'):
-            try:
-                return to_safe(o.__dict__)
-            except Exception:
-                return str(o)
-        return str(o)
-
-    output = {
-        "method": "get_alert_triggers",
-        "args": {"hardware_id": args.hardware_id},
-        "result": to_safe(result),
-        "timestamp": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-    }
-
-    json_output = json.dumps(output, indent=2, ensure_ascii=False, default=str)
+    output = build_envelope("get_alert_triggers", args, result)
 
-    if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(json_output)
-        if args.verbose:
-            print(f"Output written to {args.output}", file=sys.stderr)
-    else:
-        print(json_output)
+    write_output(output, args.output, args.compact)
+    if args.output and args.verbose:
+        print(f"Output written to {args.output}", file=sys.stderr)
 
 
 if __name__ == "__main__":
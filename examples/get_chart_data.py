@@ -6,30 +6,30 @@ Usage: python3 examples/get_chart_data.py --chart-type 255 --site-id S70726 [--s
 from __future__ import annotations
 
 import argparse
-import json
+import dataclasses
+import functools
 import sys
-from datetime import datetime, timezone
 from typing import Any, Optional
 import os
 
-try:
-    import matplotlib.pyplot as plt
-    import matplotlib.dates as mdates
-    import pandas as pd
-    HAS_PLOTTING = True
-except ImportError:
-    HAS_PLOTTING = False
+# matplotlib/pandas take hundreds of milliseconds to import, so they are only
+# loaded by _load_plotting() when a chart is actually rendered.
+HAS_PLOTTING: Optional[bool] = None
+plt = np = pd = None
+
+
 """
 The below allows for importing a mock client for testing purposes from the examples directory.
 In production, you would import your client from the actual SDK package.
 """
 try:
-    from examples._util import get_client
+    from examples._util import add_output_format_arguments, add_profile_argument, build_envelope, get_client, profiled, write_output
 except Exception:
-    from _util import get_client
+    from _util import add_output_format_arguments, add_profile_argument, build_envelope, get_client, profiled, write_output
 
 
-def main(argv: Optional[list[str]] = None) -> None:
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Example: Get chart data for visualization",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -38,6 +38,7 @@ Examples:
   python3 examples/get_chart_data.py --site-id S60134
   python3 examples/get_chart_data.py --chart-type 255 --site-id S60134 --start-date 2024-01-01T00:00:00Z --end-date 2024-01-31T23:59:59Z --output chart.json
   python3 examples/get_chart_data.py --site-id S60134 --bin-size 60 --render --render-file my_chart.png
+  python3 examples/get_chart_data.py --site-id S60134 --downsample 1000 --output chart.json
         """
     )
     parser.add_argument("--chart-type", type=int, default=255, help="Chart type ID (default: 255)")
@@ -47,11 +48,18 @@ Examples:
     parser.add_argument("--bin-size", type=int, help="Bin size in minutes (optional, let API choose if not specified)")
     parser.add_argument("--mock", action="store_true", help="Use mock client for testing")
     parser.add_argument("--output", help="Output file (default: stdout)")
+    add_output_format_arguments(parser)
+    add_profile_argument(parser)
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
     parser.add_argument("--render", action="store_true", help="Render chart to image file")
     parser.add_argument("--render-file", default="chart.png", help="Output file for rendered chart (default: chart.png)")
+    parser.add_argument("--downsample", type=int, metavar="N",
+                        help="Reduce each series to at most N points (LTTB) in the JSON output")
+    return parser
+
 
-    args = parser.parse_args(argv)
+def main(argv: Optional[list[str]] = None) -> None:
+    args = _build_parser().parse_args(argv)
 
     client = get_client(use_mock=args.mock)
 
@@ -59,7 +67,8 @@ Examples:
         print(f"Calling get_chart_data(chart_type={args.chart_type}, site_id='{args.site_id}', start_date={args.start_date}, end_date={args.end_date}, bin_size={args.bin_size})", file=sys.stderr)
 
     try:
-        result = client.get_chart_data(args.chart_type, args.site_id, args.start_date, args.end_date, args.bin_size)
+        with profiled(args.profile):
+            result = client.get_chart_data(args.chart_type, args.site_id, args.start_date, args.end_date, args.bin_size)
         if result is None:
             print(f"No chart data available for chart_type={args.chart_type}, site_id={args.site_id}", file=sys.stderr)
             sys.exit(1)
@@ -67,42 +76,14 @@ Examples:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Convert result to serializable dict
-    def to_safe(o):
-        if o is None:
-            return None
-        if isinstance(o, (str, int, float, bool)):
-            return o
-        if isinstance(o, dict):
-            return {str(k): to_safe(v) for k, v in o.items()}
-        if isinstance(o, (list, tuple, set)):
-            return [to_safe(v) for v in o]
-        import types
-        if isinstance(o, types.MappingProxyType):
-            return to_safe(dict(o))
-        if hasattr(o, '__dict__'):
-            try:
-                return to_safe(o.__dict__)
-            except Exception:
-                return str(o)
-        return str(o)
-
-    output = {
-        "method": "get_chart_data",
-        "args": {
-            "chart_type": args.chart_type,
-            "site_id": args.site_id,
-            "start_date": args.start_date,
-            "end_date": args.end_date,
-            "bin_size": args.bin_size
-        },
-        "result": to_safe(result),
-        "timestamp": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-    }
+    if args.downsample:
+        result = dataclasses.replace(result, series=[downsample_series(s, args.downsample) for s in result.series])
+
+    output = build_envelope("get_chart_data", args, result)
 
     # Render chart if requested
     if args.render:
-        if not HAS_PLOTTING:
+        if not _load_plotting():
             print("Warning: matplotlib and pandas required for chart rendering. Install with: pip install matplotlib pandas", file=sys.stderr)
         elif result and result.series:
             try:
@@ -114,20 +95,98 @@ Examples:
         else:
             print("Warning: No chart data available to render", file=sys.stderr)
 
-    json_output = json.dumps(output, indent=2, ensure_ascii=False, default=str)
+    write_output(output, args.output, args.compact)
+    if args.output and args.verbose:
+        print(f"Output written to {args.output}", file=sys.stderr)
+
 
-    if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(json_output)
-        if args.verbose:
-            print(f"Output written to {args.output}", file=sys.stderr)
-    else:
-        print(json_output)
+# Rendered charts are ~1800px wide at 150 dpi; more points than this are invisible.
+RENDER_MAX_POINTS = 2000
+# Above this many points the markers merge into a solid band; only the line is drawn.
+SCATTER_MAX_POINTS = 1000
+
+
+@functools.lru_cache(maxsize=None)
+def _fast_lttb():
+    """tsdownsample's SIMD LTTB as fn(points, n_out) -> indices, or None if it isn't installed."""
+    try:
+        import numpy
+        from tsdownsample import LTTBDownsampler
+    except ImportError:
+        return None
+    downsampler = LTTBDownsampler()
+
+    def run(points, n_out):
+        n = len(points)
+        x = numpy.fromiter((p[0] for p in points), dtype=numpy.float64, count=n)
+        y = numpy.fromiter((p[1] for p in points), dtype=numpy.float64, count=n)
+        return downsampler.downsample(x, y, n_out=n_out).tolist()
+
+    return run
+
+
+def lttb_indices(points, n_out: int) -> list[int]:
+    """Indices of the points kept by Largest-Triangle-Three-Buckets down-sampling.
+
+    The first and last points are always kept; in between, each of n_out - 2 equal
+    buckets contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket, which preserves peaks and dips.
+    """
+    n = len(points)
+    if n_out >= n or n_out < 3:
+        return list(range(n))
+    fast = _fast_lttb()
+    if fast is not None:
+        return fast(points, n_out)
+
+    every = (n - 2) / (n_out - 2)
+    kept = [0]
+    ax, ay = points[0][0], points[0][1]
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        count = next_end - end
+        avg_x = sum(points[j][0] for j in range(end, next_end)) / count
+        avg_y = sum(points[j][1] for j in range(end, next_end)) / count
+
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            px, py = points[j][0], points[j][1]
+            area = abs((ax - avg_x) * (py - ay) - (ax - px) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        ax, ay = points[best][0], points[best][1]
+    kept.append(n - 1)
+    return kept
+
+
+def downsample_series(series, n_out: int):
+    """Return a copy of series with dataXy reduced to at most n_out points."""
+    points = series.dataXy
+    if len(points) <= n_out:
+        return series
+    return dataclasses.replace(series, dataXy=[tuple(points[i]) for i in lttb_indices(points, n_out)])
+
+
+def _load_plotting() -> bool:
+    """Import the plotting libraries on first use; return whether they are available."""
+    global HAS_PLOTTING, plt, np, pd
+    if HAS_PLOTTING is None:
+        try:
+            import matplotlib.pyplot as plt
+            import numpy as np
+            import pandas as pd
+            HAS_PLOTTING = True
+        except ImportError:
+            HAS_PLOTTING = False
+    return HAS_PLOTTING
 
 
 def render_chart(chart_data, output_file):
     """Render chart data to an image file using matplotlib."""
-    if not HAS_PLOTTING:
+    if not _load_plotting():
         raise ImportError("matplotlib and pandas required for chart rendering")
 
     fig, axes = plt.subplots(len(chart_data.series), 1, figsize=(12, 6 * len(chart_data.series)), squeeze=False)
@@ -137,17 +196,21 @@ def render_chart(chart_data, output_file):
         ax = axes[i, 0]
 
         if series.dataXy:
-            # Convert timestamps to datetime
-            timestamps = [datetime.fromtimestamp(point[0] / 1000) for point in series.dataXy]
-            values = [point[1] for point in series.dataXy]
+            series = downsample_series(series, RENDER_MAX_POINTS)
+            # Convert epoch-millisecond timestamps to datetimes in one vectorized pass
+            arr = np.asarray(series.dataXy, dtype=np.float64).reshape(-1, 2)
+            timestamps = pd.to_datetime(arr[:, 0], unit='ms')
+            values = arr[:, 1]
 
+            # Rasterize the line so dense series don't become one vector path per point
             ax.plot(timestamps, values, color=series.color or '#000000',
-                   linewidth=series.line_width or 1, label=series.name)
-            ax.scatter(timestamps, values, color=series.color or '#000000', s=10)
+                   linewidth=series.lineWidth or 1, label=series.name, rasterized=True)
+            if len(values) <= SCATTER_MAX_POINTS:
+                ax.scatter(timestamps, values, color=series.color or '#000000', s=10, rasterized=True)
 
-        ax.set_title(f"{series.name} ({series.custom_unit or 'units'})")
+        ax.set_title(f"{series.name} ({series.customUnit or 'units'})")
         ax.set_xlabel("Time")
-        ax.set_ylabel(series.custom_unit or "Value")
+        ax.set_ylabel(series.customUnit or "Value")
         ax.grid(True, alpha=0.3)
         ax.legend()
 
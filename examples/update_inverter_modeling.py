@@ -39,20 +39,23 @@ Look for hardware with functionCode: 1 (Inverter PV).
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
 import json
 import logging
 import os
 import sys
 import tempfile
 import subprocess
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from powertrack_sdk.utils import diff_json, patch_to_updates
 
 try:
-    from examples._util import get_client, ensure_dir, save_json, retry_call
+    from examples._util import file_timestamp, RESPONSE_CACHE_TTL, cached_get, invalidate_cached, get_client, ensure_dir, load_json, save_json, save_json_async, to_json, retry_call, retry_call_async
 except Exception:
-    from _util import get_client, ensure_dir, save_json, retry_call
+    from _util import file_timestamp, RESPONSE_CACHE_TTL, cached_get, invalidate_cached, get_client, ensure_dir, load_json, save_json, save_json_async, to_json, retry_call, retry_call_async
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -60,32 +63,46 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 def load_update_file(path: str) -> Dict[str, Any]:
     """Load update payload from JSON file."""
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_json(path)
+
+
+def compute_config_diff(original: Dict[str, Any], updates: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Compute the JSON Patch operations (down to nested leaves) that turn original into updates."""
+    return diff_json(original, updates)
+
+
+def print_config_diff(patch: List[Dict[str, Any]]) -> None:
+    """Print JSON Patch operations one per line, e.g. "replace /modeling/azimuth: 190"."""
+    for op in patch:
+        if op["op"] == "remove":
+            print(f"  remove {op['path']}")
+        else:
+            print(f"  {op['op']} {op['path']}: {json.dumps(op['value'], ensure_ascii=False)}")
 
 
-def compute_config_diff(original: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, List[str]]:
-    """Compute diff between original and updated configuration."""
-    added = []
-    changed = []
-    removed = []
+# Fields opened by --edit unless --edit-all is given.
+EDITABLE_FIELDS = ("azimuth", "tilt", "derate", "pvSystModuleId", "pvSystOutOfSync", "mppWatts")
 
-    # Check for added/changed keys
-    for key, value in updates.items():
-        if key not in original:
-            added.append(key)
-        elif original[key] != value:
-            changed.append(key)
 
-    return {"added": added, "changed": changed, "removed": removed}
+def edit_config_interactively(config: Dict[str, Any],
+                              editable_fields: Optional[Sequence[str]] = EDITABLE_FIELDS) -> Optional[List[Dict[str, Any]]]:
+    """Allow user to edit config using their preferred editor.
 
+    Only the editable_fields present in config are written to the temp file (all
+    of config when editable_fields is None, or when none of them are present).
+    Returns the JSON Patch operations the edit made, or None if editing failed.
+    """
+    overlay = config
+    if editable_fields is not None:
+        overlay = {k: config[k] for k in editable_fields if k in config}
+        if not overlay:
+            logger.info("None of the editable fields are present; opening the complete configuration.")
+            overlay = config
 
-def edit_config_interactively(config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """Allow user to edit config using their preferred editor."""
-    # Create temporary file with current config
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+    # Create temporary file with the fields to edit
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
         temp_path = f.name
+    save_json(overlay, temp_path, makedirs=False)
 
     try:
         # Try to get editor from environment or use sensible defaults
@@ -97,7 +114,8 @@ def edit_config_interactively(config: Dict[str, Any]) -> Optional[Dict[str, Any]
 
         print(f"Opening {temp_path} in {editor}...")
         print("Modify the modeling parameters you want to change, then save and exit.")
-        print("Common fields to modify: azimuth, tilt, derate, pvSystModuleId, etc.")
+        if overlay is config:
+            print("Common fields to modify: azimuth, tilt, derate, pvSystModuleId, etc.")
 
         result = subprocess.run([editor, temp_path])
         if result.returncode != 0:
@@ -105,23 +123,17 @@ def edit_config_interactively(config: Dict[str, Any]) -> Optional[Dict[str, Any]
             return None
 
         # Read back the edited config
-        with open(temp_path, 'r', encoding='utf-8') as f:
-            edited_config = json.load(f)
+        edited = load_json(temp_path)
 
-        # Show diff
-        diff = compute_config_diff(config, edited_config)
-        if any(diff.values()):
+        # Show diff; overlay keys are top-level keys of config, so the paths apply to it as-is
+        diff = compute_config_diff(overlay, edited)
+        if diff:
             print("Changes detected:")
-            if diff['added']:
-                print(f"  Added: {', '.join(diff['added'])}")
-            if diff['changed']:
-                print(f"  Changed: {', '.join(diff['changed'])}")
-            if diff['removed']:
-                print(f"  Removed: {', '.join(diff['removed'])}")
+            print_config_diff(diff)
         else:
             print("No changes detected.")
 
-        return edited_config
+        return diff
 
     except Exception as e:
         logger.error(f"Failed to edit config: {e}")
@@ -134,19 +146,50 @@ def edit_config_interactively(config: Dict[str, Any]) -> Optional[Dict[str, Any]
             pass
 
 
-def validate_hardware(client, hardware_id: str, site_id: Optional[str] = None) -> bool:
-    """Validate that the hardware exists and optionally check site association."""
+async def _fetch_hardware(client, hardware_id: str, site_id: Optional[str],
+                          get_details: Optional[Callable] = None,
+                          get_hardware_list: Optional[Callable] = None, **retry_opts):
+    """Fetch the hardware details and (if site_id) the site's hardware list concurrently.
+
+    The two GETs are independent, so they overlap on the event loop's executor
+    instead of paying two round trips back to back. Raises the last error of a
+    call whose retries are exhausted.
+    """
+    calls = [retry_call_async(get_details or client.get_hardware_details, hardware_id, **retry_opts)]
+    if site_id:
+        calls.append(retry_call_async(get_hardware_list or client.get_hardware_list, site_id, **retry_opts))
+    results = []
+    for ok, res in await asyncio.gather(*calls):
+        if not ok:
+            raise res
+        results.append(res)
+    return results[0], (results[1] if site_id else None)
+
+
+def validate_hardware(client, hardware_id: str, site_id: Optional[str] = None, *, retries: int = 2,
+                      backoff: float = 0.5, timeout: Optional[float] = None,
+                      get_details: Optional[Callable] = None,
+                      get_hardware_list: Optional[Callable] = None) -> Tuple[bool, Any]:
+    """Validate that the hardware exists and optionally check site association.
+
+    Returns (ok, details) so callers can reuse the fetched HardwareDetails
+    instead of requesting them again; details is None when they could not be fetched.
+
+    get_details and get_hardware_list replace the client methods of the same
+    name (e.g. cached_get wrappers).
+    """
     try:
-        details = client.get_hardware_details(hardware_id)
+        details, hardware_list = asyncio.run(
+            _fetch_hardware(client, hardware_id, site_id, get_details, get_hardware_list,
+                            retries=retries, backoff=backoff, timeout=timeout)
+        )
         if not details:
             logger.error(f"Hardware {hardware_id} not found")
-            return False
+            return False, None
 
         # If site_id provided, validate hardware belongs to site
         if site_id:
-            hardware_list = client.get_hardware_list(site_id)
-            hardware_ids = [hw.key for hw in hardware_list]
-            if hardware_id not in hardware_ids:
+            if not any(hw.key == hardware_id for hw in hardware_list):
                 logger.warning(f"Hardware {hardware_id} not found at site {site_id}")
                 logger.warning("Continuing anyway - hardware may exist but site association unclear")
 
@@ -157,13 +200,14 @@ def validate_hardware(client, hardware_id: str, site_id: Optional[str] = None) -
         else:
             logger.info(f"Validated inverter hardware {hardware_id}")
 
-        return True
+        return True, details
     except Exception as e:
         logger.error(f"Failed to validate hardware {hardware_id}: {e}")
-        return False
+        return False, None
 
 
-def main(argv: Optional[List[str]] = None) -> None:
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Update hardware modeling configuration (primarily for inverters)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -181,7 +225,7 @@ Examples:
   # Find hardware IDs first
   python3 examples/get_hardware_list.py --site-id S60308 --mock
 
-Common Modeling Parameters (examples - you can edit ANY field):
+Common Modeling Parameters (opened by --edit; --edit-all opens ANY field):
   azimuth: Panel azimuth angle (0-360 degrees)
   tilt: Panel tilt angle (0-90 degrees)
   derate: System derate factor (0.0-1.0)
@@ -189,8 +233,9 @@ Common Modeling Parameters (examples - you can edit ANY field):
   mppWatts: Inverter capacity in watts
   pvSystOutOfSync: PVSyst synchronization flag
 
-The interactive editor opens the COMPLETE hardware configuration JSON,
-allowing you to modify any field, not just modeling parameters.
+The interactive editor opens only the modeling parameters above that the
+hardware has. Use --edit --edit-all to open the COMPLETE hardware
+configuration JSON and modify any field, not just modeling parameters.
 
 Note: While designed for inverters, this script works with any hardware type.
         """
@@ -199,80 +244,33 @@ Note: While designed for inverters, this script works with any hardware type.
     parser.add_argument("--hardware-id", required=True, help="Hardware ID to update (e.g., H511568)")
     parser.add_argument("--update-file", help="JSON file with update payload")
     parser.add_argument("--edit", action="store_true", help="Interactively edit current config")
+    parser.add_argument("--edit-all", action="store_true",
+                        help="With --edit, open the complete config instead of just the modeling fields")
     parser.add_argument("--output-dir", default="portfolio/hardware_backups/", help="Directory to save backups")
     parser.add_argument("--apply", action="store_true", help="Apply the update (writes to API)")
     parser.add_argument("--mock", action="store_true", help="Use mock client for testing")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always fetch the hardware config and site hardware list (skip the ETag/short-TTL response cache)")
     parser.add_argument("--retries", type=int, default=2, help="Retries on API call failure")
     parser.add_argument("--backoff", type=float, default=0.5, help="Initial backoff seconds for retries")
     parser.add_argument("--timeout", type=float, default=None, help="Per-request timeout")
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
+    return parser
 
-    args = parser.parse_args(argv)
-
-    client = get_client(use_mock=args.mock)
 
-    # Validate hardware
-    if not validate_hardware(client, args.hardware_id, args.site_id):
-        sys.exit(1)
-
-    # Determine update payload
-    updates = {}
-
-    if args.update_file:
-        # Load updates from file
-        try:
-            updates = load_update_file(args.update_file)
-        except Exception as e:
-            logger.error(f"Failed to load update file: {e}")
-            sys.exit(1)
-    elif args.edit:
-        # Interactive editing mode
-        try:
-            # First fetch current config for editing
-            ok, current_config = retry_call(
-                client.get_hardware_details,
-                args.hardware_id,
-                retries=args.retries,
-                backoff=args.backoff,
-                timeout=args.timeout
-            )
-            if not ok:
-                logger.error(f"Failed to fetch current config: {current_config}")
-                sys.exit(1)
-
-            if not current_config:
-                logger.error("No current configuration data available")
-                sys.exit(1)
-
-            # Extract the details dict for editing
-            current_config = current_config.details
-            if not current_config:
-                logger.error("No configuration details available")
-                sys.exit(1)
-
-            edited_config = edit_config_interactively(current_config)
-            if edited_config is None:
-                logger.error("Config editing cancelled or failed")
-                sys.exit(1)
-
-            # Compute what changed
-            diff = compute_config_diff(current_config, edited_config)
-            if not any(diff.values()):
-                logger.info("No changes made, exiting.")
-                return
-
-            # Use only the changed fields as updates
-            updates = {k: edited_config[k] for k in diff['added'] + diff['changed']}
-
-        except Exception as e:
-            logger.error(f"Interactive editing failed: {e}")
-            sys.exit(1)
-    else:
-        # Just show current config (dry-run mode)
-        logger.info("No --update-file or --edit specified, showing current configuration...")
+def show_or_apply(client, args: argparse.Namespace, updates: Dict[str, Any],
+                  current_config: Optional[Dict[str, Any]] = None) -> None:
+    """Log the update (dry-run) or apply it, then back up the original config and response.
 
+    current_config is the hardware config main already fetched (and, with --apply,
+    revalidated); passing it on spares update_hardware_config its own GET.
+    """
     if args.verbose:
-        logger.info(f"Update payload: {json.dumps(updates, indent=2)}")
+        logger.info(f"Update payload: {to_json(updates)}")
+
+    if not updates:
+        logger.info("Nothing to update.")
+        return
 
     # Dry-run: show what would happen
     if not args.apply:
@@ -282,7 +280,7 @@ Note: While designed for inverters, this script works with any hardware type.
 
     # Apply updates
     ensure_dir(args.output_dir)
-    ts = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    ts = file_timestamp()
     backup_path = Path(args.output_dir) / f"{args.hardware_id}_{ts}.json"
 
     logger.info(f"Applying updates to {args.hardware_id}...")
@@ -292,10 +290,14 @@ Note: While designed for inverters, this script works with any hardware type.
         args.hardware_id,
         updates,
         return_full_response=True,
+        current_config=current_config,
         retries=args.retries,
         backoff=args.backoff,
         timeout=args.timeout
     )
+    if not (args.mock or args.no_cache):
+        # The cached details predate this PUT (which may have landed even if it failed)
+        invalidate_cached(client.get_hardware_details, args.hardware_id)
 
     if not ok:
         logger.error(f"Failed to apply update: {result}")
@@ -304,20 +306,18 @@ Note: While designed for inverters, this script works with any hardware type.
     success = getattr(result, 'success', False)
     logger.info(f"Update applied: success={success}")
 
-    # Save backup of original config
+    # Write the backup of the original config and the response in the background
     if hasattr(result, 'originalData') and result.originalData:
-        try:
-            save_json(result.originalData, str(backup_path))
-            logger.info(f"Original config backed up to: {backup_path}")
-        except Exception as e:
-            logger.warning(f"Failed to save backup: {e}")
+        def _log_backup(future):
+            if future.exception() is not None:
+                logger.warning(f"Failed to save backup: {future.exception()}")
+            else:
+                logger.info(f"Original config backed up to: {backup_path}")
+
+        save_json_async(result.originalData, str(backup_path), makedirs=False).add_done_callback(_log_backup)
 
-    # Save response data
     resp_path = Path(args.output_dir) / f"{args.hardware_id}_{ts}_response.json"
-    try:
-        save_json(result.__dict__ if hasattr(result, '__dict__') else result, str(resp_path))
-    except Exception as e:
-        pass
+    save_json_async(result.__dict__ if hasattr(result, '__dict__') else result, str(resp_path), makedirs=False)
 
     if success:
         logger.info(f"Successfully updated hardware {args.hardware_id} configuration")
@@ -329,5 +329,73 @@ Note: While designed for inverters, this script works with any hardware type.
         sys.exit(1)
 
 
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _build_parser().parse_args(argv)
+
+    client = get_client(use_mock=args.mock, http_retries=0, timeout=args.timeout)
+
+    # Repeated dry-runs revalidate a cached copy of the hardware config instead of
+    # downloading it again; --apply never trusts a TTL-only entry.
+    # The site's hardware list only backs an advisory membership check, so a
+    # TTL-cached copy is good enough even with --apply.
+    get_details = client.get_hardware_details
+    get_hardware_list = client.get_hardware_list
+    if not (args.mock or args.no_cache):
+        get_details = functools.partial(cached_get, client.get_hardware_details,
+                                        ttl=0 if args.apply else RESPONSE_CACHE_TTL)
+        get_hardware_list = functools.partial(cached_get, client.get_hardware_list)
+
+    # Validate hardware; the details it fetched are reused by --edit below
+    ok, details = validate_hardware(client, args.hardware_id, args.site_id, retries=args.retries,
+                                    backoff=args.backoff, timeout=args.timeout, get_details=get_details,
+                                    get_hardware_list=get_hardware_list)
+    if not ok:
+        sys.exit(1)
+
+    # Determine update payload
+    updates = {}
+
+    if args.update_file:
+        # Load updates from file
+        try:
+            updates = load_update_file(args.update_file)
+        except Exception as e:
+            logger.error(f"Failed to load update file: {e}")
+            sys.exit(1)
+    elif args.edit:
+        # Interactive editing mode
+        try:
+            # Extract the details dict for editing
+            current_config = details.details
+            if not current_config:
+                logger.error("No configuration details available")
+                sys.exit(1)
+
+            diff = edit_config_interactively(current_config, None if args.edit_all else EDITABLE_FIELDS)
+            if diff is None:
+                logger.error("Config editing cancelled or failed")
+                sys.exit(1)
+
+            if not diff:
+                logger.info("No changes made, exiting.")
+                return
+
+            # Send only the changed leaves; the SDK merges them into the current config
+            updates = patch_to_updates(diff)
+            removed = [op["path"] for op in diff if op["op"] == "remove"]
+            if removed:
+                logger.warning(f"Removing fields is not supported by the merge update; ignoring: {', '.join(removed)}")
+
+        except Exception as e:
+            logger.error(f"Interactive editing failed: {e}")
+            sys.exit(1)
+    else:
+        # Just show current config (dry-run mode); validate_hardware already fetched it
+        logger.info("No --update-file or --edit specified, showing current configuration...")
+        print(to_json(details.details))
+
+    show_or_apply(client, args, updates, details.details)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -10,53 +10,52 @@ Defaults to dry-run. Backups are saved before applying when --apply is used.
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import logging
 import sys
-from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from powertrack_sdk.utils import deep_merge_dicts, diff_json
+
 try:
-    from examples._util import get_client, ensure_dir, save_json, retry_call
+    from examples._util import file_timestamp, RESPONSE_CACHE_TTL, cached_get, invalidate_cached, get_client, ensure_dir, load_json, save_json, save_json_async, retry_call
 except Exception:
-    from _util import get_client, ensure_dir, save_json, retry_call
+    from _util import file_timestamp, RESPONSE_CACHE_TTL, cached_get, invalidate_cached, get_client, ensure_dir, load_json, save_json, save_json_async, retry_call
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
 def load_update_file(path: str) -> Dict[str, Any]:
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_json(path)
 
 
-def compute_diff(original: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, List[str]]:
-    added = []
-    changed = []
-    for k, v in updates.items():
-        if k not in original:
-            added.append(k)
-        else:
-            if original.get(k) != v:
-                changed.append(k)
-    return {"added": added, "changed": changed}
+def compute_diff(original: Dict[str, Any], updates: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """JSON Patch operations (down to nested leaves) that applying updates would make to original."""
+    return diff_json(original, deep_merge_dicts(original, updates))
 
 
-def main(argv: Optional[List[str]] = None):
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Update site configuration (dry-run by default)")
     parser.add_argument("--site-id", required=True, help="Site ID to update (e.g., S12345)")
     parser.add_argument("--update-file", required=True, help="JSON file with update payload")
     parser.add_argument("--backup-dir", default="portfolio/config_backups/", help="Directory to save backups")
     parser.add_argument("--apply", action="store_true", help="Apply the update (writes to API)")
     parser.add_argument("--mock", action="store_true", help="Use mock client for testing")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always fetch the full current config (skip the ETag/short-TTL response cache)")
     parser.add_argument("--retries", type=int, default=2, help="Retries on API call failure")
     parser.add_argument("--backoff", type=float, default=0.5, help="Initial backoff seconds for retries")
-    parser.add_argument("--timeout", type=float, default=None, help="Per-request timeout (unused) - reserved")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-attempt timeout in seconds (default: none)")
+    return parser
+
 
-    args = parser.parse_args(argv)
+def main(argv: Optional[List[str]] = None):
+    args = _build_parser().parse_args(argv)
 
-    client = get_client(use_mock=args.mock)
+    client = get_client(use_mock=args.mock, http_retries=0, timeout=args.timeout)
 
     # Load update payload
     try:
@@ -65,8 +64,12 @@ def main(argv: Optional[List[str]] = None):
         logger.error(f"Failed to load update file: {e}")
         sys.exit(2)
 
-    # Fetch current config with retries
-    ok, current = retry_call(client.get_site_config, args.site_id, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+    # Fetch current config with retries. Repeated dry-runs revalidate a cached copy
+    # instead of downloading it again; --apply never trusts a TTL-only entry.
+    get_config = client.get_site_config
+    if not (args.mock or args.no_cache):
+        get_config = functools.partial(cached_get, client.get_site_config, ttl=0 if args.apply else RESPONSE_CACHE_TTL)
+    ok, current = retry_call(get_config, args.site_id, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
     if not ok:
         logger.error(f"Failed to fetch current config for {args.site_id}: {current}")
         sys.exit(2)
@@ -90,7 +93,7 @@ def main(argv: Optional[List[str]] = None):
 
     # Applying: save backup and call client.update_site_config
     ensure_dir(args.backup_dir)
-    ts = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+    ts = file_timestamp()
     backup_path = Path(args.backup_dir) / f"{args.site_id}_{ts}.json"
     try:
         save_json(current_dict, str(backup_path))
@@ -99,17 +102,17 @@ def main(argv: Optional[List[str]] = None):
         sys.exit(2)
 
     ok, result = retry_call(client.update_site_config, args.site_id, updates, return_full_response=True, retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+    if not (args.mock or args.no_cache):
+        # The cached config predates this PUT (which may have landed even if it failed)
+        invalidate_cached(client.get_site_config, args.site_id)
     if not ok:
         logger.exception(f"Failed to apply update: {result}")
         sys.exit(2)
     success = getattr(result, 'success', False)
     logger.info(f"Update applied: success={success}")
-    # Save server response
+    # Save server response in the background; the backup above must land before the PUT
     resp_path = Path(args.backup_dir) / f"{args.site_id}_{ts}_response.json"
-    try:
-        save_json(result.__dict__ if hasattr(result, '__dict__') else result, str(resp_path))
-    except Exception:
-        pass
+    save_json_async(result.__dict__ if hasattr(result, '__dict__') else result, str(resp_path), makedirs=False)
 
     return {
         "site_id": args.site_id,
@@ -13,6 +13,8 @@ Usage:
 # The below allows for importing a mock client for testing purposes from the examples directory.
 # In production, you would import your client from the actual SDK package.
 
+import time
+
 from powertrack_sdk import __version__, utils, models
 
 
@@ -30,6 +32,12 @@ def smoke_tests():
     md = models.ModelingData(siteId='S1', inverters=[{'inverterKw': 1.0}, {'inverterKw': 2.0}])
     assert md.total_capacity_kw == 3.0
 
+    # A large site's worth of inverters; the timing is informational only
+    md = models.ModelingData(siteId='S1', inverters=[{'inverterKw': 1.5} for _ in range(10_000)])
+    start = time.perf_counter()
+    assert md.total_capacity_kw == 15_000.0
+    print(f'Summed 10,000 inverter capacities in {(time.perf_counter() - start) * 1000:.2f} ms')
+
     sl = models.SiteList([{'key': 'S10000', 'name': 'A'}])
     assert len(sl) == 1
 
@@ -14,7 +14,6 @@ Example:
 __version__ = "1.0.0"
 __author__ = "PowerTrack SDK Team"
 
-from .client import PowerTrackClient
 from .auth import AuthManager
 from .models import (
     Site, Hardware, AlertTrigger, SiteConfig, ModelingData,
@@ -27,6 +26,7 @@ from .exceptions import (
     PowerTrackError,
     AuthenticationError,
     APIError,
+    NotModified,
     ValidationError,
     ConfigurationError
 )
@@ -37,6 +37,7 @@ __all__ = [
     "PowerTrackError",
     "AuthenticationError",
     "APIError",
+    "NotModified",
     "ValidationError",
     "ConfigurationError",
     "Site",
@@ -57,4 +58,14 @@ __all__ = [
     "SiteDetailedInfo",
     "ReportingCapabilities",
     "UpdateResult",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # PowerTrackClient pulls in requests/urllib3, which dominates import time.
+    # Load it on first access so importing just the models stays cheap.
+    if name == "PowerTrackClient":
+        from .client import PowerTrackClient
+        globals()[name] = PowerTrackClient
+        return PowerTrackClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
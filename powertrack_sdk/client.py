@@ -4,10 +4,13 @@ Main PowerTrack API client
 Provides high-level interface for interacting with PowerTrack API endpoints.
 """
 
+import json
 import logging
 import dataclasses
-from typing import Dict, List, Optional, Any, Union
-from datetime import datetime
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple, Union
+from datetime import datetime, timedelta
 import re
 
 import requests
@@ -36,7 +39,7 @@ from .models import (
     UpdateResult,
 )
 from .utils import parse_site_id, parse_hardware_id, get_current_datetime_iso, safe_get, deep_merge_dicts
-from .exceptions import APIError, AuthenticationError, ValidationError
+from .exceptions import APIError, AuthenticationError, NotModified, ValidationError
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +59,7 @@ class PowerTrackClient:
         max_retries: int = 3,
         backoff_factor: float = 0.5,
         timeout: int = 30,
+        pool_maxsize: int = 10,
     ):
         """
         Initialize PowerTrack client.
@@ -66,6 +70,8 @@ class PowerTrackClient:
             max_retries: Maximum retry attempts for failed requests
             backoff_factor: Backoff factor for retries
             timeout: Request timeout in seconds
+            pool_maxsize: Keep-alive connections kept per host; size it to the
+                number of threads sharing this client
         """
         self.auth_manager = auth_manager or AuthManager()
         self.base_url = base_url or self.auth_manager.get_base_url()
@@ -80,7 +86,7 @@ class PowerTrackClient:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE", "POST"],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=pool_maxsize)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
@@ -88,6 +94,7 @@ class PowerTrackClient:
         self.session.headers.update(
             {
                 "Accept": "application/json",
+                "Connection": "keep-alive",
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             }
         )
@@ -103,7 +110,6 @@ class PowerTrackClient:
             text = response.text.strip()
             if text:
                 try:
-                    import json
                     return json.loads(text)
                 except Exception:
                     pass
@@ -218,6 +224,30 @@ class PowerTrackClient:
         except APIError as e:
             raise e
 
+    def get_json_conditional(
+        self, endpoint: str, if_none_match: Optional[str] = None, **kwargs
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Make GET request, optionally conditional on an ETag.
+
+        Args:
+            endpoint: API endpoint
+            if_none_match: ETag from an earlier response; sent as If-None-Match
+            **kwargs: Additional arguments for _make_request
+
+        Returns:
+            (JSON response, response ETag or None)
+
+        Raises:
+            NotModified: If the server answers 304 to the If-None-Match request
+        """
+        if if_none_match:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), "If-None-Match": if_none_match}
+        response = self._make_request("GET", endpoint, **kwargs)
+        if response.status_code == 304:
+            raise NotModified(response.headers.get("ETag") or if_none_match)
+        return response.json(), response.headers.get("ETag")
+
     def post_json(
         self, endpoint: str, payload: Dict[str, Any], **kwargs
     ) -> Optional[Dict[str, Any]]:
@@ -260,20 +290,24 @@ class PowerTrackClient:
 
     # ===== SITE METHODS =====
 
-    def get_site_config(self, siteId: str) -> Optional[SiteConfig]:
+    def get_site_config(self, siteId: str, if_none_match: Optional[str] = None) -> Optional[SiteConfig]:
         """
         Get site configuration data.
 
         Args:
             siteId: Site ID (e.g., 'S60308')
+            if_none_match: ETag of a previously fetched config (its .etag)
 
         Returns:
             SiteConfig object or None if not found
+
+        Raises:
+            NotModified: If if_none_match is given and the config is unchanged
         """
         siteId = parse_site_id(siteId)
 
         referer = f"{self.base_url}/powertrack/{siteId}/administration/config"
-        data = self.get_json(f"/api/edit/site/{siteId}", referer=referer)
+        data, etag = self.get_json_conditional(f"/api/edit/site/{siteId}", if_none_match, referer=referer)
 
         if not data:
             return None
@@ -295,6 +329,7 @@ class PowerTrackClient:
             dcCapacityKw=safe_get(data, "dcCapacityKw"),
             moduleCount=safe_get(data, "moduleCount"),
             rawData=data,
+            etag=etag,
         )
 
     def get_sites(self, site_list_file: Optional[str] = None) -> SiteList:
@@ -314,8 +349,6 @@ class PowerTrackClient:
             return SiteList.from_json_file(site_list_file)
         else:
             # Try to load from default locations
-            import os
-
             candidates = ["portfolio/SiteList.json", "../portfolio/SiteList.json"]
 
             for candidate in candidates:
@@ -557,20 +590,28 @@ class PowerTrackClient:
 
         return hardware_list
 
-    def get_hardware_details(self, hardware_key: str) -> Optional[HardwareDetails]:
+    def get_hardware_details(
+        self, hardware_key: str, if_none_match: Optional[str] = None
+    ) -> Optional[HardwareDetails]:
         """
         Get detailed hardware configuration.
 
         Args:
             hardware_key: Hardware key (e.g., 'H123456')
+            if_none_match: ETag of previously fetched details (their .etag)
 
         Returns:
             HardwareDetails object or None
+
+        Raises:
+            NotModified: If if_none_match is given and the config is unchanged
         """
         hardware_key = parse_hardware_id(hardware_key)
 
         referer = f"{self.base_url}/powertrack/{hardware_key}/administration/config"
-        data = self.get_json(f"/api/edit/hardware/{hardware_key}", referer=referer)
+        data, etag = self.get_json_conditional(
+            f"/api/edit/hardware/{hardware_key}", if_none_match, referer=referer
+        )
         if not data:
             return None
 
@@ -582,13 +623,14 @@ class PowerTrackClient:
             hid=data.get("hid"),
         )
 
-        return HardwareDetails(key=hardware_key, summary=summary, details=data)
+        return HardwareDetails(key=hardware_key, summary=summary, details=data, etag=etag)
 
     def update_hardware_config(
         self,
         hardware_id: str,
         config_data: Dict[str, Any],
-        return_full_response: bool = True
+        return_full_response: bool = True,
+        current_config: Optional[Dict[str, Any]] = None
     ) -> UpdateResult:
         """
         Update hardware configuration.
@@ -597,6 +639,8 @@ class PowerTrackClient:
             hardware_id: Hardware ID
             config_data: Configuration data to update
             return_full_response: Whether to return original/updated data for backup
+            current_config: Current configuration (e.g. get_hardware_details(...).details)
+                if the caller already has it; skips the GET before the PUT
 
         Returns:
             UpdateResult with success status and optional response data
@@ -605,8 +649,10 @@ class PowerTrackClient:
         referer = f"{self.base_url}/powertrack/{hardware_id}/administration/config"
 
         try:
-            # GET current configuration
-            originalData = self.get_json(f"/api/edit/hardware/{hardware_id}", referer=referer)
+            # GET current configuration, unless the caller already fetched it
+            originalData = current_config
+            if originalData is None:
+                originalData = self.get_json(f"/api/edit/hardware/{hardware_id}", referer=referer)
             if not originalData:
                 return UpdateResult(
                     success=False,
@@ -717,6 +763,38 @@ class PowerTrackClient:
             defaultTriggers=data.get("defaultTriggers", []),
         )
 
+    def get_alert_triggers_batch(
+        self, hardware_keys: List[str], max_workers: int = 8
+    ) -> Dict[str, Union[Optional[AlertTrigger], Exception]]:
+        """
+        Get alert triggers for many hardware keys in one call.
+
+        The API has no multi-key alert trigger endpoint, so this fans the
+        per-key GETs out over the client's pooled keep-alive session (keep
+        max_workers at or below pool_maxsize). A key whose request fails maps
+        to the exception it raised, so callers can record or retry it.
+
+        Args:
+            hardware_keys: Hardware keys to fetch
+            max_workers: Maximum concurrent requests (1 fetches sequentially)
+
+        Returns:
+            Dict mapping each hardware key to its AlertTrigger (or None), or to
+            the exception raised while fetching it
+        """
+        def fetch(key: str) -> Union[Optional[AlertTrigger], Exception]:
+            try:
+                return self.get_alert_triggers(key)
+            except Exception as e:
+                return e
+
+        keys = list(hardware_keys)
+        workers = max(1, min(max_workers, len(keys)))
+        if workers == 1:
+            return {key: fetch(key) for key in keys}
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            return dict(zip(keys, ex.map(fetch, keys)))
+
     def update_alert_triggers(
         self,
         hardware_key: str,
@@ -887,15 +965,29 @@ class PowerTrackClient:
         include_hardware: bool = True,
         include_alerts: bool = True,
         include_modeling: bool = True,
+        max_workers: int = 1,
+        executor: Optional[Executor] = None,
     ) -> Optional[SiteData]:
         """
         Get comprehensive site data.
 
+        By default the requests are made one after another. With max_workers > 1
+        (or an executor) the independent requests (config, modeling, hardware
+        details and their alert triggers) are issued concurrently over the
+        client's pooled keep-alive session, so the call takes about as long as
+        its slowest chain rather than the sum of every request. Callers that
+        already fetch many sites in parallel should leave this sequential or
+        share one executor, rather than nesting a thread pool per call.
+
         Args:
             siteId: Site ID
             include_hardware: Whether to fetch hardware data
             include_alerts: Whether to fetch alert data
             include_modeling: Whether to fetch modeling data
+            max_workers: Maximum concurrent requests for a pool created for this
+                call (keep at or below pool_maxsize); 1 fetches sequentially
+            executor: Executor to run the requests on instead; it must not be the
+                executor this call itself is running on
 
         Returns:
             SiteData object or None
@@ -905,30 +997,60 @@ class PowerTrackClient:
         # Get basic site info
         site = Site(key=siteId)
 
-        # Get config
-        config = self.get_site_config(siteId)
-
-        # Get hardware
-        hardware_details = []
-        if include_hardware:
-            hardware_list = self.get_hardware_list(siteId)
-            for hw in hardware_list:
-                details = self.get_hardware_details(hw.key)
-                if details:
-                    hardware_details.append(details)
-
-        # Get alerts
-        alerts = []
-        if include_alerts:
-            for hw_details in hardware_details:
-                alert_trigger = self.get_alert_triggers(hw_details.key)
-                if alert_trigger:
-                    alerts.append(alert_trigger)
-
-        # Get modeling
-        modeling = None
-        if include_modeling:
-            modeling = self.get_modeling_data(siteId)
+        if executor is None and max_workers <= 1:
+            # Get config
+            config = self.get_site_config(siteId)
+
+            # Get hardware
+            hardware_details = []
+            if include_hardware:
+                hardware_list = self.get_hardware_list(siteId)
+                for hw in hardware_list:
+                    details = self.get_hardware_details(hw.key)
+                    if details:
+                        hardware_details.append(details)
+
+            # Get alerts
+            alerts = []
+            if include_alerts:
+                for hw_details in hardware_details:
+                    alert_trigger = self.get_alert_triggers(hw_details.key)
+                    if alert_trigger:
+                        alerts.append(alert_trigger)
+
+            # Get modeling
+            modeling = None
+            if include_modeling:
+                modeling = self.get_modeling_data(siteId)
+        else:
+            owned = ThreadPoolExecutor(max_workers=max_workers) if executor is None else None
+            ex = executor or owned
+            try:
+                config_future = ex.submit(self.get_site_config, siteId)
+                modeling_future = ex.submit(self.get_modeling_data, siteId) if include_modeling else None
+
+                # Get hardware
+                hardware_details = []
+                if include_hardware:
+                    hardware_list = self.get_hardware_list(siteId)
+                    hardware_details = [
+                        details for details in ex.map(self.get_hardware_details, [hw.key for hw in hardware_list])
+                        if details
+                    ]
+
+                # Get alerts
+                alerts = []
+                if include_alerts:
+                    alerts = [
+                        trigger for trigger in ex.map(self.get_alert_triggers, [hw.key for hw in hardware_details])
+                        if trigger
+                    ]
+
+                config = config_future.result()
+                modeling = modeling_future.result() if modeling_future else None
+            finally:
+                if owned is not None:
+                    owned.shutdown()
 
         return SiteData(
             site=site,
@@ -1121,7 +1243,6 @@ class PowerTrackClient:
         site_key = parse_site_id(siteId)
 
         # Build POST payload based on actual API structure from fetch logs
-        from datetime import datetime, timedelta
         end_date = end_date or datetime.utcnow().strftime('%Y-%m-%d')
         start_date = start_date or (datetime.utcnow() - timedelta(days=7)).strftime('%Y-%m-%d')
 
@@ -24,6 +24,14 @@ class APIError(PowerTrackError):
         self.response_data = response_data or {}
 
 
+class NotModified(APIError):
+    """Raised when a conditional GET (if_none_match) finds the resource unchanged (HTTP 304)."""
+
+    def __init__(self, etag: Optional[str] = None):
+        super().__init__("Resource not modified (304)", 304)
+        self.etag = etag
+
+
 class ValidationError(PowerTrackError):
     """Raised when input validation fails."""
     pass
@@ -4,7 +4,7 @@ Data models for PowerTrack SDK
 Defines classes representing PowerTrack API data structures.
 """
 
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Union, Tuple, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -104,6 +104,7 @@ class SiteConfig:
     dcCapacityKw: Optional[float] = None
     moduleCount: Optional[int] = None
     rawData: Dict[str, Any] = field(default_factory=dict)
+    etag: Optional[str] = None  # server ETag, for conditional re-fetches
 
 
 @dataclass
@@ -127,6 +128,7 @@ class HardwareDetails:
     key: str
     summary: Hardware
     details: Dict[str, Any] = field(default_factory=dict)
+    etag: Optional[str] = None  # server ETag, for conditional re-fetches
 
 
 @dataclass
@@ -205,10 +207,20 @@ class SiteList:
 
     @classmethod
     def from_json_file(cls, filepath: str) -> 'SiteList':
-        """Load site list from JSON file."""
-        import json
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        """Load site list from JSON file.
+
+        Parsed with orjson straight from the file's bytes when it is installed
+        (the ``fast`` extra), otherwise with the stdlib json module.
+        """
+        try:
+            import orjson
+        except ImportError:
+            import json
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        else:
+            with open(filepath, 'rb') as f:
+                data = orjson.loads(f.read())
 
         metadata = data.get('metadata', {})
         sites_data = data.get('sites', [])
@@ -385,7 +397,7 @@ class ChartSeries:
     """Individual data series within a chart."""
     name: str
     key: str
-    dataXy: List[Tuple[int, float]]
+    dataXy: Sequence[Tuple[int, float]]  # (timestamp, value) pairs; an (N, 2) numpy array also works
     color: str
     customUnit: str
     dataMax: float
@@ -410,7 +422,7 @@ class ChartSeries:
     alertMessageMap: Optional[Dict] = None
 
     @property
-    def data_points(self) -> List[Tuple[int, float]]:
+    def data_points(self) -> Sequence[Tuple[int, float]]:
         """Get data points as (timestamp, value) tuples."""
         return self.dataXy
 
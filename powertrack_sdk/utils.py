@@ -334,4 +334,78 @@ def _merge_arrays_by_key(base_array: List[Any], update_array: List[Any], key_fie
             # No match found, append new item
             result.append(update_item)
 
-    return result
\ No newline at end of file
+    return result
+
+_MISSING = object()
+
+
+def _escape_pointer_token(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape_pointer_token(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff_json(original: Any, updated: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    Compute the JSON Patch (RFC 6902) operations that turn original into updated.
+
+    Nested dictionaries are compared key by key, so a change under
+    "modeling/azimuth" is a single replace of that leaf rather than of the
+    whole "modeling" object. Lists and scalars are compared as whole values.
+
+    Args:
+        original: Original JSON value
+        updated: Updated JSON value
+        path: JSON Pointer (RFC 6901) of the values being compared
+
+    Returns:
+        List of {"op": "add"|"remove"|"replace", "path": ..., ["value": ...]} operations
+    """
+    if not (isinstance(original, dict) and isinstance(updated, dict)):
+        return [] if original == updated else [{"op": "replace", "path": path, "value": updated}]
+
+    ops = []
+    # Key-view comparisons and differences run in C; in the common case (values
+    # edited, no keys added or removed) that leaves one lookup per key below.
+    if original.keys() != updated.keys():
+        removed = original.keys() - updated.keys()
+        if removed:
+            ops = [{"op": "remove", "path": f"{path}/{_escape_pointer_token(key)}"}
+                   for key in original if key in removed]
+    for key, value in updated.items():
+        old = original.get(key, _MISSING)
+        if old is _MISSING:
+            ops.append({"op": "add", "path": f"{path}/{_escape_pointer_token(key)}", "value": value})
+        elif old != value:
+            ops.extend(diff_json(old, value, f"{path}/{_escape_pointer_token(key)}"))
+    return ops
+
+
+def patch_to_updates(patch: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build a sparse update dict, suitable for deep_merge_dicts, from JSON Patch operations.
+
+    Only "add" and "replace" operations are included; a merge cannot delete keys,
+    so "remove" operations are skipped (callers can report them separately).
+
+    Args:
+        patch: Operations as returned by diff_json
+
+    Returns:
+        Nested dictionary holding just the added/replaced leaves
+    """
+    updates: Dict[str, Any] = {}
+    for op in patch:
+        if op["op"] not in ("add", "replace"):
+            continue
+        tokens = [_unescape_pointer_token(t) for t in op["path"].split("/")[1:]]
+        if not tokens:
+            # Whole-document replacement
+            return dict(op["value"]) if isinstance(op["value"], dict) else op["value"]
+        target = updates
+        for token in tokens[:-1]:
+            target = target.setdefault(token, {})
+        target[tokens[-1]] = op["value"]
+    return updates
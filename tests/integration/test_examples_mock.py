@@ -30,6 +30,48 @@ def test_fetch_all_site_data_mock(tmp_path):
     assert "fetched_at" in data or True
 
 
+def test_fetch_all_site_data_saves_in_process_pool(tmp_path):
+    site_list = tmp_path / "SiteList.json"
+    site_list.write_text(json.dumps({"sites": [{"key": "S10001"}, {"key": "S10002"}]}))
+    out_dir = tmp_path / "site_data"
+
+    fetch_all_site_data.main(["--site-list", str(site_list), "--output-dir", str(out_dir), "--mock", "--parallel", "--workers", "2", "--process-save"])
+
+    summary = json.loads((out_dir / "summary.json").read_text())
+    assert [s["success"] for s in summary] == [True, True]
+    assert json.loads((out_dir / "S10002.json").read_text())["site"]["key"] == "S10002"
+
+
+def test_fetch_all_site_data_parallel_saves_each_site_and_keeps_order(tmp_path):
+    keys = ["S10003", "S10001", "S10002"]
+    site_list = tmp_path / "SiteList.json"
+    site_list.write_text(json.dumps({"sites": [{"key": k} for k in keys]}))
+    out_dir = tmp_path / "site_data"
+
+    fetch_all_site_data.main(["--site-list", str(site_list), "--output-dir", str(out_dir), "--mock", "--parallel", "--workers", "2"])
+
+    summary = json.loads((out_dir / "summary.json").read_text())
+    assert [s["site"] for s in summary] == keys
+    assert all((out_dir / f"{k}.json").exists() for k in keys)
+
+
+def test_fetch_all_site_data_and_configs_write_archives(tmp_path):
+    import _util
+
+    site_list = tmp_path / "SiteList.json"
+    site_list.write_text(json.dumps({"sites": [{"key": "S10001"}, {"key": "S10002"}]}))
+    data_archive = tmp_path / "site_data.jsonl.gz"
+    cfg_archive = tmp_path / "configs.jsonl"
+
+    fetch_all_site_data.main(["--site-list", str(site_list), "--output-dir", str(tmp_path / "site_data"), "--mock", "--parallel", "--archive", str(data_archive)])
+    fetch_site_configs.main(["--site-list", str(site_list), "--output-dir", str(tmp_path / "configs"), "--mock", "--archive", str(cfg_archive)])
+
+    assert sorted(r["site"] for r in _util.read_archive(str(data_archive))) == ["S10001", "S10002"]
+    assert [r["site"] for r in _util.read_archive(str(cfg_archive))] == ["S10001", "S10002"]
+    assert not (tmp_path / "site_data" / "S10001.json").exists()
+    assert not (tmp_path / "configs").exists()
+
+
 def test_fetch_site_configs_mock(tmp_path):
     site_list = tmp_path / "SiteList.json"
     site_list.write_text(json.dumps({"sites": [{"key": "S10001", "name": "Mock Site 1"}]}))
@@ -42,6 +84,48 @@ def test_fetch_site_configs_mock(tmp_path):
     assert isinstance(cfg, dict)
 
 
+def test_fetch_site_configs_retries_failed_fetches(tmp_path, monkeypatch):
+    _util = sys.modules[fetch_all_site_alerts.get_client.__module__]
+
+    calls = []
+
+    class FlakyClient(_util.MockClient):
+        def get_site_config(self, site_id):
+            calls.append(site_id)
+            if len(calls) == 1:
+                raise ConnectionError("reset")
+            return super().get_site_config(site_id)
+
+    monkeypatch.setattr(fetch_site_configs, "get_client", lambda use_mock=False, **kwargs: FlakyClient())
+    monkeypatch.setattr(_util, "_retry_mode", _util._retry_mode)  # main() sets it process-wide
+    out_dir = tmp_path / "configs"
+    fetch_site_configs.main(["--site-id", "S10001", "--output-dir", str(out_dir), "--retries", "1", "--backoff", "0", "--retry-mode", "legacy"])
+    assert calls == ["S10001", "S10001"]
+    assert (out_dir / "S10001.json").exists()
+
+
+def test_fetch_all_site_data_retries_failed_fetches(tmp_path, monkeypatch):
+    _util = sys.modules[fetch_all_site_alerts.get_client.__module__]
+
+    class BrokenClient(_util.MockClient):
+        def get_site_data(self, site_id, *args, **kwargs):
+            calls.append(site_id)
+            raise ConnectionError("reset")
+
+    monkeypatch.setattr(fetch_all_site_data, "get_client", lambda use_mock=False, **kwargs: BrokenClient())
+    monkeypatch.setattr(_util, "_retry_mode", _util._retry_mode)  # main() sets it process-wide
+    site_list = tmp_path / "SiteList.json"
+    site_list.write_text(json.dumps({"sites": [{"key": "S10001"}]}))
+    out_dir = tmp_path / "site_data"
+    for mode in ([], ["--asyncio"], ["--parallel"]):
+        calls = []
+        fetch_all_site_data.main(["--site-list", str(site_list), "--output-dir", str(out_dir), *mode,
+                                  "--retries", "2", "--backoff", "0", "--retry-mode", "legacy"])
+        assert calls == ["S10001"] * 3, mode
+        summary = json.loads((out_dir / "summary.json").read_text())
+        assert summary == [{"site": "S10001", "success": False, "error": "reset", "path": None}]
+
+
 def test_fetch_all_site_alerts_mock(tmp_path):
     out = tmp_path / "alerts.json"
     fetch_all_site_alerts.main(["--customer-id", "C123", "--output", str(out), "--mock", "--limit", "1"]) 
@@ -67,3 +151,233 @@ def test_get_chart_data_mock():
     # Should return 0 (success)
     assert result is None  # main returns None on success
 
+
+
+def test_get_chart_data_lttb_keeps_endpoints_and_peaks(tmp_path):
+    import get_chart_data
+    points = [(t * 60000, float(t % 50)) for t in range(10000)]
+    points[4321] = (points[4321][0], 1000.0)
+    idx = get_chart_data.lttb_indices(points, 500)
+    assert len(idx) == 500 and idx[0] == 0 and idx[-1] == len(points) - 1
+    assert idx == sorted(set(idx)) and 4321 in idx
+    assert get_chart_data.lttb_indices(points[:10], 500) == list(range(10))
+
+    out = tmp_path / "chart.json"
+    get_chart_data.main(["--site-id", "S70726", "--mock", "--downsample", "3", "--output", str(out)])
+    series = json.loads(out.read_text())["result"]["series"]
+    assert all(len(s["dataXy"]) <= 3 for s in series)
+
+
+def test_example_parsers_are_built_once():
+    import get_chart_data
+    parser = get_chart_data._build_parser()
+    get_chart_data.main(["--site-id", "S70726", "--mock", "--output", os.devnull])
+    assert get_chart_data._build_parser() is parser
+    assert fetch_site_configs._build_parser() is fetch_site_configs._build_parser()
+
+
+def test_example_parsers_report_missing_required_ids():
+    import pytest
+    import get_alert_summary
+    import get_pvsyst_modules
+
+    for module in (fetch_all_site_alerts, get_alert_summary, get_pvsyst_modules):
+        with pytest.raises(SystemExit) as exc:
+            module.main(["--mock"])
+        assert exc.value.code == 2
+
+
+def test_examples_dispatcher_runs_commands_in_one_process(tmp_path):
+    from examples.__main__ import main as run_examples
+    overview, chart = tmp_path / "overview.json", tmp_path / "chart.json"
+    assert run_examples(["get_site_overview", "--site-id", "S1", "--mock", "--output", str(overview), "+",
+                         "get_chart_data", "--site-id", "S1", "--mock", "--output", str(chart)]) == 0
+    assert json.loads(overview.read_text())["method"] == "get_site_overview"
+    assert json.loads(chart.read_text())["method"] == "get_chart_data"
+
+
+def test_examples_dispatcher_stops_at_first_failure(tmp_path, monkeypatch):
+    import examples.get_site_overview
+    from examples.__main__ import main as run_examples
+
+    def fail(argv):
+        raise SystemExit(1)
+
+    monkeypatch.setattr(examples.get_site_overview, "main", fail)
+    chart = tmp_path / "chart.json"
+    assert run_examples(["get_site_overview", "--site-id", "S1", "--mock", "+", "get_chart_data", "--site-id", "S1", "--mock",
+                         "--output", str(chart)]) == 1
+    assert not chart.exists()
+
+
+def test_examples_dispatcher_checks_every_commands_arguments_first(tmp_path, capsys):
+    from examples.__main__ import main as run_examples
+    overview = tmp_path / "overview.json"
+    assert run_examples(["get_site_overview", "--site-id", "S1", "--mock", "--output", str(overview), "+",
+                         "get_site_config", "--mock"]) == 2
+    assert not overview.exists()
+    assert "usage: get_site_config.py" in capsys.readouterr().err
+
+
+def test_validate_hardware_fetches_details_and_list_concurrently():
+    import threading
+    from types import SimpleNamespace
+    import update_inverter_modeling
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    class Client:
+        def get_hardware_details(self, hardware_id):
+            barrier.wait()
+            return SimpleNamespace(key=hardware_id, summary=SimpleNamespace(functionCode=1))
+
+        def get_hardware_list(self, site_id):
+            barrier.wait()
+            return [SimpleNamespace(key="H12345")]
+
+    ok, details = update_inverter_modeling.validate_hardware(Client(), "H12345", "S10001", retries=0)
+    assert ok and details.key == "H12345"
+    assert update_inverter_modeling.validate_hardware(SimpleNamespace(get_hardware_details=lambda h: None), "H1") == (False, None)
+
+
+def test_alert_hardware_key_filter_matches_regex():
+    import re
+
+    keys = ["H12345", "H", "h1", "HX1", "S10001", "H12a", "", "H٣", 7, None]
+    expected = [k for k in keys if isinstance(k, str) and re.match(r"^H\d+$", k)]
+    assert [k for k in keys if fetch_all_site_alerts._is_hardware_key(k)] == expected
+
+
+def test_save_site_list_writes_sites_directly(tmp_path):
+    import fetch_site_list
+    from powertrack_sdk import Site, SiteList
+
+    out = tmp_path / "portfolio" / "SiteList.json"
+    fetch_site_list.save_site_list(SiteList([Site(key="S1"), Site(key="S2", name="Two", metadata={"a": 1})], {"customer_id": "C1"}), str(out))
+    data = json.loads(out.read_text())
+    assert data["metadata"] == {"customer_id": "C1"}
+    assert data["sites"] == [{"key": "S1", "name": "S1", "metadata": {}}, {"key": "S2", "name": "Two", "metadata": {"a": 1}}]
+
+
+def test_alert_trigger_detail_is_a_detached_copy():
+    from powertrack_sdk.models import AlertTrigger
+
+    trig = AlertTrigger(key="H1", triggers=[{"name": "T"}])
+    detail = fetch_all_site_alerts._trigger_detail(trig)
+    assert detail["key"] == "H1"
+    detail["triggers"].append({"name": "X"})
+    assert trig.triggers == [{"name": "T"}]
+    assert fetch_all_site_alerts._trigger_detail(None) is None
+
+
+def test_fetch_all_site_alerts_aggregates_typed_summary(tmp_path):
+    out = tmp_path / "alerts.json"
+    fetch_all_site_alerts.main(["--customer-id", "C123", "--output", str(out), "--mock"])
+    j = json.loads(out.read_text())
+    assert j["summary"]["hardware_summaries"]["H100"]["maxSeverity"] == 2
+    assert j["aggregated_summary"]["total_alerts"] == 1
+    assert j["aggregated_summary"]["alert_names"] == ["MockTrigger"]
+    assert j["aggregated_summary"]["alert_name_counts"] == {"MockTrigger": 1}
+    assert list(j["details"]) == ["H100"]
+
+
+def test_example_mock_client_runs_on_stub(capsys):
+    import example_mock_client
+
+    example_mock_client.main()
+    assert "Mock example completed successfully" in capsys.readouterr().out
+
+
+def test_edit_config_interactively_opens_only_editable_fields(monkeypatch):
+    import update_inverter_modeling
+
+    opened = {}
+
+    def fake_editor(cmd):
+        path = Path(cmd[1])
+        opened.update(json.loads(path.read_text()))
+        path.write_text(json.dumps({**opened, "tilt": 25}))
+        return type("Result", (), {"returncode": 0})()
+
+    monkeypatch.setattr(update_inverter_modeling.subprocess, "run", fake_editor)
+    config = {"name": "Inverter 1", "azimuth": 180, "tilt": 20, "registers": list(range(100))}
+    patch = update_inverter_modeling.edit_config_interactively(config)
+
+    assert opened == {"azimuth": 180, "tilt": 20}
+    assert patch == [{"op": "replace", "path": "/tilt", "value": 25}]
+
+
+def test_fetch_all_site_alerts_batch_is_opt_in_and_records_errors(tmp_path, monkeypatch):
+    import pytest
+
+    _util = sys.modules[fetch_all_site_alerts.get_client.__module__]
+
+    calls = []
+    failing = {"H100"}  # the mock alert summary's only hardware key
+    real_get = _util.MockClient.get_alert_triggers
+
+    def get_alert_triggers(self, hardware_key, last_changed=None):
+        calls.append(hardware_key)
+        if hardware_key in failing:
+            raise RuntimeError("boom")
+        return real_get(self, hardware_key)
+
+    def get_alert_triggers_batch(self, hardware_keys, max_workers=8):
+        calls.append(("batch", max_workers))
+        return {key: (RuntimeError("boom") if key in failing else real_get(self, key)) for key in hardware_keys}
+
+    monkeypatch.setattr(_util.MockClient, "get_alert_triggers", get_alert_triggers)
+    monkeypatch.setattr(_util.MockClient, "get_alert_triggers_batch", get_alert_triggers_batch)
+
+    out = tmp_path / "alerts.json"
+    fetch_all_site_alerts.main(["--site-id", "S10001", "--mock", "--output", str(out), "--no-filter", "--retries", "0"])
+    assert not any(isinstance(c, tuple) for c in calls)
+
+    calls.clear()
+    fetch_all_site_alerts.main(["--site-id", "S10001", "--mock", "--output", str(out), "--no-filter",
+                                "--batch", "--workers", "3", "--retries", "1", "--backoff", "0"])
+    assert ("batch", 3) in calls
+    # The batch attempt failed, so the single remaining retry fetched the key on its own
+    assert calls.count("H100") == 1
+    assert json.loads(out.read_text())["details"]["H100"] == {"error": "boom"}
+
+    with pytest.raises(SystemExit) as exc:
+        fetch_all_site_alerts.main(["--site-id", "S10001", "--mock", "--batch", "--no-batch"])
+    assert exc.value.code == 2
+
+
+def test_apply_alert_updates_only_retries_writes_that_are_safe_to_repeat(tmp_path, monkeypatch):
+    import requests
+    import apply_alert_updates
+    from powertrack_sdk import APIError
+
+    calls = []
+
+    class Client:
+        def add_alert_trigger(self, hw, payload):
+            calls.append(("add", hw))
+            if hw == "H1":
+                raise APIError("Request failed: read timed out")  # may have been applied
+            if calls.count(("add", "H2")) == 1:
+                try:
+                    raise requests.exceptions.ConnectTimeout("connect timed out")
+                except requests.exceptions.ConnectTimeout:
+                    raise APIError("Request failed: connect timed out")  # never sent
+            return True
+
+        def update_alert_triggers(self, hw, payload, return_full_response=True):
+            calls.append(("update", hw))
+            raise APIError("HTTP 503 error", 503)
+
+    monkeypatch.setattr(apply_alert_updates, "get_client", lambda use_mock=False, **kwargs: Client())
+    updates = tmp_path / "updates.json"
+    updates.write_text(json.dumps([{"hardware_key": "H1", "action": "add"},
+                                   {"hardware_key": "H2", "action": "add"},
+                                   {"hardware_key": "H3", "action": "update"}]))
+    result = apply_alert_updates.main(["--updates-file", str(updates), "--apply", "--backup-dir", str(tmp_path),
+                                       "--retries", "2", "--backoff", "0"])
+
+    assert calls.count(("add", "H1")) == 1
+    assert calls.count(("add", "H2")) == 2
+    assert calls.count(("update", "H3")) == 3
+    assert result["failed"] == 2
@@ -0,0 +1,674 @@
+import json
+import os
+import sys
+
+# Add examples to path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'examples'))
+
+import _util
+
+
+def test_save_json_and_load_site_list_roundtrip(tmp_path):
+    path = tmp_path / "nested" / "SiteList.json"
+    _util.save_json({"metadata": {"owner": "me"}, "sites": [{"key": "S10001", "name": "A", "extra": 1}]}, str(path))
+
+    assert json.loads(path.read_text(encoding="utf-8"))["sites"][0]["key"] == "S10001"
+    sites = _util.load_site_list(str(path))
+    assert len(sites) == 1
+    assert sites.metadata == {"owner": "me"}
+    assert sites[0].metadata == {"extra": 1}
+
+
+def test_mock_overview_copies_template_per_site():
+    client = _util.MockClient()
+    a = client.get_site_overview("S10001")
+    b = client.get_site_overview("S10002")
+    assert (a.key, a.id, b.key, b.id) == ("S10001", 10001, "S10002", 10002)
+    assert b.name == "Mock S10002"
+    assert client.get_portfolio_overview("C1").sites[0].parentKey == "C1"
+    assert client.get_chart_data(1, "S10001", bin_size=60).binSize == 60
+
+
+def test_parallel_map_reuses_pool_and_reports_failures():
+    def work(x):
+        if x == 3:
+            raise ValueError("boom")
+        return x * 2
+
+    results = _util.parallel_map(work, range(5), workers=2, retries=0)
+    assert [(item, ok) for item, ok, _ in results] == [(0, True), (1, True), (2, True), (3, False), (4, True)]
+    assert {item: res for item, ok, res in results if ok}[4] == 8
+    assert _util._get_pool(2) is _util._get_pool(2)
+
+
+def test_parallel_imap_yields_every_item():
+    seen = {item: res for item, ok, res in _util.parallel_imap(lambda x: x + 1, [1, 2, 3], workers=2)}
+    assert seen == {1: 2, 2: 3, 3: 4}
+
+
+def test_parallel_imap_consumes_items_lazily():
+    consumed = []
+
+    def source():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+
+    gen = _util.parallel_imap(lambda x: x, source(), workers=2)
+    next(gen)
+    # Only the initial window (2 * workers) plus one refill should have been pulled
+    assert len(consumed) <= 5
+    assert len(list(gen)) == 99
+
+
+def test_retry_call_retries_then_gives_up():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise RuntimeError("nope")
+
+    ok, err = _util.retry_call(flaky, retries=2, backoff=0.001)
+    assert ok is False
+    assert isinstance(err, RuntimeError)
+    assert len(calls) == 3
+
+
+def test_retry_call_honours_timeout():
+    import time
+
+    ok, err = _util.retry_call(time.sleep, 0.5, retries=0, timeout=0.01)
+    assert ok is False
+    assert isinstance(err, Exception)
+
+
+def test_cancel_retries_cuts_backoff_short(monkeypatch):
+    import threading
+    import time
+
+    monkeypatch.setattr(_util, "_shutdown_event", threading.Event())
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise RuntimeError("nope")
+
+    _util.cancel_retries()
+    start = time.monotonic()
+    ok, err = _util.retry_call(flaky, retries=3, backoff=10)
+    assert (ok, len(calls)) == (False, 1)
+    assert isinstance(err, RuntimeError)
+    assert time.monotonic() - start < 1
+
+
+def test_retry_call_async_retries_sync_and_async_callables():
+    import asyncio
+
+    calls = []
+
+    def flaky(x):
+        calls.append(x)
+        if len(calls) < 2:
+            raise RuntimeError("once")
+        return x * 2
+
+    async def double(x):
+        return x * 2
+
+    assert asyncio.run(_util.retry_call_async(flaky, 3, retries=2, backoff=0.001)) == (True, 6)
+    assert asyncio.run(_util.retry_call_async(double, 4)) == (True, 8)
+    assert len(calls) == 2
+
+
+def test_retry_call_async_timed_retries_do_not_queue_behind_abandoned_attempts(monkeypatch):
+    import asyncio
+    import threading
+    import time
+
+    monkeypatch.setattr(_util, "_shutdown_event", threading.Event())
+    release = threading.Event()
+    attempts = []
+
+    def first_attempt_hangs(item):
+        attempts.append(item)
+        if attempts.count(item) == 1:
+            release.wait(5)
+        return item
+
+    try:
+        # One pool thread: a retry queued behind the hung attempt would time out unrun
+        results = _util.async_map(first_attempt_hangs, [1, 2], concurrency=1, retries=1, backoff=0, timeout=0.2)
+        assert results == [(1, True, 1), (2, True, 2)]
+    finally:
+        release.set()
+
+    # cancel_retries() also ends an asyncio backoff wait early
+    def flaky():
+        raise RuntimeError("nope")
+
+    threading.Timer(0.1, _util.cancel_retries).start()
+    start = time.monotonic()
+    ok, err = asyncio.run(_util.retry_call_async(flaky, retries=3, backoff=10, retry_mode="legacy"))
+    assert ok is False and isinstance(err, RuntimeError)
+    assert time.monotonic() - start < 2
+
+
+def test_save_json_replaces_atomically(tmp_path):
+    path = tmp_path / "out.json"
+    _util.save_json({"a": 1}, str(path))
+    _util.save_json({"a": 2}, str(path))
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": 2}
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+
+def test_mock_getters_are_memoized_per_id():
+    client = _util.MockClient()
+    assert client.get_site_config("10001") is client.get_site_config("S10001")
+    assert client.get_hardware_details("H1") is _util.MockClient().get_hardware_details("H1")
+    assert client.get_site_overview("S10001") is not client.get_site_overview("S10002")
+
+
+def test_mock_portfolio_overview_scales_site_count(monkeypatch):
+    client = _util.MockClient()
+    assert [s.key for s in client.get_portfolio_overview("C1").sites] == ["S10001"]
+
+    sites = client.get_portfolio_overview("C1", n_sites=3).sites
+    assert [s.id for s in sites] == [10001, 10002, 10003]
+    assert all(s.parentKey == "C1" for s in sites)
+
+    monkeypatch.setenv("MOCK_PORTFOLIO_SITES", "5")
+    assert len(client.get_portfolio_overview("C1").sites) == 5
+
+
+def test_save_json_encodes_array_like_values(tmp_path):
+    from array import array
+
+    target = tmp_path / "series.json"
+    _util.save_json({"dataXy": array("d", [1.5, 2.5])}, str(target))
+    assert json.loads(target.read_text()) == {"dataXy": [1.5, 2.5]}
+
+
+def test_mock_site_ids_are_normalized():
+    client = _util.MockClient()
+    assert client.get_site_config("10001") is client.get_site_config("S10001")
+    overview = client.get_site_overview("10002")
+    assert (overview.key, overview.id) == ("S10002", 10002)
+
+
+def test_mock_constant_getters_share_one_instance():
+    client = _util.MockClient()
+    assert client.get_hardware_list("S1") is client.get_hardware_list("S2")
+    assert client.get_site_hardware_production("S1") is client.get_site_hardware_production("S2")
+    assert [hw.key for hw in client.get_hardware_list("S1")] == ["H12345", "H67890"]
+    assert len(client.get_chart_definitions()) == 2
+
+
+def test_mock_modeling_data_is_cached_per_site():
+    client = _util.MockClient()
+    data = client.get_modeling_data("S1")
+    assert data is client.get_modeling_data("S1")
+    assert data is not client.get_modeling_data("S2")
+    assert data.total_capacity_kw == 50
+
+
+def test_save_json_falls_back_to_repr_and_load_json_roundtrips(tmp_path):
+    class Opaque:
+        def __repr__(self):
+            return "<Opaque>"
+
+    target = tmp_path / "summary.json"
+    _util.save_json({"response": Opaque(), "count": 1}, str(target))
+    assert _util.load_json(str(target)) == {"response": "<Opaque>", "count": 1}
+
+
+def test_get_client_is_memoized_until_cleared():
+    client = _util.get_client(use_mock=True)
+    assert _util.get_client(True) is client
+    _util.get_client.cache_clear()
+    assert _util.get_client(use_mock=True) is not client
+
+
+def test_mock_portfolio_sites_are_built_once():
+    client = _util.MockClient()
+    assert client.get_portfolio_overview("C9").sites is client.get_portfolio_overview("C9").sites
+
+
+def test_write_jsonl_record_appends_one_line_per_record(tmp_path):
+    target = tmp_path / "records.jsonl"
+    with open(target, "ab") as f:
+        _util.write_jsonl_record(f, {"hardware_key": "H1", "success": True})
+        _util.write_jsonl_record(f, {"hardware_key": "H2", "success": False})
+    lines = target.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["hardware_key"] for line in lines] == ["H1", "H2"]
+
+
+def test_mock_get_sites_filters_partition_sites():
+    client = _util.MockClient()
+    every = [s.key for s in client.get_sites().sites]
+    active = [s.key for s in client.get_sites(filter_active=True).sites]
+    inactive = [s.key for s in client.get_sites(filter_inactive=True).sites]
+    assert sorted(active + inactive) == sorted(every)
+    assert len(client.get_sites(limit=1).sites) == 1
+    assert client.get_sites(filter_active=True, filter_inactive=True).sites == []
+
+
+def test_json_default_encodes_dataclasses_and_slots_shallowly():
+    class Point:
+        __slots__ = ("x", "y")
+
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    summary = _util.AlertSummary(hardwareKey="H1", maxSeverity=2, count=1)
+    assert _util._json_default(summary) == {"hardwareKey": "H1", "maxSeverity": 2, "count": 1}
+    assert _util._json_default(Point(1, 2)) == {"x": 1, "y": 2}
+    assert type(summary) in _util._ENCODERS
+
+
+def test_parallel_map_ordered_and_explicit_executor():
+    from concurrent.futures import ThreadPoolExecutor
+
+    def work(x):
+        if x == 2:
+            raise ValueError("boom")
+        return x * 10
+
+    results = _util.parallel_map_ordered(work, range(4), workers=2, retries=0)
+    assert [ok for ok, _ in results] == [True, True, False, True]
+    assert results[3] == (True, 30)
+
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        assert [res for _, _, res in _util.parallel_map(work, [1, 3], executor=ex)] == [10, 30]
+
+
+def test_load_json_memory_maps_large_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(_util, "_MMAP_MIN_BYTES", 1)
+    target = tmp_path / "updates.json"
+    target.write_text(json.dumps([{"hardware_key": "H1", "action": "delete"}]), encoding="utf-8")
+    assert _util.load_json(str(target)) == [{"hardware_key": "H1", "action": "delete"}]
+
+
+def test_async_map_matches_parallel_map_shape():
+    def work(x):
+        if x == 1:
+            raise ValueError("boom")
+        return x + 100
+
+    results = _util.async_map(work, [0, 1, 2], concurrency=2, retries=0)
+    assert [(item, ok) for item, ok, _ in results] == [(0, True), (1, False), (2, True)]
+    assert results[2][2] == 102
+
+
+def test_save_json_handles_sets_and_mapping_proxies(tmp_path):
+    from types import MappingProxyType
+
+    target = tmp_path / "out.json"
+    _util.save_json({"names": {"a"}, "cfg": MappingProxyType({"k": 1})}, str(target))
+    assert json.loads(target.read_text()) == {"names": ["a"], "cfg": {"k": 1}}
+
+
+def test_retry_budget_stops_standard_retries_but_not_adaptive(monkeypatch, caplog):
+    import pytest
+
+    monkeypatch.setattr(_util, "_RETRY_BUCKET", _util._TokenBucket(rate=0.001, capacity=1))
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise RuntimeError("nope")
+
+    # One token: the first retry is allowed, the second finds the bucket empty
+    ok, _ = _util.retry_call(flaky, retries=5, backoff=0, retry_mode="standard")
+    assert (ok, len(calls)) == (False, 2)
+    assert "Retry budget exhausted" in caplog.text
+
+    assert _util._retry_mode == "legacy"  # budgeted modes are opt-in
+
+    calls.clear()
+    ok, _ = _util.retry_call(flaky, retries=2, backoff=0, retry_mode="legacy")
+    assert (ok, len(calls)) == (False, 3)
+
+    with pytest.raises(ValueError):
+        _util.set_retry_mode("bogus")
+
+
+def test_decorrelated_jitter_stays_within_bounds(monkeypatch):
+    monkeypatch.setattr(_util, "_RETRY_BUCKET", _util._TokenBucket(rate=10.0, capacity=100))
+    for _ in range(50):
+        delay = _util._retry_delay("adaptive", 1, 0.5, 4.0)
+        assert 0.5 <= delay <= 12.0
+    assert _util._retry_delay("adaptive", 1, 0.5, 100.0) <= _util._RETRY_CAP
+
+
+def test_save_json_streams_sections_byte_identical_to_one_shot(tmp_path):
+    from datetime import datetime
+
+    site = _util.AlertSummary(hardwareKey="H1\nH2", maxSeverity=2, count=1)
+    doc = {"site": site, "hardware": [{"key": "H1", "tags": []}], "empty": {}, "at": datetime(2024, 1, 2), "n": 3}
+    for obj in (doc, site, [1, {"a": 2}], {}, {1: "x"}):
+        target = tmp_path / "out.json"
+        _util.save_json(obj, str(target))
+        assert target.read_bytes() == _util._dumps(obj)
+
+
+def test_load_site_list_cached_uses_fresh_sidecar(tmp_path):
+    path = tmp_path / "SiteList.json"
+    path.write_text(json.dumps({"sites": [{"key": "S1"}]}))
+    assert [s.key for s in _util.load_site_list_cached(str(path))] == ["S1"]
+    assert (tmp_path / "SiteList.json.pkl").exists()
+
+    _util._load_site_list_cached.cache_clear()
+    assert [s.key for s in _util.load_site_list_cached(str(path))] == ["S1"]
+
+    # Any change to the JSON file invalidates the sidecar
+    path.write_text(json.dumps({"sites": [{"key": "S1"}, {"key": "S2"}]}))
+    os.utime(path, ns=(0, 10**18))
+    assert [s.key for s in _util.load_site_list_cached(str(path))] == ["S1", "S2"]
+
+
+def test_save_json_can_skip_creating_parent(tmp_path):
+    import pytest
+
+    with pytest.raises(FileNotFoundError):
+        _util.save_json({"a": 1}, str(tmp_path / "missing" / "out.json"), makedirs=False)
+    _util.save_json({"a": 1}, str(tmp_path / "out.json"), makedirs=False)
+    assert json.loads((tmp_path / "out.json").read_text()) == {"a": 1}
+
+
+def test_jsonl_archive_roundtrip(tmp_path):
+    import gzip
+
+    for name in ("sites.jsonl", "sites.jsonl.gz"):
+        path = tmp_path / "out" / name
+        with _util.JsonlArchive(str(path)) as archive:
+            archive.write("S1", _util.AlertSummary(hardwareKey="H1", maxSeverity=1, count=2))
+            archive.write("S2", {"a": 1})
+        assert list(_util.read_archive(str(path))) == [
+            {"site": "S1", "data": {"hardwareKey": "H1", "maxSeverity": 1, "count": 2}},
+            {"site": "S2", "data": {"a": 1}},
+        ]
+    assert gzip.open(tmp_path / "out" / "sites.jsonl.gz").read().count(b"\n") == 2
+
+
+def test_write_output_to_file_and_stdout(tmp_path, capsys):
+    target = tmp_path / "out.json"
+    _util.write_output({"name": "Café"}, str(target))
+    assert json.loads(target.read_bytes().decode("utf-8")) == {"name": "Café"}
+
+    _util.write_output({"n": 1})
+    assert json.loads(capsys.readouterr().out) == {"n": 1}
+
+
+def test_write_output_is_compact_only_when_stdout_is_piped(tmp_path, capsys):
+    _util.write_output({"a": [1, 2]})
+    assert capsys.readouterr().out == '{"a":[1,2]}\n'
+    _util.write_output({"a": [1, 2]}, compact=False)
+    assert capsys.readouterr().out.startswith('{\n  "a": [')
+    target = tmp_path / "out.json"
+    _util.write_output({"a": 1}, str(target))
+    assert target.read_text() == '{\n  "a": 1\n}'
+
+
+def test_write_output_encodes_sdk_objects_without_pre_walk(tmp_path):
+    from datetime import datetime
+
+    class Plain:
+        def __init__(self):
+            self.key = "H1"
+            self.tags = {"a"}
+
+    target = tmp_path / "out.json"
+    _util.write_output({"result": [Plain(), _util.AlertSummary(hardwareKey="H2", maxSeverity=1, count=0)],
+                        "at": datetime(2024, 1, 2), "odd": object.__new__(type("Odd", (), {"__slots__": ()}))}, str(target))
+    data = json.loads(target.read_text())
+    assert data["result"] == [{"key": "H1", "tags": ["a"]}, {"hardwareKey": "H2", "maxSeverity": 1, "count": 0}]
+    assert data["at"] == "2024-01-02T00:00:00"
+    assert isinstance(data["odd"], str)
+
+
+def test_write_output_streams_nested_pieces_byte_identical(tmp_path):
+    summary = _util.AlertSummary(hardwareKey="H1\nH2", maxSeverity=2, count=1)
+    doc = {"result": {"series": [[1, 2.5], {"pts": []}, summary], "empty": [], "ids": (1, 2)}, "n": 3}
+    for obj in (doc, [doc, []], summary, {}):
+        target = tmp_path / "out.json"
+        _util.write_output(obj, str(target))
+        assert target.read_bytes() == _util._dumps(obj, _util._output_default)
+        _util.write_output(obj, str(target), compact=True)
+        assert target.read_bytes() == _util._dumps(obj, _util._output_default, compact=True)
+    assert len(list(_util._iter_json_chunks(doc, _util._output_default, 3))) > 10
+
+
+def test_write_output_encodes_chart_series_one_at_a_time(tmp_path):
+    series = [{"name": f"s{i}", "dataXy": [[t * 60000, t / 7] for t in range(5000)]} for i in range(4)]
+    doc = {"method": "get_chart_data", "result": {"key": "C1", "series": series}}
+    chunks = list(_util._iter_json_chunks(doc, _util._output_default, _util._OUTPUT_STREAM_DEPTH))
+    total = sum(map(len, chunks))
+    assert max(map(len, chunks)) < total / 3
+
+    target = tmp_path / "chart.json"
+    _util.write_output(doc, str(target))
+    assert target.read_bytes() == _util._dumps(doc, _util._output_default)
+
+
+def test_utc_datetimes_encode_with_z_suffix():
+    from datetime import datetime, timezone
+
+    at = datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+    assert _util._json_default(at) == "2024-01-02T03:04:05.678000Z"
+    assert json.loads(_util._dumps({"at": at}))["at"] == "2024-01-02T03:04:05.678000Z"
+    assert _util._json_default(datetime(2024, 1, 2)) == "2024-01-02T00:00:00"
+
+
+def test_to_safe_and_json_default_read_attrs_fields():
+    import pytest
+
+    attr = pytest.importorskip("attr")
+
+    @attr.s(auto_attribs=True)
+    class Reading:
+        key: str
+        values: list
+        _cache: dict = attr.ib(factory=dict, repr=False)
+
+    reading = Reading("H1", [1.5], {"x": 1})
+    reading.extra = "not a field"
+    assert _util._json_default(reading) == {"key": "H1", "values": [1.5], "_cache": {"x": 1}}
+    assert _util.to_safe([reading]) == [{"key": "H1", "values": [1.5], "_cache": {"x": 1}}]
+
+
+def test_profiled_reports_to_stream_and_is_noop_without_profiler():
+    import io
+    import pytest
+
+    report = io.StringIO()
+    with _util.profiled("cprofile", stream=report):
+        sorted(range(1000), key=lambda i: -i)
+    assert "function calls" in report.getvalue()
+
+    with _util.profiled(None, stream=report):
+        pass
+    with pytest.raises(ValueError):
+        with _util.profiled("perf"):
+            pass
+
+
+def test_build_envelope_records_only_call_args():
+    from argparse import Namespace
+
+    args = Namespace(code=3, site_id=None, mock=True, output=None, verbose=False, compact=None, profile=None)
+    env = _util.build_envelope("get_driver_list", args, [1], rename={"code": "functionCode"})
+    assert list(env) == ["method", "args", "result", "timestamp"]
+    assert env["args"] == {"functionCode": 3, "site_id": None}
+    assert env["timestamp"].tzinfo is not None
+
+
+def test_to_safe_returns_plain_detached_tree():
+    from types import MappingProxyType
+
+    summary = _util.AlertSummary(hardwareKey="H1", maxSeverity=1, count=2)
+    tree = _util.to_safe({1: (summary, {"x"}), "cfg": MappingProxyType({"k": None})})
+    assert tree == {"1": [{"hardwareKey": "H1", "maxSeverity": 1, "count": 2}, ["x"]], "cfg": {"k": None}}
+    tree["1"][0]["count"] = 5
+    assert summary.count == 2
+
+    from enum import IntEnum
+
+    Level = IntEnum("Level", "LOW HIGH")
+    assert _util.to_safe([Level.HIGH, None, True])[0] is Level.HIGH
+
+
+def test_real_client_is_shared_and_closed_at_exit(monkeypatch):
+    import powertrack_sdk
+
+    registered = []
+
+    class FakeClient:
+        def __init__(self, pool_maxsize):
+            self.pool_maxsize = pool_maxsize
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(powertrack_sdk, "PowerTrackClient", FakeClient, raising=False)
+    monkeypatch.setattr(_util.atexit, "register", registered.append)
+    _util.get_client.cache_clear()
+    try:
+        client = _util.get_client()
+        assert _util.get_client() is client
+        assert client.pool_maxsize == _util._CLIENT_POOL_MAXSIZE
+        assert registered == [client.close]
+    finally:
+        _util.get_client.cache_clear()
+
+
+def test_get_client_can_disable_session_retries(monkeypatch):
+    import powertrack_sdk
+
+    class FakeClient:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(powertrack_sdk, "PowerTrackClient", FakeClient, raising=False)
+    monkeypatch.setattr(_util.atexit, "register", lambda fn: None)
+    _util.get_client.cache_clear()
+    try:
+        no_retries = _util.get_client(http_retries=0)
+        assert no_retries.kwargs == {"pool_maxsize": _util._CLIENT_POOL_MAXSIZE, "max_retries": 0}
+        assert _util.get_client(http_retries=0) is no_retries
+        assert "max_retries" not in _util.get_client().kwargs
+    finally:
+        _util.get_client.cache_clear()
+
+
+def test_cached_get_revalidates_etags_and_honours_ttl(tmp_path):
+    from types import SimpleNamespace
+    from powertrack_sdk import NotModified
+
+    calls = []
+
+    def get_site_config(key, if_none_match=None):
+        calls.append(if_none_match)
+        if if_none_match == "v1":
+            raise NotModified("v1")
+        return SimpleNamespace(key=key, etag="v1")
+
+    first = _util.cached_get(get_site_config, "S10001", cache_dir=str(tmp_path))
+    again = _util.cached_get(get_site_config, "S10001", cache_dir=str(tmp_path))
+    assert calls == [None, "v1"] and again.key == first.key == "S10001"
+
+    def get_hardware_details(key):
+        calls.append(key)
+        return SimpleNamespace(key=key)
+
+    calls.clear()
+    _util.cached_get(get_hardware_details, "H1", cache_dir=str(tmp_path))
+    _util.cached_get(get_hardware_details, "H1", cache_dir=str(tmp_path))
+    assert calls == ["H1"]
+    _util.cached_get(get_hardware_details, "H1", cache_dir=str(tmp_path), ttl=0)
+    assert calls == ["H1", "H1"]
+
+
+def test_cached_get_is_scoped_by_base_url_invalidated_and_skips_unpicklable(tmp_path):
+    class Client:
+        def __init__(self, base_url, value):
+            self.base_url = base_url
+            self.value = value
+
+        def get_site_config(self, key):
+            return self.value
+
+    prod = Client("https://prod.example", "v1")
+    assert _util.cached_get(prod.get_site_config, "S1", cache_dir=str(tmp_path)) == "v1"
+    # Another environment never sees prod's TTL entry
+    assert _util.cached_get(Client("https://test.example", "t1").get_site_config, "S1", cache_dir=str(tmp_path)) == "t1"
+
+    # After an update the stale entry is dropped instead of served for the rest of the TTL
+    prod.value = "v2"
+    assert _util.cached_get(prod.get_site_config, "S1", cache_dir=str(tmp_path)) == "v1"
+    _util.invalidate_cached(prod.get_site_config, "S1", cache_dir=str(tmp_path))
+    assert _util.cached_get(prod.get_site_config, "S1", cache_dir=str(tmp_path)) == "v2"
+
+    prod.value = lambda: None  # can't be pickled
+    _util.invalidate_cached(prod.get_site_config, "S1", cache_dir=str(tmp_path))
+    assert _util.cached_get(prod.get_site_config, "S1", cache_dir=str(tmp_path)) is prod.value
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_save_json_async_writes_in_background(tmp_path):
+    target = tmp_path / "backup.json"
+    future = _util.save_json_async({"azimuth": 180}, str(target))
+    assert future.result(timeout=5) is None
+    assert _util.load_json(str(target)) == {"azimuth": 180}
+
+
+def test_save_json_coalesces_small_sections_into_few_writes(tmp_path, monkeypatch):
+    obj = {f"key{i}": {"values": list(range(10))} for i in range(500)}
+    real_write = os.write
+    sizes = []
+
+    def counting_write(fd, data):
+        sizes.append(len(data))
+        return real_write(fd, data)
+
+    monkeypatch.setattr(_util.os, "write", counting_write)
+    target = tmp_path / "config.json"
+    _util.save_json(obj, str(target))
+
+    assert target.read_bytes() == _util._dumps(obj)
+    assert len(sizes) <= -(-len(target.read_bytes()) // _util._WRITE_BUFFER_BYTES) + 1
+    assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
+
+
+def test_retry_call_timeout_is_not_consumed_by_abandoned_attempts():
+    import threading
+
+    release = threading.Event()
+
+    def stuck():
+        release.wait(5)
+
+    try:
+        # Abandon more timed-out attempts than any fixed pool would have workers
+        for _ in range(40):
+            ok, res = _util.retry_call(stuck, retries=0, timeout=0.01)
+            assert not ok
+        ok, res = _util.retry_call(lambda: "done", retries=0, timeout=0.5)
+        assert ok and res == "done"
+    finally:
+        release.set()
+
+
+def test_get_client_passes_request_timeout_to_the_sdk_client(monkeypatch):
+    import powertrack_sdk
+
+    built = []
+    monkeypatch.setattr(powertrack_sdk, "PowerTrackClient", lambda **kw: built.append(kw) or type("C", (), {"close": lambda self: None})())
+    _util.get_client.cache_clear()
+    try:
+        _util.get_client(http_retries=0, timeout=7.5)
+    finally:
+        _util.get_client.cache_clear()
+    assert built[0]["timeout"] == 7.5 and built[0]["max_retries"] == 0
@@ -0,0 +1,102 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from powertrack_sdk import NotModified
+from powertrack_sdk.client import PowerTrackClient
+
+
+def _bare_client():
+    client = PowerTrackClient.__new__(PowerTrackClient)
+    client.base_url = "https://example.com"
+    return client
+
+
+def test_client_conditional_get_raises_not_modified_on_304():
+    client = _bare_client()
+    sent = []
+
+    def fake_request(method, endpoint, headers=None, **kwargs):
+        sent.append(headers)
+        if headers and headers.get("If-None-Match") == '"abc"':
+            return SimpleNamespace(status_code=304, headers={"ETag": '"abc"'})
+        return SimpleNamespace(status_code=200, headers={"ETag": '"abc"'}, json=lambda: {"name": "Inv 1", "functionCode": 1})
+
+    client._make_request = fake_request
+    details = client.get_hardware_details("H12345")
+    assert details.etag == '"abc"' and details.summary.name == "Inv 1"
+    with pytest.raises(NotModified):
+        client.get_hardware_details("H12345", if_none_match=details.etag)
+    assert sent == [None, {"If-None-Match": '"abc"'}]
+
+
+def test_client_update_hardware_config_reuses_current_config():
+    client = _bare_client()
+    client.get_json = lambda *a, **kw: pytest.fail("current_config should skip the GET")
+    sent = []
+    client.put_json = lambda endpoint, payload, **kw: sent.append(payload) or {"ok": True}
+
+    result = client.update_hardware_config("H12345", {"modeling": {"tilt": 25}},
+                                           current_config={"name": "Inv 1", "modeling": {"tilt": 20, "azimuth": 180}})
+    assert result.success
+    assert sent == [{"name": "Inv 1", "modeling": {"tilt": 25, "azimuth": 180}, "hardwareId": "H12345"}]
+
+
+def test_client_alert_triggers_batch_returns_per_key_errors():
+    client = _bare_client()
+
+    def fake_get(key):
+        if key == "H2":
+            raise RuntimeError("boom")
+        return key.lower()
+
+    client.get_alert_triggers = fake_get
+    for workers in (1, 8):
+        res = client.get_alert_triggers_batch(["H1", "H2", "H3"], max_workers=workers)
+        assert res["H1"] == "h1" and res["H3"] == "h3"
+        assert isinstance(res["H2"], RuntimeError)
+
+
+def test_client_get_site_data_fetches_concurrently_in_order():
+    client = _bare_client()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def waits(value):
+        def call(key):
+            barrier.wait()  # only passes if config, modeling and hardware list are in flight together
+            return value
+        return call
+
+    client.get_site_config = waits("cfg")
+    client.get_modeling_data = waits("model")
+    client.get_hardware_list = waits([SimpleNamespace(key=f"H{i}") for i in range(5)])
+    client.get_hardware_details = lambda key: None if key == "H3" else SimpleNamespace(key=key)
+    client.get_alert_triggers = lambda key: key.lower()
+
+    data = client.get_site_data("S10001", max_workers=8)
+    assert (data.config, data.modeling) == ("cfg", "model")
+    assert [hw.key for hw in data.hardware] == ["H0", "H1", "H2", "H4"]
+    assert data.alerts == ["h0", "h1", "h2", "h4"]
+
+
+def test_client_get_site_data_is_sequential_by_default():
+    client = _bare_client()
+    callers = set()
+
+    def on_caller(value):
+        def call(key):
+            callers.add(threading.get_ident())
+            return value
+        return call
+
+    client.get_site_config = on_caller("cfg")
+    client.get_modeling_data = on_caller("model")
+    client.get_hardware_list = on_caller([SimpleNamespace(key="H0")])
+    client.get_hardware_details = lambda key: SimpleNamespace(key=key)
+    client.get_alert_triggers = lambda key: key.lower()
+
+    # The default stays on the calling thread, so nested callers don't multiply threads
+    data = client.get_site_data("S10001")
+    assert callers == {threading.get_ident()}
+    assert [hw.key for hw in data.hardware] == ["H0"] and data.alerts == ["h0"]
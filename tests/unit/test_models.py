@@ -42,6 +42,14 @@ def test_sitelist_basic_behaviors():
     assert len(filtered) == 1
 
 
+def test_sitelist_from_json_file(tmp_path):
+    path = tmp_path / 'SiteList.json'
+    path.write_text('{"metadata": {"owner": "me"}, "sites": [{"key": "S10001", "name": "Caf\u00e9"}]}', encoding='utf-8')
+    sl = models.SiteList.from_json_file(str(path))
+    assert sl.metadata == {'owner': 'me'}
+    assert sl.get_by_key('S10001').name == 'Caf\u00e9'
+
+
 def test_chartdata_performance_ratio_and_losses():
     cd = models.ChartData(
         allowSmallBinSize=True,
@@ -96,3 +104,17 @@ def test_dataclass_fields_are_camel_case():
                 if '_' in field_name:
                     errors.append(f"Field '{field_name}' in dataclass '{obj.__name__}' contains underscore")
     assert not errors, "\n".join(errors)
+
+
+def test_package_exposes_client_lazily():
+    import powertrack_sdk
+    from powertrack_sdk.client import PowerTrackClient
+
+    assert powertrack_sdk.PowerTrackClient is PowerTrackClient
+    assert "PowerTrackClient" in powertrack_sdk.__all__
+
+
+def test_modeling_total_capacity_kw_accepts_any_mapping():
+    from types import MappingProxyType
+    md = models.ModelingData(siteId='S1', inverters=[MappingProxyType({'inverterKw': 2.5}), {'inverterKw': 1.0}, {}])
+    assert md.total_capacity_kw == 3.5
@@ -87,3 +87,21 @@ def test_deep_merge_dicts_merge_by_key():
     h2 = next(item for item in merged['hardware'] if item['hardwareKey'] == 'H2')
     assert h2['value'] == 20
     assert merged['other']['x'] == 1 and merged['other']['y'] == 2
+
+
+def test_diff_json_reports_nested_leaves_and_builds_sparse_updates():
+    original = {"name": "Inv 1", "modeling": {"azimuth": 180, "tilt": 20}, "tags": ["a"], "a/b": 1, "old": True}
+    updated = {"name": "Inv 1", "modeling": {"azimuth": 190, "tilt": 20, "derate": 0.9}, "tags": ["a", "b"], "a/b": 2}
+    patch = utils.diff_json(original, updated)
+    assert patch == [
+        {"op": "remove", "path": "/old"},
+        {"op": "replace", "path": "/modeling/azimuth", "value": 190},
+        {"op": "add", "path": "/modeling/derate", "value": 0.9},
+        {"op": "replace", "path": "/tags", "value": ["a", "b"]},
+        {"op": "replace", "path": "/a~1b", "value": 2},
+    ]
+    updates = utils.patch_to_updates(patch)
+    assert updates == {"modeling": {"azimuth": 190, "derate": 0.9}, "tags": ["a", "b"], "a/b": 2}
+    merged = utils.deep_merge_dicts(original, updates)
+    assert merged["modeling"] == updated["modeling"] and merged["a/b"] == 2
+    assert utils.diff_json(original, original) == []